@@ -0,0 +1,2 @@
+# api/common: 여러 엔드포인트(index*.py)가 함께 쓰는 모듈 모음
+# vercel.json 빌드 대상은 api/*.py 뿐이므로 이 패키지는 엔드포인트로 배포되지 않는다.
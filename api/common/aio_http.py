@@ -0,0 +1,176 @@
+# api/common/aio_http.py
+# asyncio용 HTTP 클라이언트 (httpx.AsyncClient) — common/http.fetch와 같은 요청 정책의 비동기 버전
+#
+# - 호스트별 AIMD limiter(common/ratelimit), 재시도/헤지/서킷 브레이커/요청 통계(common/fetch_policy)를
+#   동기 fetch와 그대로 공유한다 (같은 프로세스라면 동기/비동기 요청이 한 속도 제한 안에서 움직임)
+# - 슬롯 대기와 재시도 백오프는 asyncio.sleep이라 이벤트 루프를 막지 않는다
+# - HTML 파싱처럼 CPU를 쓰는 일은 run_parse()로 파싱 전용 스레드풀에 넘긴다
+import asyncio
+import contextvars
+import os
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from . import raw_archive
+from .fetch_policy import (MAX_RETRIES, RETRY_STATUSES, CircuitOpenError, backoff_delay, breaker_for,
+                           current_stats, note, tracker_for)
+from .http import DEFAULT_HEADERS, HEDGE_DEFAULT, POOL_CONNECTIONS, POOL_MAXSIZE, upstream_url
+from .ratelimit import limiter_for, parse_retry_after
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "4"))   # BeautifulSoup/readability 파싱 스레드 수
+
+_parse_pool = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+_clients = weakref.WeakKeyDictionary()   # 이벤트 루프 → AsyncClient (클라이언트는 만든 루프 안에서만 쓸 수 있음)
+
+
+def get_client():
+    """현재 이벤트 루프의 공유 AsyncClient (커넥션 풀 재사용)"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(max_connections=POOL_CONNECTIONS * POOL_MAXSIZE,
+                              max_keepalive_connections=POOL_MAXSIZE)
+        client = _clients[loop] = httpx.AsyncClient(limits=limits, follow_redirects=True)
+    return client
+
+
+async def close_client():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def run_parse(fn, *args):
+    """CPU를 쓰는 파싱 함수를 스레드풀에서 실행 (요청별 fetch 통계 컨텍스트도 함께 넘김)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_parse_pool, contextvars.copy_context().run, fn, *args)
+
+
+async def _wait_slot(limiter):
+    wait = limiter.reserve()
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+async def _send_once(url, params, headers, timeout, acquire=True):
+    limiter = limiter_for(url)
+    if acquire:
+        await _wait_slot(limiter)
+    note("requests")
+    started = time.monotonic()
+    try:
+        resp = await get_client().get(upstream_url(url), params=params, headers=headers or DEFAULT_HEADERS,
+                                      timeout=timeout)
+    except httpx.TransportError:
+        limiter.record(time.monotonic() - started, status=None)
+        raise
+    elapsed = time.monotonic() - started
+    limiter.record(elapsed, status=resp.status_code,
+                   retry_after=parse_retry_after(resp.headers.get("Retry-After")))
+    if resp.status_code < 500:
+        tracker_for(limiter.host).add(elapsed)
+    return resp
+
+
+async def _send_hedged(url, params, headers, timeout):
+    """http._send_hedged와 같은 규칙: 슬롯을 받은 뒤 p95 지연을 넘기면 헤지 요청, 먼저 성공한 응답을 쓴다."""
+    limiter = limiter_for(url)
+    delay = tracker_for(limiter.host).hedge_delay()
+    if delay is None:
+        return await _send_once(url, params, headers, timeout)
+
+    await _wait_slot(limiter)
+    first = asyncio.ensure_future(_send_once(url, params, headers, timeout, acquire=False))
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    note("hedges")
+    second = asyncio.ensure_future(_send_once(url, params, headers, timeout))
+    pending = {first, second}
+    error = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                if task is second:
+                    note("hedge_wins")
+                for loser in pending:
+                    loser.cancel()
+                return task.result()
+            error = error or task.exception()
+    raise error
+
+
+async def fetch_async(url, params=None, headers=None, timeout=10, retries=MAX_RETRIES, hedge=None):
+    """
+    http.fetch의 비동기 버전 → httpx.Response (본문까지 읽은 상태)
+    실패 시 httpx.HTTPError(연결 오류/타임아웃/상태 코드) 또는 CircuitOpenError를 던진다.
+    """
+    if raw_archive.replaying():
+        return await run_parse(_replay, url, params)
+    if hedge is None:
+        stats = current_stats()
+        hedge = stats.hedge if stats is not None else HEDGE_DEFAULT
+    breaker = breaker_for(limiter_for(url).host)
+    try:
+        breaker.before_request()
+    except CircuitOpenError:
+        note("circuit_open")
+        raise
+
+    attempt = 0
+    recorded = False  # http.fetch와 같이 어떤 경로로 나가든 회로에 결과를 남긴다
+    try:
+        while True:
+            try:
+                if hedge:
+                    resp = await _send_hedged(url, params, headers, timeout)
+                else:
+                    resp = await _send_once(url, params, headers, timeout)
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+                    break
+            note("retries")
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+        if resp.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+            note("failures")
+        else:
+            breaker.record_success()
+        recorded = True
+    except Exception:
+        breaker.record_failure()
+        note("failures")
+        recorded = True
+        raise
+    finally:
+        if not recorded:
+            # 취소(CancelledError — 본문 단계 마감, 헤지 패자)는 호스트 실패가 아님 → 시험 플래그만 푼다
+            breaker.release_trial()
+    resp.raise_for_status()
+    if raw_archive.recording():
+        raw_archive.enqueue(raw_archive.archive_key(url, params), resp.content, resp.status_code,
+                            resp.headers.get("Content-Type"))
+    return resp
+
+
+def _replay(url, params):
+    """보관소 스냅샷 → httpx.Response (없으면 ArchiveMiss)"""
+    key = raw_archive.archive_key(url, params)
+    row = raw_archive.lookup(key, complete_first=True)
+    if row is None:
+        raise raw_archive.ArchiveMiss(f"보관소에 없음: {key}")
+    sha, status, content_type, _ = row
+    return httpx.Response(status, content=raw_archive.read_blob(sha),
+                          headers={"Content-Type": content_type or "text/html"}, request=httpx.Request("GET", key))
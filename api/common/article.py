@@ -0,0 +1,300 @@
+# api/common/article.py
+# 기사 본문 추출 (readability-lxml) + 도메인별 추출 템플릿 캐시
+#
+# readability는 페이지마다 전체 DOM 점수 계산을 하기 때문에 느리다.
+# 우리가 파싱하는 기사는 대부분 몇 개 도메인에 몰려 있고, 같은 도메인이면 본문 컨테이너 구조도 같다.
+# → readability가 한 도메인에서 성공하면 본문 노드의 XPath를 "템플릿"으로 저장하고,
+#   다음 페이지부터는 XPath 한 번으로 본문을 꺼낸다. 템플릿이 빗나가면 readability로 되돌아간다.
+# - 캐시 파일은 템플릿이 바뀔 때(학습/폐기) 바로, 적중/실패 횟수만 바뀌었으면 SAVE_EVERY건마다 또는
+#   SAVE_INTERVAL_S초가 지났을 때, 그리고 종료 시에 쓴다 (seen_index와 같은 방식 — 요청마다 JSON 전체를 다시 쓰지 않음).
+import atexit
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import lxml.html
+from bs4 import BeautifulSoup
+from readability import Document
+from readability.htmls import get_title
+
+from .charset import parse_document
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+TEMPLATE_CACHE_PATH = os.environ.get("ARTICLE_TEMPLATE_PATH", "/tmp/article_templates.json")
+MIN_TEMPLATE_TEXT = 200      # 템플릿으로 뽑은 본문이 이보다 짧으면 빗나간 것으로 본다
+MAX_TEMPLATE_MISSES = 3      # 연속으로 이만큼 빗나가면 템플릿을 버리고 다시 학습
+MIN_MATCH_TEXT = 20          # 본문 노드 위치 추정에 쓰는 문단 최소 길이
+SAVE_EVERY = 50              # 통계만 바뀐 추출이 이만큼 쌓이면 파일에 쓴다
+SAVE_INTERVAL_S = 60         # 또는 마지막 저장 후 이만큼 지나면
+
+_lock = threading.Lock()
+_save_lock = threading.Lock()  # 저장은 한 번에 하나씩 (먼저 뜬 스냅샷이 나중 것을 덮어쓰지 않도록)
+_cache = None  # domain -> {"xpath", "hits", "misses", "consecutive_misses", "readability_runs", "readability_ms", "template_ms"}
+_unsaved = 0   # 마지막 저장 이후 바뀐 추출 수
+_saved_at = time.monotonic()
+
+
+class ArticleParseError(Exception):
+    """제목 또는 본문을 찾지 못한 경우"""
+
+
+# ===============================
+# 🗂️ 템플릿 캐시 저장/로드
+# ===============================
+def _load_cache():
+    global _cache
+    if _cache is None:
+        try:
+            with open(TEMPLATE_CACHE_PATH, encoding="utf-8") as f:
+                _cache = json.load(f)
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+
+def _mark_dirty(template_changed=False):
+    """(_lock 안에서) 캐시가 바뀌었음을 기록 → 지금 파일에 써야 하면 True"""
+    global _unsaved
+    _unsaved += 1
+    return template_changed or _unsaved >= SAVE_EVERY or time.monotonic() - _saved_at >= SAVE_INTERVAL_S
+
+
+def save_templates():
+    """템플릿 캐시를 파일에 쓴다 (바뀐 게 없으면 그냥 둠). 실패하면 다음 저장 때 다시 시도한다."""
+    global _unsaved, _saved_at
+    with _save_lock:
+        with _lock:
+            if _cache is None or not _unsaved:
+                return
+            data, dirty = json.dumps(_cache, ensure_ascii=False), _unsaved
+        try:
+            tmp_path = f"{TEMPLATE_CACHE_PATH}.{os.getpid()}.tmp"  # 파서 프로세스 여러 개가 동시에 저장할 수 있음
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, TEMPLATE_CACHE_PATH)
+        except OSError as e:
+            print(f"⚠️ 템플릿 캐시 저장 실패: {e}")
+            return
+        with _lock:
+            _unsaved -= dirty
+            _saved_at = time.monotonic()
+
+
+atexit.register(save_templates)
+
+
+def _domain_of(url):
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _entry(cache, domain):
+    return cache.setdefault(domain, {
+        "xpath": None,
+        "hits": 0,
+        "misses": 0,
+        "consecutive_misses": 0,
+        "readability_runs": 0,
+        "readability_ms": 0.0,
+        "template_ms": 0.0,
+    })
+
+
+# ===============================
+# 🧭 본문 노드 → XPath 템플릿
+# ===============================
+def _node_text(node):
+    for bad in node.xpath(".//script|.//style|.//noscript"):
+        bad.drop_tree()
+    return " ".join(s.strip() for s in node.itertext() if s.strip())
+
+
+def _locate_content_node(doc, summary_html):
+    """readability 결과 문단들을 원문 DOM에서 찾아, 그 문단들을 모두 포함하는 가장 작은 노드를 돌려준다."""
+    summary = lxml.html.fromstring(summary_html)
+    wanted = {s.strip() for s in summary.itertext() if len(s.strip()) >= MIN_MATCH_TEXT}
+    if not wanted:
+        return None
+
+    matched = []
+    for el in doc.iter():
+        if not isinstance(el.tag, str):
+            continue
+        if el.text and el.text.strip() in wanted:
+            matched.append(el)
+        if el.tail and el.tail.strip() in wanted and el.getparent() is not None:
+            matched.append(el.getparent())
+    if not matched:
+        return None
+
+    common = list(matched[0].iterancestors())[::-1] + [matched[0]]
+    for el in matched[1:]:
+        chain = set(el.iterancestors())
+        chain.add(el)
+        while common and common[-1] not in chain:
+            common.pop()
+    return common[-1] if common else None
+
+
+def _xpath_for(doc, node):
+    """id가 있는 가장 가까운 조상을 기준점으로 삼아 XPath를 만든다 (광고 개수 등 위치 변동에 강하도록)."""
+    steps = []
+    cur = node
+    while cur is not None and isinstance(cur.tag, str):
+        node_id = cur.get("id")
+        if node_id and '"' not in node_id:
+            xpath = "//%s[@id=\"%s\"]" % (cur.tag, node_id) + "".join("/" + s for s in reversed(steps))
+            if doc.xpath(xpath) == [node]:
+                return xpath
+            break
+        if cur is node:
+            node_class = cur.get("class")
+            if node_class and '"' not in node_class:
+                xpath = "//%s[@class=\"%s\"]" % (cur.tag, node_class)
+                if doc.xpath(xpath) == [node]:
+                    return xpath
+        parent = cur.getparent()
+        if parent is None:
+            break
+        same_tag = [c for c in parent if c.tag == cur.tag]
+        steps.append("%s[%d]" % (cur.tag, same_tag.index(cur) + 1))
+        cur = parent
+
+    # 기준점이 없으면 절대 경로 사용
+    return doc.getroottree().getpath(node)
+
+
+# ===============================
+# 📰 본문 추출
+# ===============================
+def _extract_with_readability(html):
+    doc = Document(html)
+    title = doc.title().strip()
+    content_html = doc.summary()
+    soup = BeautifulSoup(content_html, "html.parser")
+    return title, content_html, soup.get_text(separator=" ", strip=True)
+
+
+def _extract_with_template(doc, xpath):
+    nodes = doc.xpath(xpath)
+    if len(nodes) != 1:
+        return None
+    text = _node_text(nodes[0])
+    if len(text) < MIN_TEMPLATE_TEXT:
+        return None
+    return text
+
+
+def extract_article(html, url, doc=None):
+    """
+    HTML 문자열에서 (제목, 본문 텍스트, 추출 정보)를 뽑는다.
+    도메인 템플릿이 있으면 XPath로, 없거나 빗나가면 readability로 추출한 뒤 템플릿을 학습한다.
+    doc: 미리 만들어 둔 lxml 문서 (stream_parse.read_document 등) — 없으면 html로 만든다.
+         doc가 있으면 html은 str 대신 str을 돌려주는 함수여도 된다 (readability까지 갈 때만 디코딩).
+    """
+    domain = _domain_of(url)
+    if doc is None:
+        doc = lxml.html.document_fromstring(html)
+
+    with _lock:
+        entry = dict(_entry(_load_cache(), domain))
+
+    # 1) 템플릿 시도
+    if entry["xpath"]:
+        started = time.perf_counter()
+        title = get_title(doc).strip()
+        content_text = _extract_with_template(doc, entry["xpath"])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        hit = bool(content_text and title)
+        with _lock:
+            live = _entry(_load_cache(), domain)
+            dropped = False
+            if hit:
+                live["hits"] += 1
+                live["consecutive_misses"] = 0
+                live["template_ms"] += elapsed_ms
+            else:
+                live["misses"] += 1
+                live["consecutive_misses"] += 1
+                if live["consecutive_misses"] >= MAX_TEMPLATE_MISSES:
+                    print(f"⚠️ {domain} 템플릿 폐기: {live['xpath']}")
+                    live["xpath"] = None
+                    live["consecutive_misses"] = 0
+                    dropped = True
+            due = _mark_dirty(dropped)
+        if due:
+            save_templates()
+        if hit:
+            return title, content_text, {"method": "template", "elapsed_ms": round(elapsed_ms, 2)}
+
+    # 2) readability 전체 채점
+    started = time.perf_counter()
+    title, content_html, content_text = _extract_with_readability(html() if callable(html) else html)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not title or not content_text:
+        raise ArticleParseError("기사 제목 또는 본문을 찾을 수 없습니다.")
+
+    # 3) 템플릿 학습 (readability 성공 시)
+    learned = None
+    if len(content_text) >= MIN_TEMPLATE_TEXT:
+        node = _locate_content_node(doc, content_html)
+        if node is not None:
+            learned = _xpath_for(doc, node)
+
+    with _lock:
+        live = _entry(_load_cache(), domain)
+        live["readability_runs"] += 1
+        live["readability_ms"] += elapsed_ms
+        adopted = bool(learned) and not live["xpath"]
+        if adopted:
+            live["xpath"] = learned
+            live["consecutive_misses"] = 0
+        due = _mark_dirty(adopted)
+    if due:
+        save_templates()
+
+    return title, content_text, {"method": "readability", "elapsed_ms": round(elapsed_ms, 2)}
+
+
+def extract_article_bytes(content, url, content_type=None):
+    """응답 바이트에서 바로 추출 — 문자셋을 판별해 lxml에 바이트째로 넘긴다 (비동기/파이프라인용)"""
+    doc, encoding = parse_document(content, content_type)
+    return extract_article(lambda: content.decode(encoding, errors="replace"), url, doc=doc)
+
+
+# ===============================
+# 📊 템플릿 적중률 / 절약 시간
+# ===============================
+def template_stats():
+    with _lock:
+        cache = _load_cache()
+        domains = {}
+        total_hits = total_attempts = 0
+        total_saved_ms = 0.0
+        for domain, e in sorted(cache.items()):
+            attempts = e["hits"] + e["misses"]
+            avg_readability = e["readability_ms"] / e["readability_runs"] if e["readability_runs"] else 0.0
+            avg_template = e["template_ms"] / e["hits"] if e["hits"] else 0.0
+            saved_ms = max(avg_readability - avg_template, 0.0) * e["hits"]
+            domains[domain] = {
+                "xpath": e["xpath"],
+                "hits": e["hits"],
+                "misses": e["misses"],
+                "hit_rate": round(e["hits"] / attempts, 3) if attempts else None,
+                "avg_readability_ms": round(avg_readability, 2),
+                "avg_template_ms": round(avg_template, 2),
+                "saved_ms": round(saved_ms, 1),
+            }
+            total_hits += e["hits"]
+            total_attempts += attempts
+            total_saved_ms += saved_ms
+
+    return {
+        "domains": domains,
+        "hit_rate": round(total_hits / total_attempts, 3) if total_attempts else None,
+        "saved_ms": round(total_saved_ms, 1),
+    }
@@ -0,0 +1,416 @@
+# api/common/article_store.py
+# 수집한 기사를 SQLite에 영구 저장 (URL 기준 upsert) + FTS5 전문 검색
+#
+# - 모든 스크래퍼가 save_articles()로 기사를 넘기면 백그라운드 쓰기 스레드가 모아서 한 트랜잭션으로 저장한다.
+#   (크롤링 경로에서는 큐에 넣기만 하므로 응답 지연이 거의 없다)
+# - 재수집으로 내용이 같은 기사를 다시 upsert해도 FTS 색인은 내용이 바뀐 경우에만 갱신한다.
+# - WAL 모드라 쓰는 중에도 /api/search 읽기가 막히지 않는다.
+# - 한국어는 띄어쓰기 단위 토큰화가 잘 안 맞으므로 FTS5 trigram 토크나이저로 부분 문자열 검색을 한다.
+#   (3글자 미만 검색어는 trigram 색인을 못 쓰므로 LIKE로 찾는다)
+# - 출처별 "처음 본 기사" 로그는 article_sources((출처, URL)마다 한 행, id가 처음 본 순서)에 남긴다 (?since= 델타 응답의 커서).
+#   articles.source는 처음 저장한 출처뿐이라, 다른 출처(parse_article/백필 등)로 먼저 저장된 URL도 여기서는 새 기사로 잡힌다.
+#   커서는 "<저장소 id>.<seq>" — 저장소 id는 DB 파일마다 한 번 만드는 임의 값(store_meta)이라, 다른 DB(다른 인스턴스의
+#   /tmp, 콜드 스타트로 새로 만든 DB)에서 나온 커서는 알아보고 전부 다시 보낸다 (id가 1부터 다시 시작해도 기사를 놓치지 않음).
+# - 저장소는 모든 엔드포인트가 같은 ARTICLE_DB_PATH를 볼 때만 의미가 있다 (스크래퍼가 쓰고 /api/search·startuprecipe가 읽음).
+#   vercel.json은 api/*.py를 함수마다 따로 빌드하고 함수마다 /tmp가 따로라, 기본값(/tmp)으로는 서로의 기사를 못 본다.
+#   → 서버리스(VERCEL / AWS_LAMBDA_FUNCTION_NAME 환경변수)에서는 ARTICLE_DB_PATH를 직접 줘야 저장소를 켠다
+#     (모든 함수가 함께 마운트한 영구 볼륨 경로). 안 주면 저장소를 끄고 시작할 때 경고, /api/search는 503.
+#   로컬/단일 서버(한 프로세스나 한 호스트에서 모든 앱을 띄움)는 /tmp/articles.db 기본값 그대로 공유된다.
+# - 본문까지 저장한 URL은 common/seen_index(Bloom 필터)에도 넣어, 다음 본문 수집 때 저장된 본문을 다시 쓴다
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from pytz import timezone
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+SERVERLESS = bool(os.environ.get("VERCEL") or os.environ.get("AWS_LAMBDA_FUNCTION_NAME"))
+# 서버리스에서는 함수끼리 공유되는 경로를 직접 줘야 한다 (함수마다 /tmp가 따로)
+ARTICLE_DB_PATH = os.environ.get("ARTICLE_DB_PATH") or (None if SERVERLESS else "/tmp/articles.db")
+ARTICLE_STORE_ENABLED = ARTICLE_DB_PATH is not None and os.environ.get("ARTICLE_STORE", "1") not in ("0", "false")
+MAX_SEARCH_LIMIT = 200
+FLUSH_TIMEOUT = 10  # flush()가 쓰기 스레드를 기다리는 최대 시간(초)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id           INTEGER PRIMARY KEY,
+    url          TEXT NOT NULL UNIQUE,
+    source       TEXT NOT NULL,
+    title        TEXT,
+    summary      TEXT,
+    body         TEXT,
+    published_at TEXT,
+    first_seen   TEXT NOT NULL,
+    last_seen    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source_published ON articles (source, published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_source_id ON articles (source, id);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('store_id', lower(hex(randomblob(6))));
+
+CREATE TABLE IF NOT EXISTS article_sources (
+    id         INTEGER PRIMARY KEY,
+    source     TEXT NOT NULL,
+    url        TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen  TEXT NOT NULL,
+    UNIQUE (source, url)
+);
+CREATE INDEX IF NOT EXISTS idx_article_sources_source_id ON article_sources (source, id);
+CREATE INDEX IF NOT EXISTS idx_article_sources_source_last_seen ON article_sources (source, last_seen);
+-- article_sources가 생기기 전 DB: 기존 기사를 articles.id 그대로 옮겨 이미 나간 커서가 계속 맞도록
+INSERT INTO article_sources (id, source, url, first_seen, last_seen)
+SELECT id, source, url, first_seen, last_seen FROM articles
+WHERE NOT EXISTS (SELECT 1 FROM article_sources);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, body, content='articles', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, summary, body) VALUES (new.id, new.title, new.summary, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, body) VALUES ('delete', old.id, old.title, old.summary, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, summary, body ON articles
+WHEN old.title IS NOT new.title OR old.summary IS NOT new.summary OR old.body IS NOT new.body BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, body) VALUES ('delete', old.id, old.title, old.summary, old.body);
+    INSERT INTO articles_fts(rowid, title, summary, body) VALUES (new.id, new.title, new.summary, new.body);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO articles (url, source, title, summary, body, published_at, first_seen, last_seen)
+VALUES (:url, :source, :title, :summary, :body, :published_at, :seen, :seen)
+ON CONFLICT(url) DO UPDATE SET
+    title        = COALESCE(NULLIF(excluded.title, ''), articles.title),
+    summary      = COALESCE(NULLIF(excluded.summary, ''), articles.summary),
+    body         = COALESCE(NULLIF(excluded.body, ''), articles.body),
+    published_at = COALESCE(excluded.published_at, articles.published_at),
+    last_seen    = excluded.last_seen
+"""
+
+SOURCE_SQL = """
+INSERT INTO article_sources (source, url, first_seen, last_seen) VALUES (:source, :url, :seen, :seen)
+ON CONFLICT(source, url) DO UPDATE SET last_seen = excluded.last_seen
+"""
+
+if ARTICLE_DB_PATH is None:
+    print("🚨 기사 저장소 꺼짐: 서버리스 환경인데 ARTICLE_DB_PATH가 없습니다 — 함수마다 /tmp가 따로라 "
+          "공유 저장소가 아니면 검색/델타/당일 기사 재사용이 동작하지 않습니다. 모든 함수가 보는 영구 경로를 설정하세요.")
+
+
+def store_unavailable():
+    """저장소를 못 쓰는 이유(응답 메시지), 쓸 수 있으면 None"""
+    if ARTICLE_DB_PATH is None:
+        return "기사 저장소가 설정되지 않았습니다 (서버리스에서는 모든 함수가 공유하는 ARTICLE_DB_PATH 필요)."
+    if not ARTICLE_STORE_ENABLED:
+        return "기사 저장소가 꺼져 있습니다 (ARTICLE_STORE=0)."
+    return None
+
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+_local = threading.local()
+
+
+# ===============================
+# 🔌 연결
+# ===============================
+def _connect():
+    if ARTICLE_DB_PATH is None:
+        raise sqlite3.OperationalError(store_unavailable())
+    conn = sqlite3.connect(ARTICLE_DB_PATH, timeout=10, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _reader():
+    """스레드별 읽기 연결"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
+        conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _now():
+    return datetime.now(timezone('Asia/Seoul')).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def normalize_published_at(value):
+    """'2025.10.31' / '2025-10-31 12:00' 등을 'YYYY-MM-DD[ HH:MM]' 형태로 맞춘다 (날짜 필터용)"""
+    if not value:
+        return None
+    value = str(value).strip()
+    return value[:10].replace('.', '-') + value[10:]
+
+
+# ===============================
+# ✍️ 쓰기 (백그라운드 배치)
+# ===============================
+def _writer_loop():
+    conn = None
+    while True:
+        batch = [_queue.get()]
+        while True:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            # 연결도 여기서 — DB 경로를 못 쓰거나 FTS5 trigram이 없어도 스레드가 죽지 않고 묶음을 버린다
+            # (죽으면 task_done이 안 불려 flush()/new_since가 영원히 기다림). 다음 묶음 때 다시 연결해 본다.
+            if conn is None:
+                conn = _connect()
+            rows = [row for rows in batch for row in rows]
+            with conn:
+                conn.executemany(UPSERT_SQL, rows)
+                conn.executemany(SOURCE_SQL, rows)
+        except Exception as e:
+            print(f"⚠️ 기사 저장 실패 ({len(batch)}묶음): {e}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def _ensure_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="article-store-writer", daemon=True)
+            _writer.start()
+
+
+def save_articles(source, articles, url="url", title="title", summary="summary", body=None, published_at=None):
+    """
+    기사 dict 목록을 저장 큐에 넣는다 (즉시 반환). 필드 이름은 엔드포인트마다 다르므로 키 이름으로 매핑한다.
+    예) save_articles("thebell", articles, summary="body", published_at="date")
+    """
+    if not ARTICLE_STORE_ENABLED or not articles:
+        return
+    seen = _now()
+    rows = []
+    for art in articles:
+        link = art.get(url)
+        if not link:
+            continue
+        rows.append({
+            "url": link,
+            "source": source,
+            "title": art.get(title),
+            "summary": art.get(summary) if summary else None,
+            "body": art.get(body) if body else None,
+            "published_at": normalize_published_at(art.get(published_at)) if published_at else None,
+            "seen": seen,
+        })
+    if rows:
+        _ensure_writer()
+        _queue.put(rows)
+    if body:
+        from . import seen_index  # 본문까지 저장한 URL → 다음부터 본문 수집을 건너뜀
+        seen_index.mark_seen([r["url"] for r in rows if r["body"]])
+
+
+def flush(timeout=FLUSH_TIMEOUT):
+    """큐에 쌓인 기사를 모두 쓸 때까지 기다린다 (최대 timeout초) → 다 썼으면 True"""
+    if _writer is None:
+        return True
+    deadline = time.monotonic() + timeout
+    with _queue.all_tasks_done:
+        while _queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"⚠️ 기사 저장 대기 시간 초과 ({_queue.unfinished_tasks}묶음 남음)")
+                return False
+            _queue.all_tasks_done.wait(remaining)
+    return True
+
+
+atexit.register(flush)
+
+
+# ===============================
+# 🔁 델타 응답 (?since=<cursor>)
+# ===============================
+def parse_cursor(value):
+    """
+    ?since= 값 → (저장소 id, seq), 없으면 None. 형식이 틀리면 ValueError.
+    예전 형식(숫자만)은 저장소 id를 모르는 커서 → (None, seq) — new_since가 전부 다시 보낸다.
+    """
+    if value is None or value == "":
+        return None
+    store_id, _, seq = value.rpartition(".")
+    seq = int(seq)
+    if seq < 0:
+        raise ValueError("음수 커서")
+    return store_id or None, seq
+
+
+def _store_id(conn):
+    return conn.execute("SELECT value FROM store_meta WHERE key = 'store_id'").fetchone()[0]
+
+
+def _source_ids(conn, source, urls):
+    """이 출처 seen 로그에서 URL → seq"""
+    ids = {}
+    for i in range(0, len(urls), 500):
+        chunk = urls[i:i + 500]
+        ids.update(conn.execute(
+            "SELECT url, id FROM article_sources WHERE source = ? AND url IN (%s)" % ",".join("?" * len(chunk)),
+            [source, *chunk]).fetchall())
+    return ids
+
+
+class DeltaCursor:
+    """
+    new_since가 돌려주는 커서 — 응답에 실제로 담긴 기사(건수 제한/바이트 예산으로 자른 뒤)로 문자열을 만든다
+    (response_format.resolve_cursor가 부른다). 후보 중 잘린 기사가 있으면 그중 가장 먼저 본 기사 바로 앞까지만 옮겨
+    잘린 기사는 다음 폴링에 나온다 (대신 이번에 나간 기사 일부가 한 번 더 나올 수 있음 — 놓치는 것보다 낫다).
+    """
+
+    def __init__(self, store_id, ids, floor, url="url"):
+        self.store_id = store_id
+        self.ids = ids        # 응답 후보 기사 {URL: seq}
+        self.floor = floor    # 후보가 없을 때의 커서
+        self.url = url
+
+    def resolve(self, returned):
+        sent = {a.get(self.url) for a in returned if isinstance(a, dict)}
+        cut = [seq for link, seq in self.ids.items() if link not in sent]
+        if cut:
+            seq = min(cut) - 1
+        else:
+            seq = max(self.ids.values()) if self.ids else self.floor
+        return f"{self.store_id}.{seq}"
+
+
+def new_since(source, articles, since=None, url="url"):
+    """
+    → (since 이후 이 출처에서 처음 본 기사만, DeltaCursor). since가 None이면 articles 그대로.
+    since가 다른 저장소(다른 인스턴스/새로 만든 DB)의 커서거나 예전 숫자 커서면 since 없이 요청한 것처럼 전부 보낸다.
+    커서는 응답 기사의 seq로 만들므로 저장 큐를 먼저 비운다 (이번 요청에서 처음 본 기사도 seq가 있어야 함).
+    저장소를 못 쓰면 (articles 그대로, None) — 클라이언트는 이전 커서를 그대로 쓰면 된다.
+    """
+    if not ARTICLE_STORE_ENABLED:
+        return articles, None
+    try:
+        if not flush():
+            return articles, None
+        conn = _reader()
+        store_id = _store_id(conn)
+        if since is not None and since[0] != store_id:
+            print(f"🔁 {source} 다른 저장소의 커서({since[0] or '예전 형식'}) → 전부 다시 보냄")
+            since = None
+        if since is None:
+            floor = conn.execute("SELECT COALESCE(MAX(id), 0) FROM article_sources WHERE source = ?",
+                                 (source,)).fetchone()[0]
+            ids = _source_ids(conn, source, [a.get(url) for a in articles if a.get(url)])
+            return articles, DeltaCursor(store_id, ids, floor, url)
+        fresh = dict(conn.execute(
+            "SELECT url, id FROM article_sources WHERE source = ? AND id > ?", (source, since[1])).fetchall())
+    except sqlite3.Error as e:
+        print(f"⚠️ 델타 조회 실패: {e}")
+        return articles, None
+    articles = [a for a in articles if a.get(url) in fresh]
+    ids = {a[url]: fresh[a[url]] for a in articles}
+    return articles, DeltaCursor(store_id, ids, since[1], url)
+
+
+# ===============================
+# 🔎 검색
+# ===============================
+def _fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def search_articles(q=None, sources=None, date_from=None, date_to=None, limit=50):
+    """
+    q: 공백으로 나눈 검색어 모두 포함 (AND). 3글자 이상은 FTS5 trigram, 미만은 LIKE
+    sources: 출처 목록, date_from/date_to: 'YYYY-MM-DD' (published_at 기준, 양끝 포함)
+    """
+    limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+    return list(iter_articles(q, sources, date_from, date_to, limit))
+
+
+def iter_articles(q=None, sources=None, date_from=None, date_to=None, limit=None):
+    """search_articles와 같은 조건, 커서에서 한 행씩 (limit 없으면 전부 — 여러 날치 내보내기용)"""
+    terms = (q or "").split()
+    fts_terms = [t for t in terms if len(t) >= 3]
+    like_terms = [t for t in terms if len(t) < 3]
+
+    where, params = [], []
+    if fts_terms:
+        where.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+        params.append(" AND ".join(_fts_phrase(t) for t in fts_terms))
+    for t in like_terms:
+        where.append("(a.title LIKE ? OR a.summary LIKE ? OR a.body LIKE ?)")
+        params.extend(["%" + t + "%"] * 3)
+    if sources:
+        where.append("a.source IN (%s)" % ",".join("?" * len(sources)))
+        params.extend(sources)
+    if date_from:
+        where.append("substr(a.published_at, 1, 10) >= ?")
+        params.append(normalize_published_at(date_from))
+    if date_to:
+        where.append("substr(a.published_at, 1, 10) <= ?")
+        params.append(normalize_published_at(date_to))
+
+    sql = ("SELECT a.url, a.source, a.title, a.summary, a.published_at, a.first_seen, "
+           "length(a.body) AS body_chars FROM articles a")
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY COALESCE(a.published_at, a.first_seen) DESC, a.id DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    for row in _reader().execute(sql, params):
+        yield dict(row)
+
+
+def recent_articles(sources, since):
+    """
+    since('YYYY-MM-DD[ HH:MM:SS]', KST) 이후 이 출처들의 목록에서 본 기사 [{url, source, title, summary}]
+    — 당일 수집 기사 재사용용 (다시 크롤링하지 않음). 최근 본 것부터.
+    """
+    if not ARTICLE_STORE_ENABLED or not sources:
+        return []
+    flush()
+    sql = ("SELECT a.url, s.source, a.title, a.summary FROM article_sources s JOIN articles a ON a.url = s.url "
+           "WHERE s.source IN (%s) AND s.last_seen >= ? ORDER BY s.last_seen DESC, s.id DESC"
+           % ",".join("?" * len(sources)))
+    return [dict(row) for row in _reader().execute(sql, [*sources, since])]
+
+
+def get_article(url):
+    row = _reader().execute(
+        "SELECT url, source, title, summary, body, published_at, first_seen, last_seen FROM articles WHERE url = ?",
+        (url,)).fetchone()
+    return dict(row) if row else None
+
+
+def urls_missing_body(source=None, limit=500):
+    """본문(body)이 아직 없는 기사 [(url, source), ...] — 최근 기사부터 (백필용)"""
+    sql = "SELECT url, source FROM articles WHERE body IS NULL"
+    params = []
+    if source:
+        sql += " AND source = ?"
+        params.append(source)
+    sql += " ORDER BY last_seen DESC LIMIT ?"
+    params.append(limit)
+    return [tuple(row) for row in _reader().execute(sql, params)]
@@ -0,0 +1,80 @@
+# api/common/categories.py
+# 여러 카테고리 목록을 동시에 크롤링해서 하나로 합치기 (?categories=)
+#
+# - 인베스트조선 catid, 시그널 NClass처럼 같은 목록 페이지를 카테고리 값만 바꿔 여러 번 도는 경우,
+#   카테고리마다 차례로 부르면 걸리는 시간이 카테고리 수만큼 늘어난다.
+#   여기서는 카테고리별 크롤링을 동시에 돌린다 (동기: 스레드풀 + 공유 세션, 비동기: asyncio.gather).
+#   요청 간격은 여전히 common.ratelimit이 호스트별로 지킨다.
+# - 여러 카테고리에 함께 실린 기사는 URL 기준으로 한 번만 남기고, article["categories"]에 속한 카테고리를 모두 적는다.
+import asyncio
+import contextvars
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+MAX_CATEGORIES = 8
+_CATEGORY_RE = re.compile(r"^[\w-]{1,32}$")
+
+
+def parse_categories(value, default):
+    """'2,3' → ['2', '3'] (순서 유지, 중복 제거), 비어 있으면 [default]. 형식이 틀리거나 너무 많으면 ValueError"""
+    categories = list(dict.fromkeys(c.strip() for c in (value or "").split(",") if c.strip()))
+    if not categories:
+        return [default]
+    if len(categories) > MAX_CATEGORIES:
+        raise ValueError(f"categories는 최대 {MAX_CATEGORIES}개까지 가능합니다.")
+    bad = [c for c in categories if not _CATEGORY_RE.match(c)]
+    if bad:
+        raise ValueError(f"categories 형식이 올바르지 않습니다: {', '.join(bad)}")
+    return categories
+
+
+def merge_categories(results, url_key="url"):
+    """
+    {카테고리: [기사 dict]} → URL 기준 중복 제거한 기사 목록 (카테고리 순서, 카테고리 안 순서 유지).
+    각 기사에 "categories": [속한 카테고리...]를 붙인다.
+    """
+    merged = {}
+    for category, articles in results.items():
+        for art in articles:
+            url = art.get(url_key)
+            if url in merged:
+                if category not in merged[url]["categories"]:
+                    merged[url]["categories"].append(category)
+                continue
+            merged[url] = {**art, "categories": [category]}
+    return list(merged.values())
+
+
+# ===============================
+# 🚀 동시 크롤링
+# ===============================
+def crawl_categories(crawl, categories):
+    """crawl(category) → 기사 dict 목록. 카테고리별로 동시에 돌려 {카테고리: 목록} (실패한 카테고리는 빈 목록)"""
+    if len(categories) == 1:
+        return {categories[0]: crawl(categories[0])}
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(categories)) as pool:
+        # 요청별 fetch 통계(contextvar)가 워커 스레드에도 이어지도록 컨텍스트를 복사해 넘김
+        futures = {c: pool.submit(contextvars.copy_context().run, crawl, c) for c in categories}
+        for category, fut in futures.items():
+            try:
+                results[category] = fut.result()
+            except Exception as e:
+                print(f"⚠️ 카테고리 {category} 수집 실패: {e}")
+                results[category] = []
+    return results
+
+
+async def crawl_categories_async(crawl, categories):
+    """crawl_categories의 비동기 버전 — crawl(category)는 코루틴 함수"""
+    outcomes = await asyncio.gather(*(crawl(c) for c in categories), return_exceptions=True)
+    results = {}
+    for category, outcome in zip(categories, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"⚠️ 카테고리 {category} 수집 실패: {outcome}")
+            outcome = []
+        results[category] = outcome
+    return results
@@ -0,0 +1,73 @@
+# api/common/charset.py
+# 응답 바이트의 문자셋 판별 (헤더 → BOM → <meta charset>) + 한 번만 디코딩
+#
+# - parse_article은 예전에 utf-8로 고정해서 EUC-KR 페이지가 깨졌고,
+#   다른 스크래퍼의 resp.text는 Content-Type에 charset이 없으면 requests가 ISO-8859-1로 잘못 디코딩하거나
+#   (text/html이 아니면) 본문 전체를 통계적으로 훑는 apparent_encoding으로 넘어가 큰 페이지에서 느리다.
+# - 여기서는 앞부분 몇 KB의 BOM/<meta>만 보고 정한다. 정해진 인코딩은 한 번만 디코딩한다:
+#   utf-8처럼 libxml2가 직접 읽는 인코딩은 바이트째 lxml에 넘기고 (str 왕복 없음, 더 빠름),
+#   cp949 등은 libxml2의 iconv 변환이 파이썬 코덱보다 느려서 파이썬에서 str로 한 번 디코딩해 넘긴다.
+# - EUC-KR 계열 이름은 모두 cp949(확장 완성형 포함)로 맞춘다 — 엄격한 euc_kr은 "똠" 같은 글자를 못 읽는다.
+import codecs
+import re
+
+import lxml.html
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+SNIFF_BYTES = 8192          # <meta charset>을 찾는 앞부분 크기
+DEFAULT_ENCODING = "utf-8"
+NATIVE_ENCODINGS = {"utf-8", "ascii", "iso8859-1"}   # lxml(libxml2)에 바이트째 넘기는 편이 빠른 인코딩
+
+_BOMS = ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16-be"))
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+_ALIASES = {"euc_kr": "cp949", "ksc5601": "cp949", "ks_c_5601": "cp949", "uhc": "cp949", "windows-949": "cp949",
+            "x-windows-949": "cp949"}
+
+
+def normalize_encoding(name):
+    """문자셋 이름 → 파이썬 코덱 이름 (모르는 이름이면 None)"""
+    if not name:
+        return None
+    name = name.strip().lower()
+    name = _ALIASES.get(name, name)
+    try:
+        codec = codecs.lookup(name).name
+    except LookupError:
+        return None
+    return _ALIASES.get(codec, codec)
+
+
+def sniff_encoding(content_type=None, head=b""):
+    """Content-Type 헤더와 본문 앞부분(head)으로 인코딩 결정: BOM → 헤더 charset → <meta> → utf-8"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    if content_type:
+        m = _HEADER_CHARSET.search(content_type)
+        encoding = normalize_encoding(m.group(1)) if m else None
+        if encoding:
+            return encoding
+    m = _META_CHARSET.search(head[:SNIFF_BYTES])
+    encoding = normalize_encoding(m.group(1).decode("ascii", "ignore")) if m else None
+    return encoding or DEFAULT_ENCODING
+
+
+def decode_html(content, content_type=None):
+    """응답 바이트 → str (한 번만 디코딩, 깨진 바이트는 대체 문자)"""
+    return content.decode(sniff_encoding(content_type, content[:SNIFF_BYTES]), errors="replace")
+
+
+def response_text(resp):
+    """resp.text 대신 쓴다 (requests/httpx 응답 모두) — apparent_encoding 통계 추측 없이 판별"""
+    return decode_html(resp.content, resp.headers.get("Content-Type"))
+
+
+def parse_document(content, content_type=None):
+    """응답 바이트 → (lxml.html 문서, 인코딩). 인코딩 판별 후 NATIVE_ENCODINGS면 바이트째, 아니면 한 번 디코딩해 넘긴다."""
+    encoding = sniff_encoding(content_type, content[:SNIFF_BYTES])
+    if encoding in NATIVE_ENCODINGS:
+        return lxml.html.document_fromstring(content, parser=lxml.html.HTMLParser(encoding=encoding)), encoding
+    return lxml.html.document_fromstring(content.decode(encoding, errors="replace")), encoding
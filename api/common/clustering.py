@@ -0,0 +1,151 @@
+# api/common/clustering.py
+# 당일 기사 묶기 (?cluster=1) — 같은 딜/사건을 다룬 기사끼리 클러스터 번호를 붙이고 대표 제목을 뽑는다
+#
+# - 제목+요약을 정규화한 뒤 글자 2/3-gram TF-IDF 벡터로 만든다 (한국어는 조사/띄어쓰기 때문에 단어 단위보다 글자 n-gram이 잘 맞음).
+#   n-gram은 문자열을 만들지 않고 코드 포인트(21비트)를 uint64 하나로 이어 붙인 정수 → np.unique로 어휘 번호를 매긴다.
+#   벡터는 scipy.sparse CSR 행렬, 행마다 L2 정규화 → X @ X.T 가 곧 코사인 유사도 행렬.
+# - 유사도가 threshold 이상인 쌍을 간선으로 보고, 이웃 유사도 합이 큰 기사부터 중심으로 삼아
+#   아직 안 묶인 이웃을 그 클러스터에 넣는다 (star clustering). 연결 요소로 묶으면 A~B~C~... 식으로
+#   "시리즈A 투자 유치" 같은 흔한 표현을 타고 수백 건이 한 덩어리가 되므로, 모든 기사가 중심과 직접 비슷해야 한다.
+# - 대표 제목은 그 중심 기사.
+# - 거의 모든 기사에 나오는 n-gram("투자", "억원" 등)은 max_df로 빼서 유사도 행렬을 희소하게 유지한다.
+# 기사 1,000건 기준 수십 ms (bench/bench_clustering.py — 정답 딜 기준 pair precision/recall도 함께 잰다).
+import time
+
+import numpy as np
+from scipy import sparse
+
+from .company_index import normalize_for_match
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+NGRAM_RANGE = (2, 3)
+DEFAULT_THRESHOLD = 0.65   # 코사인 유사도 — 중심 기사와 이 이상이면 같은 클러스터
+MAX_DF = 0.2               # 이 비율보다 많은 기사에 나오는 n-gram은 뺀다 (기사 MIN_DOCS_FOR_MAX_DF건 이상일 때)
+MIN_DOCS_FOR_MAX_DF = 50   # 기사가 적으면 한 딜이 20%를 넘을 수 있으므로 적용하지 않는다
+_CODE_BITS = np.uint64(21)  # 유니코드 코드 포인트 최대 0x10FFFF
+SUMMARY_CHARS = 200        # 요약은 앞부분만 (긴 요약이 제목 신호를 덮지 않도록)
+
+
+def _ngram_codes(texts, lo=NGRAM_RANGE[0], hi=NGRAM_RANGE[1]):
+    """텍스트 목록 → (문서 번호 배열, n-gram 정수 코드 배열). 문서 경계를 넘는 n-gram은 뺀다."""
+    normalized = [normalize_for_match(t) for t in texts]
+    lengths = np.fromiter(map(len, normalized), dtype=np.int64, count=len(normalized))
+    chars = np.frombuffer("".join(normalized).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    doc = np.repeat(np.arange(len(normalized), dtype=np.int32), lengths)
+    rows, codes = [], []
+    for n in range(lo, hi + 1):
+        m = len(chars) - n + 1
+        if m <= 0:
+            continue
+        code = chars[:m].copy()
+        for j in range(1, n):
+            code = (code << _CODE_BITS) | chars[j:j + m]
+        inside = doc[:m] == doc[n - 1:n - 1 + m]
+        rows.append(doc[:m][inside])
+        codes.append(code[inside])
+    if not rows:
+        return np.zeros(0, np.int32), np.zeros(0, np.uint64)
+    return np.concatenate(rows), np.concatenate(codes)
+
+
+def tfidf_matrix(texts, max_df=MAX_DF):
+    """텍스트 목록 → 행 L2 정규화된 TF-IDF CSR 행렬 (문서 × n-gram)"""
+    n_docs = len(texts)
+    rows, codes = _ngram_codes(texts)
+    vocab, cols = np.unique(codes, return_inverse=True)
+    # 같은 (문서, n-gram) 좌표는 더해져서 tf가 된다
+    tf = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols.ravel())), shape=(n_docs, len(vocab)))
+    tf.sum_duplicates()
+
+    df = np.bincount(tf.indices, minlength=tf.shape[1])
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+    if n_docs >= MIN_DOCS_FOR_MAX_DF:
+        idf[df > max_df * n_docs] = 0.0
+
+    tf.data = (1 + np.log(tf.data)) * idf[tf.indices]     # sublinear tf × idf
+    tf.eliminate_zeros()
+    norms = np.sqrt(np.asarray(tf.multiply(tf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1 / norms).dot(tf).tocsr()
+
+
+def cluster_texts(texts, threshold=DEFAULT_THRESHOLD):
+    """
+    텍스트 목록 → (클러스터 번호 배열, 대표 인덱스 {번호: 행}, 크기 배열)
+    번호는 큰 클러스터부터 0, 1, 2... (같은 크기면 먼저 나온 기사 순)
+    """
+    n = len(texts)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), {}, np.zeros(0, dtype=np.int64)
+    x = tfidf_matrix(texts)
+    sim = (x @ x.T).tocoo()
+    keep = (sim.data >= threshold) & (sim.row != sim.col)
+    graph = sparse.csr_matrix((sim.data[keep], (sim.row[keep], sim.col[keep])), shape=(n, n))
+
+    # 이웃 유사도 합이 큰 기사부터 중심으로 — 아직 안 묶인 이웃을 데려간다
+    centrality = np.asarray(graph.sum(axis=1)).ravel()
+    raw = np.full(n, -1, dtype=np.int64)
+    centers = []
+    for i in np.argsort(-centrality, kind="stable"):
+        if raw[i] >= 0:
+            continue
+        members = graph.indices[graph.indptr[i]:graph.indptr[i + 1]]
+        members = members[raw[members] < 0]
+        raw[i] = raw[members] = len(centers)
+        centers.append(i)
+
+    # 큰 클러스터부터 번호를 다시 매긴다 (같은 크기면 중심이 앞선 기사 순)
+    sizes = np.bincount(raw)
+    order = np.lexsort((np.asarray(centers), -sizes))
+    relabel = np.empty_like(order)
+    relabel[order] = np.arange(len(order))
+    representatives = {int(relabel[c]): int(i) for c, i in enumerate(centers)}
+    return relabel[raw], representatives, sizes[order]
+
+
+def cluster_articles(articles, fields, url_key="url", threshold=DEFAULT_THRESHOLD):
+    """
+    기사 dict 목록에 "cluster" 번호를 붙이고 → (기사 목록, 클러스터 요약, 통계)
+    클러스터 요약은 2건 이상 묶인 것만: [{"cluster", "size", "headline", "url"}, ...] (큰 것부터)
+    """
+    started = time.perf_counter()
+    title, rest = fields[0], fields[1:]
+    texts = [" ".join([str(art.get(title) or "")] + [str(art.get(f) or "")[:SUMMARY_CHARS] for f in rest])
+             for art in articles]
+    labels, representatives, sizes = cluster_texts(texts, threshold)
+    for art, label in zip(articles, labels):
+        art["cluster"] = int(label)
+
+    clusters = []
+    for label, size in enumerate(sizes):
+        if size < 2:
+            break
+        rep = articles[representatives[label]]
+        clusters.append({"cluster": label, "size": int(size), "headline": rep.get(fields[0]), "url": rep.get(url_key)})
+    stats = {"articles": len(articles), "clusters": len(clusters), "clustered_articles": int(sum(c["size"] for c in clusters)),
+             "threshold": threshold, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+    return articles, clusters, stats
+
+
+def cluster_from_args(args):
+    """
+    엔드포인트 공용: ?cluster=1[&cluster_threshold=0.65] → cluster(articles, fields, url_key) 함수, 없으면 None.
+    cluster()는 기사마다 "cluster" 번호를 붙이고 응답에 합칠 {"clusters": [...], "clustering": 통계}를 돌려준다.
+    크롤링 전에 호출해 잘못된 threshold는 ValueError로 미리 거른다.
+    """
+    if args.get("cluster") not in ("1", "true"):
+        return None
+    try:
+        threshold = float(args.get("cluster_threshold") or DEFAULT_THRESHOLD)
+    except ValueError:
+        raise ValueError("cluster_threshold는 숫자여야 합니다.") from None
+    if not 0 < threshold <= 1:
+        raise ValueError("cluster_threshold는 0보다 크고 1 이하여야 합니다.")
+
+    def cluster(articles, fields, url_key="url"):
+        _, clusters, stats = cluster_articles(articles, fields, url_key, threshold)
+        return {"clusters": clusters, "clustering": stats}
+
+    return cluster
@@ -0,0 +1,96 @@
+# api/common/company_index.py
+# 회사명 정규화 + 당일 크롤링 기사(제목/요약) 역색인
+#
+# 스타트업리시피 기업마다 구글 뉴스를 한 번씩 검색하지만, 투자 기사는 같은 날 수집한
+# 더벨/인베스트조선/시그널 기사에 이미 있는 경우가 많다.
+# → 당일 기사로 메모리 역색인을 만들어 먼저 로컬에서 찾고, 못 찾은 회사만 구글에 묻는다.
+#
+# 한국어 제목은 회사명 뒤에 조사가 붙거나('토스가', '토스,') 띄어쓰기가 들쭉날쭉해서
+# 단어 단위 색인으로는 잘 안 잡힌다 → 정규화한 텍스트의 글자 2-gram으로 색인하고 부분 문자열로 확인한다.
+import re
+from collections import defaultdict
+
+# ===============================
+# 🔧 정규식 (행마다 re.sub 하던 것을 미리 컴파일)
+# ===============================
+_PAREN_RE = re.compile(r'\s*\(.*?\)\s*')
+_SYMBOL_RE = re.compile(r'[^\w가-힣&\s-]')
+_NON_WORD_RE = re.compile(r'[\W_]+')
+
+
+def normalize_company(company_text):
+    """스타트업리시피 회사명 칸 → 표시용 회사명 ('리벨리온(Rebellions)' → '리벨리온')"""
+    company_name = _PAREN_RE.sub('', company_text)
+    return _SYMBOL_RE.sub('', company_name).strip()
+
+
+def normalize_for_match(text):
+    """대소문자/공백/기호 차이를 무시하고 비교하기 위한 정규화"""
+    return _NON_WORD_RE.sub('', text.lower())
+
+
+def _bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+# ===============================
+# 🗂️ 역색인
+# ===============================
+class ArticleIndex:
+    """
+    기사 dict 목록({'title', 'summary', 'link', 'source', ...})을 글자 2-gram으로 색인한다.
+    lookup(회사명) → 회사명이 제목(우선) 또는 요약에 들어 있는 기사
+    """
+
+    def __init__(self, articles=()):
+        self._docs = []                      # (정규화 제목, 정규화 요약, 원본 기사)
+        self._postings = defaultdict(set)    # 2-gram → 문서 번호
+        for art in articles:
+            self.add(art)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, article):
+        doc_id = len(self._docs)
+        norm_title = normalize_for_match(article.get('title') or '')
+        norm_summary = normalize_for_match(article.get('summary') or '')
+        self._docs.append((norm_title, norm_summary, article))
+        for gram in _bigrams(norm_title) | _bigrams(norm_summary):
+            self._postings[gram].add(doc_id)
+
+    def _candidates(self, key):
+        grams = _bigrams(key)
+        if not grams:  # 한 글자 회사명 → 색인을 못 쓰므로 전체 확인
+            return range(len(self._docs))
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        result = set(postings[0])
+        for p in postings[1:]:
+            if not result:
+                break
+            result &= p
+        return sorted(result)
+
+    def lookup(self, company_name, keywords=None):
+        """
+        회사명이 들어 있는 기사 중 가장 그럴듯한 것 하나 (없으면 None).
+        순위: 제목에 회사명 > 요약에만 회사명, 같은 조건이면 keywords(매처) 일치 > 먼저 수집된 기사
+        """
+        key = normalize_for_match(company_name)
+        if not key:
+            return None
+
+        best, best_rank = None, None
+        for doc_id in self._candidates(key):
+            norm_title, norm_summary, article = self._docs[doc_id]
+            in_title = key in norm_title
+            if not in_title and key not in norm_summary:
+                continue
+            has_keyword = bool(keywords) and keywords.contains_any(
+                (article.get('title') or '') + '\n' + (article.get('summary') or ''))
+            rank = (in_title, has_keyword)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = article, rank
+                if rank == (True, True):
+                    break
+        return best
@@ -0,0 +1,135 @@
+# api/common/enrich.py
+# 목록 결과(제목/요약) → 기사 본문까지 한 요청 안에서 채워 넣는 단계 (?with_body=1)
+#
+# 기존에는 GPT Action이 목록을 받은 뒤 URL마다 /api/parse_article을 따로 호출했다.
+# 여기서는 목록 결과를 바로 병렬 본문 수집/추출 단계로 넘겨 N번의 왕복을 한 번으로 줄인다.
+# 이미 본문까지 저장한 기사(common/seen_index)는 요청 없이 저장된 본문을 쓴다 ("extraction": {"method": "stored"}).
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+
+from .aio_http import fetch_async, run_parse
+from .article import ArticleParseError, extract_article, extract_article_bytes
+from .http import fetch
+from .seen_index import known_bodies, seen_stats
+from .stream_parse import read_document
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+DEFAULT_CONCURRENCY = 6     # 동시에 받는 기사 수 (http.POOL_MAXSIZE 이하)
+MAX_CONCURRENCY = 12
+ARTICLE_TIMEOUT = 8         # 기사 1건 요청 타임아웃(초)
+STAGE_DEADLINE = 45         # 본문 단계 전체 제한 시간(초) — 넘으면 남은 기사는 본문 없이 반환
+
+
+def _fetch_body(url, timeout):
+    resp = fetch(url, timeout=timeout, retries=1, stream=True)  # 단계 마감이 있으므로 재시도는 한 번만
+    doc, html = read_document(resp)  # parse_article과 동일 (문자셋 판별)
+    _, content_text, extraction = extract_article(html, url, doc=doc)
+    return content_text, extraction
+
+
+def _reuse_stored(articles, url_key, stats):
+    """저장된 본문이 있는 기사는 바로 채우고, 본문을 받아야 할 기사만 돌려준다"""
+    targets = [art for art in articles if art.get(url_key)]
+    stored = known_bodies([art[url_key] for art in targets])
+    for art in targets:
+        if art[url_key] in stored:
+            art["content"], art["extraction"] = stored[art[url_key]], {"method": "stored"}
+    stats["reused"] = sum(1 for art in targets if art[url_key] in stored)
+    return [art for art in targets if art[url_key] not in stored]
+
+
+def _finish(stats, started):
+    stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    stats["seen_index"] = seen_stats()
+    print(f"📄 본문 수집: {stats['ok']}/{stats['requested']}건, 저장본 재사용 {stats['reused']}건 ({stats['elapsed_ms']}ms)")
+    return stats
+
+
+def enrich_with_body(articles, url_key="url", concurrency=DEFAULT_CONCURRENCY,
+                     timeout=ARTICLE_TIMEOUT, deadline=STAGE_DEADLINE):
+    """
+    articles의 각 dict에 "content"(본문 텍스트)와 "extraction"을 채운다 (제자리 수정).
+    실패한 기사는 "content": None, "content_error"에 사유를 남긴다. 저장된 본문이 있으면 요청하지 않는다.
+    반환: 단계 통계 dict (requested: 실제로 받은 기사 수, reused: 저장본을 쓴 기사 수)
+    """
+    concurrency = max(1, min(int(concurrency), MAX_CONCURRENCY))
+    started = time.perf_counter()
+    stats = {"requested": 0, "ok": 0, "failed": 0, "timed_out": 0, "concurrency": concurrency}
+
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    futures = {}
+    for art in _reuse_stored(articles, url_key, stats):
+        url = art[url_key]
+        # 요청별 fetch 통계(contextvar)가 워커 스레드에도 이어지도록 컨텍스트를 복사해 넘김
+        futures[pool.submit(contextvars.copy_context().run, _fetch_body, url, timeout)] = art
+    stats["requested"] = len(futures)
+
+    try:
+        for fut in as_completed(futures, timeout=deadline):
+            art = futures.pop(fut)
+            try:
+                art["content"], art["extraction"] = fut.result()
+                stats["ok"] += 1
+            except ArticleParseError as e:
+                art["content"], art["content_error"] = None, str(e)
+                stats["failed"] += 1
+            except Exception as e:
+                art["content"], art["content_error"] = None, f"URL 요청 오류: {e}"
+                stats["failed"] += 1
+    except TimeoutError:
+        for art in futures.values():
+            art["content"], art["content_error"] = None, "timeout"
+            stats["timed_out"] += 1
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return _finish(stats, started)
+
+
+# ===============================
+# ⚡ asyncio 버전 (api/index7.py ASGI 앱용)
+# ===============================
+async def _fetch_body_async(url, timeout):
+    resp = await fetch_async(url, timeout=timeout, retries=1)
+    _, content_text, extraction = await run_parse(extract_article_bytes, resp.content, url,
+                                                  resp.headers.get("Content-Type"))
+    return content_text, extraction
+
+
+async def enrich_with_body_async(articles, url_key="url", concurrency=DEFAULT_CONCURRENCY,
+                                 timeout=ARTICLE_TIMEOUT, deadline=STAGE_DEADLINE):
+    """enrich_with_body와 같은 결과/통계. 요청은 이벤트 루프에서, 본문 추출은 파싱 스레드풀에서."""
+    concurrency = max(1, min(int(concurrency), MAX_CONCURRENCY))
+    started = time.perf_counter()
+    stats = {"requested": 0, "ok": 0, "failed": 0, "timed_out": 0, "concurrency": concurrency}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(art):
+        async with semaphore:
+            try:
+                art["content"], art["extraction"] = await _fetch_body_async(art[url_key], timeout)
+                stats["ok"] += 1
+            except ArticleParseError as e:
+                art["content"], art["content_error"] = None, str(e)
+                stats["failed"] += 1
+            except Exception as e:
+                art["content"], art["content_error"] = None, f"URL 요청 오류: {e}"
+                stats["failed"] += 1
+
+    # 저장본 확인(SQLite)은 이벤트 루프를 막지 않도록 스레드풀에서
+    targets = await run_parse(_reuse_stored, articles, url_key, stats)
+    tasks = {asyncio.ensure_future(one(art)): art for art in targets}
+    stats["requested"] = len(tasks)
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+            art = tasks[task]
+            art["content"], art["content_error"] = None, "timeout"
+            stats["timed_out"] += 1
+
+    return _finish(stats, started)
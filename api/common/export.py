@@ -0,0 +1,102 @@
+# api/common/export.py
+# 기사 목록 → XLSX 내보내기 (?format=xlsx, 운영 스크립트 EXPORT_FORMAT=xlsx)
+#
+# CSV에 =HYPERLINK(...) 수식을 넣던 방식 대신 진짜 하이퍼링크 셀(write_url)을 쓴다 → 엑셀에서 수식 계산이 필요 없음.
+# xlsxwriter constant_memory 모드: 행을 쓰는 즉시 임시 파일로 내보내므로 여러 날치를 내보내도
+# 메모리에는 현재 행 하나만 남는다 (rows는 리스트가 아니라 제너레이터여도 됨).
+# 완성된 파일도 /tmp에 두고 조각씩 읽어 응답으로 흘려보낸 뒤 지운다.
+import os
+import tempfile
+from datetime import datetime
+
+import xlsxwriter
+from flask import Response
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+EXPORT_FORMAT = os.environ.get("EXPORT_FORMAT", "csv")  # 운영 스크립트 저장 형식: csv | xlsx
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MAX_ROWS = 1048575          # 엑셀 시트 최대 행 수 (머리글 제외)
+MAX_URL_LENGTH = 2079       # 엑셀 하이퍼링크 URL 길이 제한
+CHUNK_SIZE = 64 * 1024
+COLUMN_WIDTHS = {"URL": 50, "Title": 60, "Body": 80, "Hyperlink": 60}
+
+
+def wants_xlsx(args):
+    return args.get("format", "").lower() == "xlsx"
+
+
+def write_xlsx(target, rows, columns, link=None, sheet_name="articles"):
+    """
+    rows(dict 이터러블) → XLSX 파일(target: 경로). 쓴 행 수를 돌려준다.
+    columns: [(머리글, 키), ...]
+    link: (URL 키, 표시 문자열 키) → 마지막에 "Hyperlink" 열을 하이퍼링크 셀로 추가
+    """
+    workbook = xlsxwriter.Workbook(target, {"constant_memory": True, "strings_to_urls": False,
+                                            "strings_to_formulas": False})
+    try:
+        sheet = workbook.add_worksheet(sheet_name)
+        bold = workbook.add_format({"bold": True})
+        link_format = workbook.get_default_url_format()
+        headers = [h for h, _ in columns] + (["Hyperlink"] if link else [])
+        for col, header in enumerate(headers):
+            sheet.set_column(col, col, COLUMN_WIDTHS.get(header, 20))
+            sheet.write_string(0, col, header, bold)
+        sheet.freeze_panes(1, 0)
+
+        count = 0
+        for count, row in enumerate(rows, 1):
+            if count > MAX_ROWS:
+                print(f"⚠️ XLSX 최대 행 수 초과 → {MAX_ROWS}행까지만 저장")
+                count = MAX_ROWS
+                break
+            for col, (_, key) in enumerate(columns):
+                value = row.get(key)
+                if isinstance(value, (list, tuple)):
+                    value = ", ".join(map(str, value))
+                if value is not None:
+                    sheet.write(count, col, value)
+            if link:
+                _write_link(sheet, count, len(columns), row.get(link[0]), row.get(link[1]), link_format)
+    finally:
+        workbook.close()
+    return count
+
+
+def _write_link(sheet, row, col, url, text, link_format):
+    if not url:
+        return
+    text = text or url
+    # 길이 제한 등으로 하이퍼링크가 안 되면 제목만 문자열로
+    if len(url) > MAX_URL_LENGTH or sheet.write_url(row, col, url, link_format, string=text) != 0:
+        sheet.write_string(row, col, text)
+
+
+def _stream_file(path):
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+    finally:
+        os.remove(path)
+
+
+def xlsx_response(rows, columns, link=None, name="news"):
+    """rows → XLSX 첨부 파일 응답 (임시 파일에 쓰고 조각씩 흘려보낸 뒤 삭제)"""
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        count = write_xlsx(path, rows, columns, link)
+    except Exception:
+        os.remove(path)
+        raise
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
+    print(f"📊 XLSX 내보내기: {count}행 → {filename}")
+    return Response(_stream_file(path), mimetype=XLSX_MIMETYPE, direct_passthrough=True, headers={
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Content-Length": str(os.path.getsize(path)),
+    })
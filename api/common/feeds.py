@@ -0,0 +1,555 @@
+# api/common/feeds.py
+# 피드 우선 목록 수집 — 사이트에 RSS/Atom 피드가 있으면 목록 HTML 여러 페이지 대신 피드 한 번으로 기사 목록을 만든다
+#
+# - 피드 주소: FEED_URLS(환경변수 FEED_URLS_JSON='{"thebell": "https://..."}')에 있으면 그것을 쓰고,
+#   카테고리별 피드면 주소에 {category}를 넣거나 "investchosun:3" 처럼 카테고리까지 붙인 키로 따로 준다.
+#   없으면 자동 탐색 (FEED_DISCOVERY=0 이면 끔): 출처의 첫 목록 페이지(DISCOVERY_PAGES — HTML 크롤러가 처음 받는 주소)에서
+#   1) <link rel="alternate" type="application/rss+xml|atom+xml"> → 그 피드 (카테고리 페이지면 카테고리 피드)
+#   2) 카테고리 없는 출처이고 요약이 필요 없는 목록이면 robots.txt의 Sitemap: 줄(없으면 /sitemap.xml) → 사이트맵
+#      (색인이면 news 들어간 하위 사이트맵)
+#   찾은 주소(또는 "없음")는 (출처, 카테고리)별로 DISCOVERY_TTL_S 동안 기억한다.
+# - 필드: discover(fields=)에 목록 레코드가 쓰는 항목 필드를 준다 (기본 LISTING_FIELDS — 제목/링크/요약/시각).
+#   피드 항목 하나라도 그 필드가 없으면(RSS에 <description> 없음 등) 그 피드는 쓰지 않고 HTML 목록 — 피드든 HTML이든
+#   레코드가 같아야 하므로. 사이트맵은 요약이 없어(SITEMAP_FIELDS) 요약이 필요한 목록에서는 탐색하지도 않는다.
+# - 사이트맵: <url>의 <news:title>/<news:publication_date>(없으면 <lastmod>)를 피드 항목으로 — 제목 없는 항목은 뺀다.
+# - 스트리밍: fetch(stream=True) 본문을 lxml iterparse로 읽으면서 <item>/<entry>가 닫히는 대로 꺼내고 바로 clear.
+#   목록 HTML(메뉴/스크립트가 대부분)을 페이지마다 파싱하는 것보다 받는 바이트도 CPU도 훨씬 적다 (bench/bench_discovery.py).
+# - 폴백: 피드가 없거나(미설정/요청 실패/XML 아님/항목 0) 오래됐거나(최신 항목이 FEED_MAX_AGE_HOURS보다 오래)
+#   수집 구간을 다 덮지 못하면(가장 오래된 항목도 구간 안 → 피드가 잘림) 기존 HTML 크롤러로 돌아간다.
+#   요청 실패/XML 아님만 "실패"로 기억해 FEED_RETRY_S 동안 다시 시도하지 않는다 (HTML로 바로).
+#   비었음/오래됨/잘림(FeedOutOfWindow)은 피드는 정상이고 이번 구간만 못 덮은 것 → 이번 크롤링만 HTML, 다음엔 다시 피드.
+# - 피드 항목 → 레코드 변환(to_record)은 각 엔드포인트가 HTML 파서와 같은 필드/형식으로 한다 → 어느 쪽이든 같은 결과.
+# - 요청별 기록: 응답의 "discovery" = {"mode", "crawls": [{"category", "source": "feed"|"html", "reason",
+#   "items", "bytes", "cpu_ms", "via": "config"|"discovered"}]} (bytes는 피드만 — HTML 쪽 바이트는 벤치마크에서 스텁 통계로 비교).
+import contextvars
+import io
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple
+from urllib.parse import urljoin
+
+from lxml import etree, html as lxml_html
+from pytz import timezone
+
+from .http import fetch
+
+KST = timezone('Asia/Seoul')
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+FEED_URLS = {}   # 직접 지정한 피드 주소 (자동 탐색보다 우선)
+FEED_URLS.update(json.loads(os.environ.get("FEED_URLS_JSON") or "{}"))
+# 자동 탐색을 시작할 페이지 — 각 크롤러가 처음 받는 목록 1페이지와 같은 주소 ({category}가 있으면 카테고리별)
+DISCOVERY_PAGES = {
+    "thebell": "https://www.thebell.co.kr/free/content/article.asp?page=1&svccode=00",
+    "investchosun": "https://www.investchosun.com/svc/news/list.html?catid={category}&pn=1",
+    "thesignal": "https://signalm.sedaily.com/Main/Content/SubMain?NClass={category}&Page=1&Kind=Time",
+}
+DISCOVERY_PAGES.update(json.loads(os.environ.get("FEED_DISCOVERY_PAGES_JSON") or "{}"))
+FEED_DISCOVERY = os.environ.get("FEED_DISCOVERY", "1") not in ("0", "false")
+DISCOVERY_TTL_S = float(os.environ.get("FEED_DISCOVERY_TTL_S", "21600"))
+LISTING_FIELDS = ("title", "link", "summary", "published")   # 목록 레코드가 쓰는 피드 항목 필드 (기본)
+SITEMAP_FIELDS = ("title", "link", "published")             # 사이트맵이 줄 수 있는 필드 (요약 없음)
+MAX_SITEMAPS = 3       # robots.txt에 사이트맵이 여러 개면 앞에서 이만큼만 본다
+SITEMAP_DEPTH = 2      # 사이트맵 색인 → 하위 사이트맵 한 단계까지
+FEED_MAX_AGE_HOURS = float(os.environ.get("FEED_MAX_AGE_HOURS", "12"))
+FEED_RETRY_S = float(os.environ.get("FEED_RETRY_S", "600"))
+MODES = ("auto", "html")
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+_SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+_NEWS = "{http://www.google.com/schemas/sitemap-news/0.9}"
+_ITEM_TAGS = ("item", _ATOM + "entry", _SITEMAP + "url")
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+
+
+class FeedItem(NamedTuple):
+    title: str
+    link: str
+    summary: str | None   # 피드에 요약 요소가 없으면 None (빈 요약은 "")
+    published: datetime   # KST aware
+
+
+class FeedUnavailable(Exception):
+    """피드를 쓸 수 없음 — 메시지가 discovery reason이 된다"""
+
+
+class FeedIncomplete(FeedUnavailable):
+    """피드 항목에 목록 레코드가 쓰는 필드가 없음 (예: 요약) — 출처 자체를 쓰지 않는다"""
+
+
+class FeedOutOfWindow(FeedUnavailable):
+    """피드는 정상이지만 이번 수집 구간을 못 덮음 (비었음/오래됨/잘림) — 실패로 기억하지 않는다"""
+
+
+# ===============================
+# 📊 요청별 기록 (응답 메타데이터)
+# ===============================
+class DiscoveryStats:
+    def __init__(self, mode="auto"):
+        self.mode = mode
+        self.token = None  # start_discovery가 건 contextvars 토큰 (end_discovery가 되돌림)
+        self._lock = threading.Lock()
+        self._crawls = []
+
+    def add(self, **crawl):
+        with self._lock:
+            self._crawls.append(crawl)
+
+    def as_dict(self):
+        with self._lock:
+            return {"mode": self.mode, "crawls": list(self._crawls)}
+
+
+_current = contextvars.ContextVar("discovery_stats", default=None)
+
+
+def discovery_mode(args):
+    """?discovery=auto|html (기본 auto) — 잘못된 값이면 ValueError"""
+    mode = args.get("discovery") or "auto"
+    if mode not in MODES:
+        raise ValueError(f"discovery는 {', '.join(MODES)} 중 하나여야 합니다.")
+    return mode
+
+
+def start_discovery(mode="auto"):
+    """현재 요청(컨텍스트)의 목록 수집 기록 시작 (fetch_policy.start_fetch_stats와 같은 방식, 끝나면 end_discovery)"""
+    stats = DiscoveryStats(mode)
+    stats.token = _current.set(stats)
+    return stats
+
+
+def end_discovery(exc=None):
+    """요청 끝: start_discovery 이전 상태로 되돌린다 (fetch_policy.end_fetch_stats와 같은 방식)"""
+    stats = _current.get()
+    if stats is None:
+        return
+    try:
+        _current.reset(stats.token)
+    except (ValueError, RuntimeError):
+        _current.set(None)
+
+
+def _record(**crawl):
+    stats = _current.get()
+    if stats is not None:
+        stats.add(**crawl)
+
+
+def _mode():
+    stats = _current.get()
+    return stats.mode if stats is not None else "auto"
+
+
+# ===============================
+# 📡 피드 파싱 (RSS 2.0 / Atom / 사이트맵, 스트리밍 iterparse)
+# ===============================
+def feed_url(source, category=None):
+    """FEED_URLS에 직접 지정한 소스(+카테고리)의 피드 주소, 없으면 None"""
+    url = FEED_URLS.get(f"{source}:{category}") if category is not None else None
+    url = url or FEED_URLS.get(source)
+    return url.format(category=category) if url else None
+
+
+class _CountingReader:
+    """iterparse에 넘기는 본문 — 읽은 바이트 수를 센다"""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes = 0
+
+    def read(self, n=-1):
+        data = self._raw.read(n)
+        self.bytes += len(data)
+        return data
+
+
+def _text(value):
+    """설명/요약에 HTML(태그/엔티티)이 들어 있으면 글자만 (HTML 목록에서 get_text 한 것과 같게)"""
+    value = (value or "").strip()
+    if "<" in value or "&" in value:
+        value = lxml_html.fragment_fromstring(value, create_parent="div").text_content().strip()
+    return value
+
+
+def _parse_date(value):
+    """RFC 822(RSS) 또는 ISO 8601(Atom/dc:date) → KST aware datetime, 해석 못 하면 None"""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        return KST.localize(parsed)
+    return parsed.astimezone(KST)
+
+
+def _atom_link(entry):
+    for link in entry.iter(_ATOM + "link"):
+        if link.get("rel", "alternate") == "alternate":
+            return link.get("href", "")
+    return ""
+
+
+def _feed_item(el):
+    """<item>/<entry>/사이트맵 <url> → FeedItem, 날짜(사이트맵은 제목도)가 없으면 None"""
+    if el.tag == _SITEMAP + "url":
+        title = el.findtext(f"{_NEWS}news/{_NEWS}title")
+        if not (title or "").strip():
+            return None
+        published = _parse_date(el.findtext(f"{_NEWS}news/{_NEWS}publication_date") or el.findtext(_SITEMAP + "lastmod"))
+        link, summary = el.findtext(_SITEMAP + "loc"), None
+    elif el.tag == "item":
+        title, link = el.findtext("title"), el.findtext("link")
+        summary = el.findtext("description")
+        published = _parse_date(el.findtext("pubDate") or el.findtext(_DC_DATE))
+    else:
+        title, link = el.findtext(_ATOM + "title"), _atom_link(el)
+        summary = el.findtext(_ATOM + "summary")
+        summary = summary if summary is not None else el.findtext(_ATOM + "content")
+        published = _parse_date(el.findtext(_ATOM + "published") or el.findtext(_ATOM + "updated"))
+    if published is None:
+        return None
+    return FeedItem(_text(title), (link or "").strip(), _text(summary) if summary is not None else None, published)
+
+
+def iter_feed(source):
+    """파일 같은 본문(read(n)) → FeedItem을 하나씩. XML이 아니면 etree.XMLSyntaxError"""
+    for _, el in etree.iterparse(source, events=("end",), tag=_ITEM_TAGS, recover=False):
+        item = _feed_item(el)
+        el.clear()
+        while el.getprevious() is not None:  # 이미 읽은 형제 노드도 버려 메모리를 일정하게
+            del el.getparent()[0]
+        if item is not None:
+            yield item
+
+
+def _check_fields(items, fields):
+    """모든 항목에 fields가 있는지 — 하나라도 없으면 FeedUnavailable (HTML 목록과 레코드가 달라지므로)"""
+    for name in fields:
+        if any(getattr(item, name) is None for item in items):
+            raise FeedIncomplete(f"missing {name}")
+
+
+def _check_window(items, since, now=None):
+    """피드 항목이 since 이후 구간을 다 덮는지 — 못 쓰면 FeedUnavailable"""
+    if not items:
+        raise FeedOutOfWindow("empty")
+    now = now or datetime.now(KST)
+    newest = max(i.published for i in items)
+    if now - newest > timedelta(hours=FEED_MAX_AGE_HOURS):
+        raise FeedOutOfWindow("stale")
+    if min(i.published for i in items) >= since:
+        raise FeedOutOfWindow("truncated")
+
+
+_failed_lock = threading.Lock()
+_failed = {}
+
+
+def _recently_failed(url):
+    with _failed_lock:
+        failed_at = _failed.get(url)
+        return failed_at is not None and time.monotonic() - failed_at < FEED_RETRY_S
+
+
+def _mark_failed(url):
+    with _failed_lock:
+        _failed[url] = time.monotonic()
+
+
+def read_feed(url, since, headers=None, timeout=10, fields=LISTING_FIELDS):
+    """피드를 스트리밍으로 받아 → (FeedItem 목록, 받은 바이트). 쓸 수 없으면 FeedUnavailable"""
+    try:
+        resp = fetch(url, headers=headers, timeout=timeout, stream=True)
+    except Exception as e:
+        raise FeedUnavailable(f"fetch failed: {e}") from e
+    reader = _CountingReader(resp.raw)
+    try:
+        resp.raw.decode_content = True  # gzip 응답도 그대로 파서에 흘려보냄
+        items = list(iter_feed(reader))
+    except etree.XMLSyntaxError as e:
+        raise FeedUnavailable("not a feed") from e
+    finally:
+        resp.close()
+    _check_fields(items, fields)   # 출처 자체의 성질 → 구간 검사보다 먼저 (실패로 기억)
+    _check_window(items, since)
+    return items, reader.bytes
+
+
+def parse_feed_bytes(content, since, fields=LISTING_FIELDS):
+    """비동기 경로용: 이미 받은 본문 → FeedItem 목록 (read_feed와 같은 검사)"""
+    try:
+        items = list(iter_feed(io.BytesIO(content)))
+    except etree.XMLSyntaxError as e:
+        raise FeedUnavailable("not a feed") from e
+    _check_fields(items, fields)   # 출처 자체의 성질 → 구간 검사보다 먼저 (실패로 기억)
+    _check_window(items, since)
+    return items
+
+
+# ===============================
+# 🔎 피드 자동 탐색 (<link rel="alternate"> → robots.txt/sitemap.xml)
+# ===============================
+def feed_links(content, base_url):
+    """HTML → <link rel="alternate" type="application/rss+xml|atom+xml">의 절대 주소 목록"""
+    try:
+        doc = lxml_html.fromstring(content)
+    except (etree.ParserError, ValueError):
+        return []
+    links = []
+    for link in doc.iter("link"):
+        rel = (link.get("rel") or "").lower().split()
+        ctype = (link.get("type") or "").split(";")[0].strip().lower()
+        href = (link.get("href") or "").strip()
+        if "alternate" in rel and ctype in FEED_TYPES and href:
+            links.append(urljoin(base_url, href))
+    return links
+
+
+def robots_sitemaps(text):
+    """robots.txt → Sitemap: 주소 목록"""
+    return [line.split(":", 1)[1].strip() for line in text.splitlines()
+            if line.strip().lower().startswith("sitemap:") and line.split(":", 1)[1].strip()]
+
+
+def sitemap_children(content):
+    """
+    사이트맵 본문 → 색인이면 하위 사이트맵 주소(news 들어간 것 먼저, 그다음 lastmod 최신순),
+    <urlset>이면 [], 사이트맵이 아니면 None
+    """
+    try:
+        root = etree.fromstring(content, etree.XMLParser(resolve_entities=False, no_network=True))
+    except etree.XMLSyntaxError:
+        return None
+    if root.tag == _SITEMAP + "urlset":
+        return []
+    if root.tag != _SITEMAP + "sitemapindex":
+        return None
+    children = [(el.findtext(_SITEMAP + "loc") or "").strip() for el in root.iter(_SITEMAP + "sitemap")]
+    lastmod = {loc: _parse_date(el.findtext(_SITEMAP + "lastmod"))
+               for loc, el in zip(children, root.iter(_SITEMAP + "sitemap"))}
+    children = [loc for loc in children if loc]
+    children.sort(key=lambda loc: lastmod[loc].timestamp() if lastmod[loc] else 0, reverse=True)
+    children.sort(key=lambda loc: "news" not in loc.lower())   # 안정 정렬 → news 먼저, 각각 최신순
+    return children
+
+
+def _discovery_steps(page_url, site_wide, fields):
+    """
+    피드 주소 찾기 순서 — 받을 주소를 yield 하고 본문 bytes(실패면 None)를 돌려받는 제너레이터
+    (동기/비동기 탐색이 같은 순서를 쓰도록). 끝나면 피드/사이트맵 주소 또는 None을 돌려준다.
+    """
+    content = yield page_url
+    links = feed_links(content, page_url) if content else []
+    if links:
+        return links[0]
+    if not site_wide:
+        return None   # 카테고리 페이지 — 사이트 전체 사이트맵은 카테고리와 맞지 않음
+    if not set(fields) <= set(SITEMAP_FIELDS):
+        return None   # 사이트맵으로는 목록 레코드를 다 채울 수 없음 (요약 없음) → 받아 보지도 않는다
+    robots = yield urljoin(page_url, "/robots.txt")
+    candidates = robots_sitemaps(robots.decode("utf-8", "replace")) if robots else []
+    for url in (candidates or [urljoin(page_url, "/sitemap.xml")])[:MAX_SITEMAPS]:
+        for _ in range(SITEMAP_DEPTH):
+            content = yield url
+            children = sitemap_children(content) if content else None
+            if children is None:
+                break
+            if not children:
+                return url
+            url = children[0]
+    return None
+
+
+_discovered_lock = threading.Lock()
+_discovered = {}   # (source, category) → (피드 주소 또는 None, 찾은 시각)
+
+
+def _discovery_page(source, category):
+    """→ (탐색 시작 페이지, 사이트 전체 출처인지), 탐색할 수 없으면 (None, False)"""
+    page = DISCOVERY_PAGES.get(source)
+    if not FEED_DISCOVERY or not page:
+        return None, False
+    if "{category}" in page:
+        return (page.format(category=category), False) if category is not None else (None, False)
+    return page, True
+
+
+def _cached_discovery(key):
+    with _discovered_lock:
+        hit = _discovered.get(key)
+    if hit is not None and time.monotonic() - hit[1] < DISCOVERY_TTL_S:
+        return True, hit[0]
+    return False, None
+
+
+def _remember_discovery(key, url, source):
+    with _discovered_lock:
+        _discovered[key] = (url, time.monotonic())
+    print(f"🔎 {source} 피드 자동 탐색: {url or '없음'}")
+
+
+def resolve_feed(source, category=None, headers=None, fields=LISTING_FIELDS):
+    """→ (피드 주소 또는 None, "config"|"discovered") — FEED_URLS 우선, 없으면 자동 탐색(기억해 둔 결과)"""
+    url = feed_url(source, category)
+    if url:
+        return url, "config"
+    page, site_wide = _discovery_page(source, category)
+    if page is None:
+        return None, None
+    key = (source, category)
+    hit, url = _cached_discovery(key)
+    if hit:
+        return url, "discovered"
+
+    def get(target):
+        try:
+            return fetch(target, headers=headers, timeout=10).content
+        except Exception:
+            return None
+
+    steps = _discovery_steps(page, site_wide, fields)
+    try:
+        target = next(steps)
+        while True:
+            target = steps.send(get(target))
+    except StopIteration as done:
+        url = done.value
+    _remember_discovery(key, url, source)
+    return url, "discovered"
+
+
+async def resolve_feed_async(source, category=None, headers=None, fields=LISTING_FIELDS):
+    """resolve_feed의 비동기 버전"""
+    from .aio_http import fetch_async
+
+    url = feed_url(source, category)
+    if url:
+        return url, "config"
+    page, site_wide = _discovery_page(source, category)
+    if page is None:
+        return None, None
+    key = (source, category)
+    hit, url = _cached_discovery(key)
+    if hit:
+        return url, "discovered"
+
+    async def get(target):
+        try:
+            return (await fetch_async(target, headers=headers, timeout=10)).content
+        except Exception:
+            return None
+
+    steps = _discovery_steps(page, site_wide, fields)
+    try:
+        target = next(steps)
+        while True:
+            target = steps.send(await get(target))
+    except StopIteration as done:
+        url = done.value
+    _remember_discovery(key, url, source)
+    return url, "discovered"
+
+
+# ===============================
+# 🚀 피드 우선 수집 (없으면 HTML)
+# ===============================
+def _unusable(source, category, url, via, error):
+    """
+    피드를 못 쓴 이유별 처리: 구간 밖이면 이번 크롤링만 HTML, 그 밖엔 FEED_RETRY_S 동안 실패로 기억.
+    자동 탐색한 피드가 필드를 못 채우면 탐색 결과를 "없음"으로 바꿔 DISCOVERY_TTL_S 동안 다시 받지 않는다.
+    """
+    if isinstance(error, FeedOutOfWindow):
+        return
+    _mark_failed(url)
+    if via == "discovered" and isinstance(error, FeedIncomplete):
+        _remember_discovery((source, category), None, source)
+
+
+def _feed_records(items, to_record):
+    records = []
+    for item in items:
+        record = to_record(item)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def discover(source, since, to_record, crawl_html, category=None, headers=None, fields=LISTING_FIELDS):
+    """
+    피드가 있고 쓸 만하면 피드 항목을 to_record(item)(None이면 구간 밖 → 뺌)로 바꾼 목록,
+    아니면 crawl_html() 결과를 그대로 돌려준다. since: 수집 구간 시작(KST aware) — 피드가 여기까지 덮어야 한다.
+    fields: to_record가 쓰는 항목 필드 — 피드가 하나라도 못 채우면 HTML (어느 쪽이든 같은 레코드).
+    """
+    started = time.thread_time()
+    url, via = resolve_feed(source, category, headers, fields) if _mode() != "html" else (None, None)
+    if _mode() == "html":
+        reason = "disabled"
+    elif not url:
+        reason = "no feed"
+    elif _recently_failed(url):
+        reason = "recently failed"
+    else:
+        try:
+            items, nbytes = read_feed(url, since, headers, fields=fields)
+        except FeedUnavailable as e:
+            reason = str(e)
+            _unusable(source, category, url, via, e)
+        else:
+            records = _feed_records(items, to_record)
+            _record(category=category, source="feed", reason=None, items=len(records), bytes=nbytes,
+                    cpu_ms=round((time.thread_time() - started) * 1000, 1), via=via)
+            return records
+    if url and reason not in ("disabled", "recently failed", "no feed"):
+        print(f"⚠️ {source} 피드 사용 불가({reason}) → HTML 목록으로")
+    records = crawl_html()
+    _record(category=category, source="html", reason=reason, items=len(records), bytes=None,
+            cpu_ms=round((time.thread_time() - started) * 1000, 1))
+    return records
+
+
+async def discover_async(source, since, to_record, crawl_html, category=None, headers=None, fields=LISTING_FIELDS):
+    """discover의 비동기 버전 — crawl_html은 코루틴 함수. cpu_ms는 피드 파싱만 잰다 (HTML 파싱은 여러 스레드에 흩어짐)"""
+    from .aio_http import fetch_async, run_parse
+
+    url, via = await resolve_feed_async(source, category, headers, fields) if _mode() != "html" else (None, None)
+    if _mode() == "html":
+        reason = "disabled"
+    elif not url:
+        reason = "no feed"
+    elif _recently_failed(url):
+        reason = "recently failed"
+    else:
+        try:
+            resp = await fetch_async(url, headers=headers, timeout=10)
+            records, cpu_ms = await run_parse(_timed_parse, resp.content, since, to_record, fields)
+        except Exception as e:
+            reason = str(e) if isinstance(e, FeedUnavailable) else f"fetch failed: {e}"
+            _unusable(source, category, url, via, e)
+        else:
+            _record(category=category, source="feed", reason=None, items=len(records), bytes=len(resp.content),
+                    cpu_ms=cpu_ms, via=via)
+            return records
+    if url and reason not in ("disabled", "recently failed", "no feed"):
+        print(f"⚠️ {source} 피드 사용 불가({reason}) → HTML 목록으로")
+    records = await crawl_html()
+    _record(category=category, source="html", reason=reason, items=len(records), bytes=None, cpu_ms=None)
+    return records
+
+
+def _timed_parse(content, since, to_record, fields):
+    started = time.thread_time()
+    records = _feed_records(parse_feed_bytes(content, since, fields), to_record)
+    return records, round((time.thread_time() - started) * 1000, 1)
@@ -0,0 +1,181 @@
+# api/common/fetch_policy.py
+# 요청 실패/지연 꼬리(tail latency) 대응 정책: 재시도, 헤지 요청, 호스트별 서킷 브레이커, 요청별 통계
+#
+# - 재시도: 연결 오류/타임아웃/5xx/429는 지수 백오프 + 지터로 다시 시도
+# - 헤지: 첫 요청이 그 호스트의 p95 지연을 넘기면 같은 요청을 하나 더 보내고, 먼저 온 응답을 쓴다
+# - 서킷 브레이커: 한 호스트가 연속으로 실패하면 잠시 요청을 끊어 전체 크롤링이 타임아웃에 묶이지 않게 한다
+# - FetchStats: 엔드포인트 한 번 처리 중 발생한 요청/재시도/헤지 수를 모아 응답 메타데이터로 내보낸다
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+MAX_RETRIES = 2              # 첫 요청 외 추가 시도 횟수
+BACKOFF_BASE = 0.5           # 초, 시도마다 2배
+BACKOFF_MAX = 8.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+HEDGE_MIN_DELAY = 0.3        # 지연 기록이 부족하거나 p95가 너무 짧을 때 쓰는 최소 헤지 지연(초)
+HEDGE_MIN_SAMPLES = 20       # p95를 믿기 위한 최소 표본 수
+LATENCY_WINDOW = 200         # 호스트별로 기억하는 최근 지연 표본 수
+
+BREAKER_FAILURES = 5         # 연속 실패가 이만큼이면 회로 열림
+BREAKER_COOLDOWN = 30.0      # 열린 뒤 이 시간(초)이 지나면 요청 하나만 시험적으로 통과(half-open)
+
+MAX_FAILED_PAGES_IN_ROW = 3  # 목록 크롤러: 실패한 페이지는 건너뛰되 이만큼 연속 실패하면 중단
+
+
+class CircuitOpenError(Exception):
+    """호스트 회로가 열려 있어 요청을 보내지 않음"""
+
+
+def backoff_delay(attempt):
+    """full jitter 지수 백오프: 0 ~ min(max, base * 2^attempt)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+# ===============================
+# ⏱️ 호스트별 지연 기록 (헤지 지연 계산용)
+# ===============================
+class LatencyTracker:
+    def __init__(self):
+        self._samples = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self):
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def hedge_delay(self):
+        p95 = self.p95()
+        return max(HEDGE_MIN_DELAY, p95) if p95 is not None else None
+
+
+# ===============================
+# 🔌 서킷 브레이커
+# ===============================
+class CircuitBreaker:
+    def __init__(self, host):
+        self.host = host
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < BREAKER_COOLDOWN or self._trial_in_flight:
+                raise CircuitOpenError(f"{self.host} 회로 열림 (연속 실패 {self._failures}회)")
+            self._trial_in_flight = True  # half-open: 한 건만 시험
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """시험 요청이 성공/실패 없이 끝남(취소 등) — 다음 요청이 다시 시험하도록 플래그만 푼다"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= BREAKER_FAILURES:
+                if self._opened_at is None:
+                    print(f"⚠️ {self.host} 회로 열림 ({BREAKER_COOLDOWN:.0f}초)")
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None
+
+
+_hosts_lock = threading.Lock()
+_trackers = {}
+_breakers = {}
+
+
+def tracker_for(host):
+    with _hosts_lock:
+        return _trackers.setdefault(host, LatencyTracker())
+
+
+def breaker_for(host):
+    with _hosts_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+# ===============================
+# 📊 요청별 통계 (응답 메타데이터)
+# ===============================
+class FetchStats:
+    FIELDS = ("requests", "retries", "hedges", "hedge_wins", "failures", "circuit_open", "failed_pages")
+
+    def __init__(self, hedge=False):
+        self.hedge = hedge
+        self.token = None  # start_fetch_stats가 건 contextvars 토큰 (end_fetch_stats가 되돌림)
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def add(self, field, n=1):
+        with self._lock:
+            self._counts[field] += n
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+_current_stats = contextvars.ContextVar("fetch_stats", default=None)
+
+
+def start_fetch_stats(hedge=False):
+    """
+    현재 요청(컨텍스트)의 통계 수집을 시작한다. hedge=True면 이 요청 안의 fetch는 헤지 요청을 쓴다.
+    스레드풀로 작업을 넘길 때는 contextvars.copy_context().run으로 감싸야 통계가 이어진다.
+    요청이 끝나면 end_fetch_stats()로 떼어야 한다 (워커 스레드가 재사용되면 다음 요청이 이 통계/헤지를 이어받음).
+    """
+    stats = FetchStats(hedge)
+    stats.token = _current_stats.set(stats)
+    return stats
+
+
+def end_fetch_stats(exc=None):
+    """요청 끝: start_fetch_stats 이전 상태로 되돌린다 (Flask teardown_request / ASGI 핸들러 finally에서)"""
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    try:
+        _current_stats.reset(stats.token)
+    except (ValueError, RuntimeError):  # 다른 컨텍스트에서 시작했거나 이미 되돌린 토큰
+        _current_stats.set(None)
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+def note(field, n=1):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.add(field, n)
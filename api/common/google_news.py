@@ -0,0 +1,228 @@
+# api/common/google_news.py
+# 구글 뉴스 검색 → 제목에 키워드가 들어간 첫 기사 {'title', 'link'} 반환
+#
+# 두 가지 백엔드:
+#   - "html": news.google.com/search 결과 페이지를 스트리밍으로 받아 <a>가 닫히는 대로 훑는 기존 방식
+#             (common/stream_parse — 첫 일치에서 멈추면 페이지 나머지는 받지 않음)
+#   - "rss" : news.google.com/rss/search 피드를 스트리밍으로 받아 lxml iterparse로 <item>을 하나씩 읽고,
+#             키워드가 맞는 첫 기사에서 바로 읽기를 멈춘다 (받는 바이트/CPU 모두 훨씬 적음)
+# 기본은 "rss" — 요청이 실패하거나 응답이 XML이 아니면 같은 검색을 "html"로 한 번 더 한다 (FALLBACK_BACKENDS).
+# 결과가 없는 것은 실패가 아니다 (최근 1일 기사가 없는 회사) → 폴백하지 않음.
+# (예전엔 "html"이 기본이었다: 원본 보관이 스트리밍 본문을 끝까지 받아 첫 매치에서 멈춰도 이득이 없었기 때문 —
+#  이제 raw_archive는 조기 종료 시 읽은 만큼만 보관하므로 RSS의 조기 중단이 그대로 살아난다.)
+import os
+import urllib.parse
+
+from lxml import etree
+
+from .company_index import normalize_for_match
+from .http import fetch
+from .stream_parse import element_text, iter_elements
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+GOOGLE_NEWS_BACKEND = os.environ.get("GOOGLE_NEWS_BACKEND", "rss")  # "rss" | "html"
+GOOGLE_BATCH_SIZE = int(os.environ.get("GOOGLE_BATCH_SIZE", "5"))    # 묶음 검색 기본 크기 (1이면 회사별 단건 검색)
+FALLBACK_BACKENDS = {"rss": "html"}  # 이 백엔드가 실패하면 다음 백엔드로 (GOOGLE_NEWS_FALLBACK=0 이면 끔)
+if os.environ.get("GOOGLE_NEWS_FALLBACK", "1") in ("0", "false"):
+    FALLBACK_BACKENDS = {}
+HTML_SEARCH_URL = 'https://news.google.com/search'
+RSS_SEARCH_URL = 'https://news.google.com/rss/search'
+EMPTY_RESULT = {'title': None, 'link': None}
+
+
+def _contains_keyword(title_text, keywords):
+    # keywords: common.keywords.KeywordMatcher 또는 단순 리스트
+    if hasattr(keywords, 'contains_any'):
+        return keywords.contains_any(title_text)
+    return any(keyword in title_text for keyword in keywords)
+
+
+# ===============================
+# 📰 HTML 결과 페이지 (기존 방식)
+# ===============================
+def _clean_google_link(raw_link):
+    if raw_link.startswith('./'):
+        return 'https://news.google.com' + raw_link[1:]
+    if raw_link.startswith('/'):
+        return 'https://news.google.com' + raw_link
+    if '/url?q=' in raw_link:
+        return urllib.parse.unquote(raw_link.split('/url?q=')[1].split('&')[0])
+    return raw_link
+
+
+def iter_html_items(query, headers, timeout):
+    """결과 페이지의 모든 <a>를 (title, link)로 흘려보낸다."""
+    params = {
+        'q': query,
+        'tbs': 'qdr:d',  # 최근 1일
+        'hl': 'ko',
+        'gl': 'kr',
+        'num': 10
+    }
+    search_url = HTML_SEARCH_URL + '?' + urllib.parse.urlencode(params)
+
+    # 받는 동안 <a>가 닫히는 대로 넘긴다 → _first_match가 멈추면 나머지 결과 페이지는 받지 않음
+    response = fetch(search_url, headers=headers, timeout=timeout, stream=True)
+    for a in iter_elements(response, lambda el: el.tag == 'a' and el.get('href')):
+        title_tag = next(a.iter('h3', 'h4'), a)
+        yield element_text(title_tag), _clean_google_link(a.get('href'))
+
+
+# ===============================
+# 📡 RSS 검색 피드 (스트리밍 iterparse)
+# ===============================
+def _rss_title(item):
+    """RSS 제목은 '기사 제목 - 언론사' 형태 → HTML 결과와 같도록 언론사 꼬리를 뗀다."""
+    title_text = (item.findtext('title') or '').strip()
+    source = (item.findtext('source') or '').strip()
+    if source and title_text.endswith(' - ' + source):
+        title_text = title_text[:-len(' - ' + source)].rstrip()
+    return title_text
+
+
+def iter_rss_items(query, headers, timeout):
+    """RSS 검색 결과를 (title, link)로 하나씩 흘려보낸다. 호출 측이 멈추면 나머지는 받지 않는다."""
+    params = {
+        'q': f'{query} when:1d',  # 최근 1일
+        'hl': 'ko',
+        'gl': 'KR',
+        'ceid': 'KR:ko'
+    }
+    response = fetch(RSS_SEARCH_URL, params=params, headers=headers, timeout=timeout, stream=True)
+    try:
+        response.raw.decode_content = True  # gzip 응답도 그대로 파서에 흘려보냄
+        for _, item in etree.iterparse(response.raw, events=('end',), tag='item'):
+            title_text = _rss_title(item)
+            link = (item.findtext('link') or '').strip()
+            item.clear()
+            yield title_text, link
+    finally:
+        response.close()
+
+
+def _iter_items(backend, query, headers, timeout):
+    if backend == 'rss':
+        return iter_rss_items(query, headers, timeout)
+    return iter_html_items(query, headers, timeout)
+
+
+def _with_fallback(backend, run, label):
+    """run(backend) — 실패(예외)하면 FALLBACK_BACKENDS의 다음 백엔드로 한 번 더. 마지막 백엔드의 예외는 그대로 올린다"""
+    try:
+        return run(backend)
+    except Exception as e:
+        fallback = FALLBACK_BACKENDS.get(backend)
+        if not fallback:
+            raise
+        print(f"⚠️ 구글 뉴스 {backend} 검색 실패 ({label}): {e} → {fallback}로 다시")
+        return run(fallback)
+
+
+def _first_match(items, keywords):
+    for title_text, link in items:
+        if len(title_text) < 5:
+            continue
+        if _contains_keyword(title_text, keywords):
+            return {'title': title_text, 'link': link}
+    return dict(EMPTY_RESULT)
+
+
+# ===============================
+# 🔎 공개 함수
+# ===============================
+def search_google_news(company_name, keywords, headers, backend=None, timeout=10):
+    """
+    회사명으로 구글 뉴스 검색 (최근 1일) 후 제목에 keywords 중 하나가 포함된 첫 기사 반환.
+    RSS가 실패하면 HTML 결과 페이지로 다시 찾는다. 실패하거나 없으면 {'title': None, 'link': None}.
+    """
+    backend = backend or GOOGLE_NEWS_BACKEND
+    query = f'"{company_name}"'
+
+    try:
+        return _with_fallback(backend, lambda b: _first_match(_iter_items(b, query, headers, timeout), keywords),
+                              company_name)
+    except Exception as e:
+        print(f"❌ 뉴스 검색 실패 ({company_name}): {e}")
+        return dict(EMPTY_RESULT)
+
+
+# ===============================
+# 📦 여러 회사 묶음 검색 (OR 쿼리 + 결과 분배)
+# ===============================
+def _nested(norm_a, norm_b):
+    """정규화된 회사명이 같거나 한쪽이 다른 쪽에 들어 있음 ('토스' / '토스뱅크')"""
+    return bool(norm_a) and bool(norm_b) and (norm_a in norm_b or norm_b in norm_a)
+
+
+def _chunks(names, batch_size):
+    """
+    회사명을 batch_size개 이하 묶음으로 — 정규화된 이름이 같거나 겹치는 회사는 같은 묶음에 넣지 않는다.
+    ('토스'와 '토스뱅크'가 한 묶음이면 '토스뱅크' 기사 제목에 둘 다 들어 있어 누구 기사인지 가를 수 없음)
+    순서대로 들어갈 수 있는 첫 묶음에 넣는다.
+    """
+    chunks = []
+    for name in names:
+        norm = normalize_for_match(name)
+        for chunk in chunks:
+            if len(chunk) < batch_size and not any(_nested(norm, other) for other in chunk.values()):
+                chunk[name] = norm
+                break
+        else:
+            chunks.append({name: norm})
+    return chunks
+
+
+def _assign(title_text, link, pending, keywords, results):
+    """
+    제목에 정규화된 회사명이 들어 있는 미해결 회사 모두에 기사를 배정한다.
+    묶음 안에는 이름이 겹치는 회사가 없으므로(_chunks) 한 제목에 여러 회사가 걸리면 실제로 함께 나온 기사다.
+    """
+    if len(title_text) < 5 or not _contains_keyword(title_text, keywords):
+        return
+    norm_title = normalize_for_match(title_text)
+    for name in [name for name, norm in pending.items() if norm and norm in norm_title]:
+        results[name] = {'title': title_text, 'link': link}
+        pending.pop(name)
+
+
+def search_google_news_batch(company_names, keywords, headers, backend=None, batch_size=5, timeout=10):
+    """
+    회사명 batch_size개씩 '"A" OR "B" OR ...' 쿼리 하나로 검색하고, 결과 제목에 들어 있는 회사에 기사를 나눠준다.
+    정규화된 이름이 같거나 겹치는 회사는 서로 다른 묶음으로 나눈다 (_chunks).
+    묶음 검색으로 못 찾은 회사만 회사별 단건 검색으로 다시 찾는다.
+    반환: ({회사명: {'title', 'link'}}, 통계 dict)
+    """
+    backend = backend or GOOGLE_NEWS_BACKEND
+    results = {}
+    stats = {"companies": len(company_names), "batch_requests": 0, "single_requests": 0,
+             "resolved_by_batch": 0, "resolved_by_single": 0}
+
+    names = list(dict.fromkeys(company_names))
+    for chunk in _chunks(names, batch_size):
+        pending = dict(chunk)
+        query = ' OR '.join(f'"{name}"' for name in chunk)
+        def run(b):
+            stats["batch_requests"] += 1
+            for title_text, link in _iter_items(b, query, headers, timeout):
+                _assign(title_text, link, pending, keywords, results)
+                if not pending:
+                    break  # 묶음 전체 해결 → 나머지 결과는 받지 않음
+
+        try:
+            _with_fallback(backend, run, ', '.join(chunk))
+        except Exception as e:
+            print(f"❌ 묶음 뉴스 검색 실패 ({', '.join(chunk)}): {e}")
+    stats["resolved_by_batch"] = len(results)
+
+    for name in names:
+        if name in results:
+            continue
+        stats["single_requests"] += 1
+        results[name] = search_google_news(name, keywords, headers, backend=backend, timeout=timeout)
+        if results[name]['title']:
+            stats["resolved_by_single"] += 1
+
+    stats["upstream_requests"] = stats["batch_requests"] + stats["single_requests"]
+    return results, stats
@@ -0,0 +1,181 @@
+# api/common/http.py
+# 모든 스크래퍼가 함께 쓰는 HTTP 세션 (커넥션 풀 공유) + 호스트별 요청 속도 제한 + 재시도/헤지/서킷 브레이커
+import contextvars
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import raw_archive
+from .fetch_policy import (MAX_RETRIES, RETRY_STATUSES, CircuitOpenError, backoff_delay, breaker_for,
+                           current_stats, note, tracker_for)
+from .ratelimit import limiter_for, parse_retry_after
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+POOL_CONNECTIONS = 8   # 호스트별 풀 개수
+POOL_MAXSIZE = 16      # 호스트당 keep-alive 커넥션 수 (본문 병렬 수집 상한보다 커야 함)
+
+# 로컬 스텁 서버로 모든 업스트림 요청을 돌릴 때 사용 (bench/stub_server.py)
+#   https://www.thebell.co.kr/free/... → {UPSTREAM_STUB_URL}/www.thebell.co.kr/free/...
+UPSTREAM_STUB_URL = os.environ.get("UPSTREAM_STUB_URL", "").rstrip("/")
+
+# 헤지 요청 기본값 (엔드포인트에서는 ?hedge=1 로 켤 수 있음)
+HEDGE_DEFAULT = os.environ.get("FETCH_HEDGE", "0") in ("1", "true")
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/130.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+}
+
+_session = None
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+def get_session():
+    """프로세스 전체에서 하나의 requests.Session을 재사용한다 (웜 인스턴스에서는 커넥션도 재사용)."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
+
+def upstream_url(url):
+    """UPSTREAM_STUB_URL이 설정돼 있으면 실제 호스트 대신 스텁 서버 주소로 바꾼다."""
+    if not UPSTREAM_STUB_URL:
+        return url
+    parts = urlsplit(url)
+    rewritten = f"{UPSTREAM_STUB_URL}/{parts.netloc}{parts.path or '/'}"
+    return rewritten + ("?" + parts.query if parts.query else "")
+
+
+def _send_once(url, params, headers, timeout, stream, acquire=True):
+    """limiter 슬롯을 기다린 뒤 요청 한 번. 지연/상태 코드를 limiter와 지연 기록에 반영한다."""
+    limiter = limiter_for(url)
+    if acquire:
+        limiter.acquire()
+    note("requests")
+    started = time.monotonic()
+    try:
+        resp = get_session().get(upstream_url(url), params=params, headers=headers or DEFAULT_HEADERS,
+                                 timeout=timeout, stream=stream)
+    except requests.RequestException:
+        limiter.record(time.monotonic() - started, status=None)
+        raise
+    elapsed = time.monotonic() - started
+    limiter.record(elapsed, status=resp.status_code,
+                   retry_after=parse_retry_after(resp.headers.get("Retry-After")))
+    if resp.status_code < 500:
+        tracker_for(limiter.host).add(elapsed)
+    return resp
+
+
+def _close_quietly(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _send_hedged(url, params, headers, timeout, stream):
+    """첫 요청이 호스트 p95 지연 안에 안 끝나면 같은 요청을 하나 더 보내고 먼저 성공한 응답을 쓴다."""
+    limiter = limiter_for(url)
+    delay = None if stream else tracker_for(limiter.host).hedge_delay()
+    if delay is None:
+        return _send_once(url, params, headers, timeout, stream)
+
+    # 슬롯 대기는 헤지 지연에 넣지 않는다 (속도 제한으로 밀린 요청에 헤지를 쏘면 부하만 늘어남)
+    limiter.acquire()
+    first = _hedge_pool.submit(contextvars.copy_context().run, _send_once, url, params, headers, timeout, stream,
+                               False)
+    try:
+        return first.result(timeout=delay)
+    except FutureTimeout:
+        pass
+
+    note("hedges")
+    second = _hedge_pool.submit(contextvars.copy_context().run, _send_once, url, params, headers, timeout, stream)
+    pending = {first, second}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is None:
+                if fut is second:
+                    note("hedge_wins")
+                for loser in pending:
+                    loser.add_done_callback(_close_quietly)
+                return fut.result()
+            error = error or fut.exception()
+    raise error
+
+
+def fetch(url, params=None, headers=None, timeout=10, stream=False, retries=MAX_RETRIES, hedge=None):
+    """
+    공유 세션으로 GET 요청 후 상태 코드를 확인해 Response를 돌려준다.
+    - 요청 전에는 호스트별 limiter 슬롯을 기다리고, 응답 지연/429/503/Retry-After로 속도를 조정한다.
+    - 연결 오류/타임아웃/5xx/429는 지터 섞인 지수 백오프로 retries번까지 다시 시도한다.
+    - hedge=True(또는 현재 요청의 FetchStats.hedge)면 p95 지연을 넘긴 요청에 헤지 요청을 추가로 보낸다.
+    - 호스트가 연속으로 실패하면 회로가 열려 CircuitOpenError를 바로 던진다.
+    - RAW_ARCHIVE_MODE=record 면 성공 응답이 원본 보관소(common/raw_archive)에 남고, replay 면 네트워크 대신 보관소에서 꺼낸다.
+    """
+    if raw_archive.replaying():
+        return raw_archive.replay_response(url, params, stream)
+    if hedge is None:
+        stats = current_stats()
+        hedge = stats.hedge if stats is not None else HEDGE_DEFAULT
+    send = _send_hedged if hedge else _send_once
+    breaker = breaker_for(limiter_for(url).host)
+    try:
+        breaker.before_request()
+    except CircuitOpenError:
+        note("circuit_open")
+        raise
+
+    attempt = 0
+    recorded = False  # 어떤 경로로 나가든 회로에 성공/실패를 남긴다 (half-open 시험 플래그가 남지 않게)
+    try:
+        while True:
+            try:
+                resp = send(url, params, headers, timeout, stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= retries:
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+                    break
+                resp.close()
+            note("retries")
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+        if resp.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+            note("failures")
+        else:
+            breaker.record_success()
+        recorded = True
+    except Exception:
+        # 연결 오류/타임아웃뿐 아니라 TooManyRedirects, ContentDecodingError, 헤지 경로의 다른 예외도 실패로
+        breaker.record_failure()
+        note("failures")
+        recorded = True
+        raise
+    finally:
+        if not recorded:
+            breaker.release_trial()  # KeyboardInterrupt 등
+    resp.raise_for_status()
+    if raw_archive.recording():
+        raw_archive.record_response(raw_archive.archive_key(url, params), resp, stream)
+    return resp
@@ -0,0 +1,169 @@
+# api/common/keywords.py
+# 다중 키워드 매칭 엔진 (Aho-Corasick)
+#
+# 기존 필터는 any(keyword in title_text for keyword in TITLE_KEYWORDS) → 키워드 수만큼 문자열을 다시 훑는다.
+# 키워드 사전이 수백 개가 되면 제목 하나에 수백 번 검색이 돌아가므로,
+# 키워드 전체를 한 번 오토마톤으로 컴파일해 두고 텍스트는 한 번만 훑는다.
+#
+# 키워드 세트는 keyword_sets.json ({세트이름: {키워드: 가중치}}) 에서 읽는다.
+# KEYWORD_SETS_PATH 환경변수로 다른 JSON을 주면 같은 이름의 세트를 덮어쓰거나 새 세트를 추가할 수 있다.
+import json
+import os
+import threading
+from collections import deque
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+DEFAULT_SETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keyword_sets.json")
+KEYWORD_SETS_PATH = os.environ.get("KEYWORD_SETS_PATH")
+# 키워드가 이보다 적으면 str.__contains__ (C 구현) 반복이 오토마톤보다 빠르다 (bench/bench_keywords.py 참고)
+AUTOMATON_MIN_KEYWORDS = 64
+
+_lock = threading.Lock()
+_sets = None
+_matchers = {}
+
+
+class UnknownKeywordSet(ValueError):
+    """keyword_sets.json에 없는 세트 이름"""
+
+
+class KeywordMatcher:
+    """키워드 → 가중치 사전을 Aho-Corasick 오토마톤으로 컴파일한 매처 (대소문자 무시)"""
+
+    def __init__(self, weights):
+        if not isinstance(weights, dict):
+            weights = {k: 1.0 for k in weights}
+        self.weights = {k.lower(): float(w) for k, w in weights.items() if k}
+        self._original = {k.lower(): k for k in weights if k}  # 결과에는 사전에 적힌 표기 그대로
+        self._goto = [{}]   # 상태별 전이: 문자 → 다음 상태
+        self._fail = [0]    # 실패 링크
+        self._out = [()]    # 상태에서 끝나는 키워드들 (실패 링크 쪽 출력까지 합쳐 둠)
+        for keyword in self.weights:
+            self._add(keyword)
+        self._build_links()
+
+    def _add(self, keyword):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (keyword,)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def finditer(self, text):
+        """(끝 위치, 키워드)를 텍스트 한 번 훑으면서 순서대로 돌려준다."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text.lower()):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for keyword in out[state]:
+                    yield i, keyword
+
+    def contains_any(self, text):
+        if len(self.weights) < AUTOMATON_MIN_KEYWORDS:
+            text = text.lower()
+            return any(keyword in text for keyword in self.weights)
+        for _ in self.finditer(text):
+            return True
+        return False
+
+    def matches(self, text):
+        if len(self.weights) < AUTOMATON_MIN_KEYWORDS:
+            text = text.lower()
+            return {keyword for keyword in self.weights if keyword in text}
+        return {keyword for _, keyword in self.finditer(text)}
+
+    def score(self, text):
+        """(점수, 매칭 키워드 목록) — 같은 키워드는 여러 번 나와도 한 번만 센다."""
+        found = self.matches(text)
+        return sum(self.weights[k] for k in found), sorted(self._original[k] for k in found)
+
+    def __len__(self):
+        return len(self.weights)
+
+
+# ===============================
+# 🗂️ 키워드 세트 로드 (한 번만 컴파일)
+# ===============================
+def _load_sets():
+    global _sets
+    if _sets is None:
+        with open(DEFAULT_SETS_PATH, encoding="utf-8") as f:
+            sets = json.load(f)
+        if KEYWORD_SETS_PATH:
+            try:
+                with open(KEYWORD_SETS_PATH, encoding="utf-8") as f:
+                    sets.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 키워드 세트 로드 실패 ({KEYWORD_SETS_PATH}): {e}")
+        _sets = sets
+    return _sets
+
+
+def keyword_set_names():
+    with _lock:
+        return sorted(_load_sets())
+
+
+def get_matcher(name):
+    """이름으로 키워드 세트를 찾아 컴파일된 매처를 돌려준다 (프로세스당 한 번 컴파일)."""
+    with _lock:
+        matcher = _matchers.get(name)
+        if matcher is None:
+            sets = _load_sets()
+            if name not in sets:
+                raise UnknownKeywordSet(f"알 수 없는 키워드 세트: {name} (사용 가능: {', '.join(sorted(sets))})")
+            matcher = _matchers[name] = KeywordMatcher(sets[name])
+        return matcher
+
+
+# ===============================
+# 🏷️ 기사 목록 필터/점수
+# ===============================
+def score_articles(articles, fields, matcher, min_score=None):
+    """
+    articles 각 dict의 fields(제목, 요약 등)를 한 번에 훑어 "keyword_score", "matched_keywords"를 붙인다.
+    min_score가 있으면 그 이상인 기사만 남긴 새 목록을 돌려준다.
+    """
+    kept = []
+    for art in articles:
+        text = "\n".join(art.get(f) or "" for f in fields)
+        art["keyword_score"], art["matched_keywords"] = matcher.score(text)
+        if min_score is None or art["keyword_score"] >= min_score:
+            kept.append(art)
+    return kept
+
+
+def keyword_filter_from_args(args):
+    """
+    엔드포인트 공용: ?keywords=<세트이름>[&min_score=<점수>] → filter(articles, fields) 함수, 파라미터가 없으면 None.
+    크롤링 전에 호출해 잘못된 세트 이름은 미리 UnknownKeywordSet으로 거른다.
+    """
+    set_name = args.get("keywords")
+    if not set_name:
+        return None
+    matcher = get_matcher(set_name)
+    min_score = args.get("min_score", type=float)
+    return lambda articles, fields: score_articles(articles, fields, matcher, min_score)
@@ -0,0 +1,154 @@
+# api/common/pipeline.py
+# 대량 백필용 수집/파싱 분리 파이프라인 (여러 날짜 크롤링, parse_article 일괄 처리)
+#
+# enrich처럼 스레드 안에서 받자마자 파싱하면 BeautifulSoup/readability가 GIL을 쥐고 있어서
+# 코어가 여러 개여도 파싱은 사실상 한 코어에서만 돈다. 여기서는 일을 둘로 나눈다.
+#   - I/O 스레드 N개: 원본 bytes만 받아 크기 제한 큐(queue_size)에 넣는다
+#   - 파서 프로세스 M개(ProcessPoolExecutor): 큐에서 꺼낸 페이지를 파싱해 작은 dict 레코드만 돌려준다
+# 파서가 밀리면 큐가 가득 차서 I/O 스레드가 put()에서 멈춘다 (backpressure) → 원본 페이지가 메모리에 무한정 쌓이지 않음.
+import contextvars
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .article import ArticleParseError, extract_article_bytes
+from .http import fetch
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+DEFAULT_FETCH_WORKERS = 6
+DEFAULT_QUEUE_SIZE = 32      # 파싱을 기다리는 원본 페이지 최대 개수
+IN_FLIGHT_PER_PARSER = 2     # 파서 프로세스당 동시에 맡기는 페이지 수
+PUT_POLL_SECONDS = 0.5
+
+_DONE = object()
+
+
+# ===============================
+# 🧩 기본 작업 함수 (파서 쪽은 프로세스로 넘어가므로 모듈 최상위 함수여야 함)
+# ===============================
+def fetch_raw(url, timeout=10):
+    """I/O 스레드 기본 작업: 원본 bytes만 받아 온다 (디코딩/파싱은 파서 프로세스에서)"""
+    return fetch(url, timeout=timeout).content
+
+
+def parse_article_record(url, raw):
+    """파서 기본 작업: 기사 페이지 bytes → {"url", "title", "content", "method"} (문자셋은 BOM/<meta>로 판별)"""
+    try:
+        title, content, extraction = extract_article_bytes(raw, url)
+    except ArticleParseError as e:
+        return {"url": url, "error": str(e)}
+    return {"url": url, "title": title, "content": content, "method": extraction["method"]}
+
+
+# ===============================
+# 🚚 파이프라인
+# ===============================
+def run_pipeline(jobs, parse_fn=parse_article_record, fetch_fn=fetch_raw, fetch_workers=DEFAULT_FETCH_WORKERS,
+                 parse_workers=None, queue_size=DEFAULT_QUEUE_SIZE, stats=None):
+    """
+    jobs(보통 URL)를 I/O 스레드로 받아 파서 프로세스로 넘기고, 파싱 결과 레코드를 끝나는 순서대로 yield 한다.
+    - parse_fn(job, raw) → dict. parse_workers=0 이면 프로세스 없이 현재 프로세스에서 파싱 (비교/1코어용)
+    - 수집/파싱 실패는 {"url": job, "error": ...} 레코드로 나온다
+    - stats dict를 넘기면 진행 통계(fetched, parsed, failed, backpressure_waits, max_queue, elapsed_s)를 채운다
+    """
+    if parse_workers is None:
+        parse_workers = os.cpu_count() or 1
+    stats = stats if stats is not None else {}
+    stats.update(fetched=0, parsed=0, failed=0, backpressure_waits=0, max_queue=0,
+                 fetch_workers=fetch_workers, parse_workers=parse_workers, queue_size=queue_size)
+    started = time.perf_counter()
+
+    raw_queue = queue.Queue(maxsize=queue_size)
+    job_iter = iter(jobs)
+    job_lock = threading.Lock()
+    stats_lock = threading.Lock()
+    stop = threading.Event()
+
+    def put(item):
+        # 큐가 가득 차 있으면 파서가 따라올 때까지 대기 (소비 쪽이 중단되면 stop으로 빠져나옴)
+        if raw_queue.full():
+            with stats_lock:
+                stats["backpressure_waits"] += 1
+        while not stop.is_set():
+            try:
+                raw_queue.put(item, timeout=PUT_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def fetcher():
+        while not stop.is_set():
+            with job_lock:
+                job = next(job_iter, _DONE)
+            if job is _DONE:
+                break
+            try:
+                put((job, fetch_fn(job), None))
+            except Exception as e:
+                put((job, None, f"URL 요청 오류: {e}"))
+        put(_DONE)
+
+    threads = [threading.Thread(target=contextvars.copy_context().run, args=(fetcher,), daemon=True,
+                                name=f"pipeline-fetch-{i}") for i in range(fetch_workers)]
+    for t in threads:
+        t.start()
+
+    # fork는 I/O 스레드가 잡고 있던 락까지 복사하므로 spawn으로 새 파서 프로세스를 띄운다
+    pool = (ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"))
+            if parse_workers > 0 else None)
+    max_in_flight = max(1, parse_workers) * IN_FLIGHT_PER_PARSER
+    in_flight = {}
+    fetchers_left = fetch_workers
+
+    def count(record):
+        stats["failed" if "error" in record else "parsed"] += 1
+        return record
+
+    def finished(fut):
+        job = in_flight.pop(fut)
+        try:
+            record = fut.result()
+        except Exception as e:
+            record = {"url": job, "error": f"파싱 오류: {e}"}
+        return count(record)
+
+    try:
+        while fetchers_left or in_flight:
+            # 파서가 다 차 있거나 더 받을 페이지가 없으면 파싱이 하나 끝날 때까지 대기
+            # (그동안 큐가 차면서 I/O 스레드도 멈춘다)
+            if in_flight and (len(in_flight) >= max_in_flight or not fetchers_left):
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield finished(fut)
+                continue
+
+            item = raw_queue.get()
+            if item is _DONE:
+                fetchers_left -= 1
+                continue
+            stats["max_queue"] = max(stats["max_queue"], raw_queue.qsize() + 1)
+            job, raw, error = item
+            if error:
+                yield count({"url": job, "error": error})
+                continue
+            stats["fetched"] += 1
+            if pool is None:
+                try:
+                    record = parse_fn(job, raw)
+                except Exception as e:
+                    record = {"url": job, "error": f"파싱 오류: {e}"}
+                yield count(record)
+            else:
+                in_flight[pool.submit(parse_fn, job, raw)] = job
+            for fut in [f for f in in_flight if f.done()]:
+                yield finished(fut)
+    finally:
+        stop.set()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        stats["elapsed_s"] = round(time.perf_counter() - started, 2)
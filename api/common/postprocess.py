@@ -0,0 +1,112 @@
+# api/common/postprocess.py
+# 목록 후처리 공용 단계 — 날짜 파싱, 수집 구간 거르기, URL/회사 중복 제거, 안정 정렬을 레코드 배치 한 번에
+#
+# - 행마다 strptime → strftime → 다시 strptime 하던 것을 날짜 열 전체를 numpy datetime64[s]로 한 번에 파싱한다.
+#   형식: "YYYY-MM-DD HH:MM[:SS]", "YYYY-MM-DD", "YYYY.MM.DD" (점은 하이픈으로 바꿔 같은 파서로).
+#   값은 KST 벽시계 시각으로 본다 — 구간 경계로 aware datetime을 주면 KST로 바꾼 뒤 tz를 떼서 비교한다.
+#   형식이 틀린 값은 NaT (한 번에 파싱이 실패하면 공백/점을 정리해 다시, 그래도 안 되면 값별로) → 구간을 줄 때 빠진다.
+# - 중복 제거: 구간 안 행 중 키(URL, 회사명 등)가 처음 나온 행만 — 리스트 멤버십 검사(O(n²)) 대신 dict 한 번.
+#   문자열 키는 np.unique(정렬)보다 해시가 빠르다 (백필 100만 건 기준).
+# - 정렬: 시각 기준 안정 정렬 (같은 시각은 들어온 순서 유지) — sorted(..., reverse=True)와 같은 순서.
+# 레코드는 dict(키 이름)나 tuple(인덱스) 모두 된다. 백필 규모 비교는 bench/bench_postprocess.py.
+from datetime import datetime, timedelta
+from operator import itemgetter
+
+import numpy as np
+from pytz import timezone
+
+KST = timezone('Asia/Seoul')
+_UNIT = "datetime64[s]"
+NAT = np.datetime64("NaT", "s")
+
+
+def parse_times(values):
+    """날짜 문자열 목록 → datetime64[s] 배열 (KST 벽시계, 형식이 틀리면 NaT)"""
+    try:
+        return np.array(values, dtype=_UNIT)
+    except ValueError:
+        pass
+    text = [v.strip().replace(".", "-") for v in values]
+    try:
+        return np.array(text, dtype=_UNIT)
+    except ValueError:
+        return np.array([_parse_one(v) for v in text], dtype=_UNIT)
+
+
+def _parse_one(value):
+    try:
+        return np.datetime64(value, "s")
+    except ValueError:
+        return NAT
+
+
+def to_kst64(value):
+    """datetime(aware면 KST로 변환, naive면 그대로 KST로 봄) / 'YYYY-MM-DD' 문자열 → datetime64[s]"""
+    if isinstance(value, str):
+        return parse_times([value])[0]
+    if value.tzinfo is not None:
+        value = value.astimezone(KST).replace(tzinfo=None)
+    return np.datetime64(value.replace(microsecond=0), "s")
+
+
+def day_window(days):
+    """날짜 문자열 목록(예: 어제/오늘) → (첫날 0시, 마지막 날 다음 날 0시) — process의 since/until"""
+    parsed = sorted(datetime.strptime(d.replace(".", "-"), "%Y-%m-%d") for d in days)
+    return parsed[0], parsed[-1] + timedelta(days=1)
+
+
+def _column(records, key):
+    return list(map(itemgetter(key), records))
+
+
+def process(records, time_key=None, since=None, until=None, dedup=None, sort=None, times=None):
+    """
+    레코드 배치 → 구간 거르기 → 중복 제거 → 정렬을 한 번에 한 새 목록.
+    time_key: 날짜 문자열 필드(dict 키/tuple 인덱스) — times로 날짜 열을 따로 줘도 된다
+    since/until: 구간 [since, until) (datetime 또는 날짜 문자열) — 주면 날짜가 NaT인 행도 빠진다
+    dedup: 중복 판단 키 필드 — 처음 나온 행만 남김
+    sort: "desc"(최신순) | "asc" | None(들어온 순서)
+    """
+    n = len(records)
+    if n == 0:
+        return []
+    keep = np.ones(n, dtype=bool)
+    stamps = None
+    if time_key is not None or times is not None:
+        stamps = parse_times(times if times is not None else _column(records, time_key))
+        if since is not None or until is not None:
+            keep &= ~np.isnat(stamps)
+        if since is not None:
+            keep &= stamps >= to_kst64(since)
+        if until is not None:
+            keep &= stamps < to_kst64(until)
+    idx = np.flatnonzero(keep)
+
+    if dedup is not None and len(idx):
+        get = itemgetter(dedup)
+        keys = [get(records[i]) for i in idx.tolist()]
+        # 뒤에서부터 넣으면 같은 키는 처음 나온 위치가 남는다
+        first = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+        idx = idx[np.sort(np.fromiter(first.values(), dtype=np.int64, count=len(first)))]
+
+    if sort and stamps is not None and len(idx):
+        # NaT은 정렬 키에서 가장 오래된 값으로 (최신순이면 맨 뒤)
+        ticks = stamps[idx].astype(np.int64)
+        ticks[np.isnat(stamps[idx])] = np.iinfo(np.int64).min + 1
+        order = np.argsort(-ticks if sort == "desc" else ticks, kind="stable")
+        idx = idx[order]
+    return [records[i] for i in idx.tolist()]
+
+
+def split_before(records, time_key, since):
+    """
+    최신순 목록에서 since 이후 행만 → (행 목록, since 이전 행을 만났는지).
+    첫 오래된 행부터 뒤는 버린다 (목록 크롤러의 중단 조건). 날짜 형식이 틀린 행은 오래된 것으로 보지 않고 빠진다.
+    """
+    if not records:
+        return [], False
+    stamps = parse_times(_column(records, time_key))
+    valid = ~np.isnat(stamps)
+    old = np.flatnonzero(valid & (stamps < to_kst64(since)))
+    end = int(old[0]) if len(old) else len(records)
+    return [records[i] for i in np.flatnonzero(valid[:end]).tolist()], bool(len(old))
@@ -0,0 +1,233 @@
+# api/common/profiling.py
+# 운영 중 느린 요청 들여다보기 — ?profile=cpu|memory (또는 X-Profile 헤더), 토큰이 맞을 때만
+#
+# - cpu   : 샘플링 프로파일러. 별도 스레드가 PROFILE_INTERVAL_MS마다 sys._current_frames()로 모든 스레드의
+#           스택을 찍는다 (fetch 워커 스레드의 BeautifulSoup/readability 시간까지 보임). 결과는 flamegraph.pl /
+#           speedscope / inferno에 바로 넣을 수 있는 collapsed stacks 형식 ("스레드;바깥함수;...;안쪽함수 샘플수").
+# - memory: tracemalloc으로 요청 동안 할당을 추적해서 할당량 상위 위치(파일:줄)와 최대 사용량을 보고한다.
+# 결과는 PROFILE_DIR에 파일로 남기고 (X-Profile-File 헤더), JSON 응답이면 본문 "profile" 키에도 붙인다.
+# 프로파일링한 응답은 캐시하지 않는다 (Cache-Control: no-store).
+#
+# PROFILE_TOKEN 환경변수가 없으면 꺼져 있다. 켜려면 ?profile_token= 또는 X-Profile-Token 헤더로 같은 값을 보낸다.
+# 같은 프로세스의 다른 요청 스레드도 함께 찍히므로 cpu 프로파일은 한가한 인스턴스에서 보는 게 정확하다.
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from flask import g, jsonify, request
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "/tmp/profiles")
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+MEMORY_FRAMES = 15        # 할당 위치마다 보관할 스택 깊이
+TOP_N = 20                # 응답에 넣을 상위 항목 수
+MODES = {"1": "cpu", "true": "cpu", "cpu": "cpu", "memory": "memory", "mem": "memory"}
+
+
+class ProfileDenied(Exception):
+    """?profile= 요청인데 토큰이 없거나 틀림"""
+
+
+def requested_mode(args, headers):
+    """요청 인자/헤더 → "cpu" | "memory" | None. 모드를 요청했는데 권한이 없으면 ProfileDenied"""
+    value = (args.get("profile") or headers.get("X-Profile") or "").strip().lower()
+    if not value or value in ("0", "false"):
+        return None
+    mode = MODES.get(value)
+    if mode is None:
+        raise ValueError(f"알 수 없는 profile 모드: {value} (cpu, memory)")
+    token = args.get("profile_token") or headers.get("X-Profile-Token") or ""
+    if not PROFILE_TOKEN or not hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+        raise ProfileDenied("프로파일링 권한이 없습니다.")
+    return mode
+
+
+# ===============================
+# 🔥 CPU: 샘플링 프로파일러
+# ===============================
+def _frame_label(code):
+    path = code.co_filename.replace("\\", "/").rsplit("/", 2)
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """start() ~ stop() 동안 모든 스레드의 스택을 주기적으로 찍어 collapsed stacks로 센다"""
+
+    def __init__(self, interval_ms=PROFILE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, n=TOP_N):
+        """스택 맨 안쪽(실제로 돌던) 함수별 샘플 수 — 한눈에 보는 요약"""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return [{"function": f, "samples": c} for f, c in leaves.most_common(n)]
+
+
+# ===============================
+# 🧠 메모리: tracemalloc
+# ===============================
+_IGNORED = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"))
+
+
+def _memory_report(snapshot, peak, n=TOP_N):
+    stats = snapshot.filter_traces(_IGNORED).statistics("traceback")
+    sites = []
+    for stat in stats[:n]:
+        frame = stat.traceback[-1]     # 가장 안쪽 = 실제 할당 위치
+        sites.append({
+            "site": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+            "file": frame.filename,
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+            "stack": [f"{os.path.basename(f.filename)}:{f.lineno}" for f in stat.traceback],
+        })
+    return {"peak_kb": round(peak / 1024, 1), "retained_kb": round(sum(s.size for s in stats) / 1024, 1),
+            "top_sites": sites}
+
+
+# ===============================
+# ⏱️ 요청 단위 세션
+# ===============================
+class ProfileSession:
+    """요청 하나를 감싸는 프로파일링 — start() 후 finish(name)이 결과 dict를 돌려주고 파일로 남긴다"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self._profiler = None
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.mode == "cpu":
+            self._profiler = SamplingProfiler()
+            self._profiler.start()
+        else:
+            tracemalloc.start(MEMORY_FRAMES)
+            tracemalloc.reset_peak()
+        return self
+
+    def finish(self, name):
+        elapsed_ms = round((time.perf_counter() - self._started) * 1000, 1)
+        result = {"mode": self.mode, "elapsed_ms": elapsed_ms}
+        if self.mode == "cpu":
+            self._profiler.stop()
+            collapsed = self._profiler.collapsed()
+            result.update(interval_ms=PROFILE_INTERVAL_MS, samples=self._profiler.samples,
+                          top_functions=self._profiler.top_functions(), format="collapsed", collapsed=collapsed)
+            result["file"] = _store(name, "collapsed", collapsed)
+        else:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result.update(_memory_report(snapshot, peak))
+            result["file"] = _store(name, "json", json.dumps(result, ensure_ascii=False, indent=2))
+        print(f"🔬 프로파일 저장 ({self.mode}, {elapsed_ms}ms): {result['file']}")
+        return result
+
+
+def _store(name, ext, text):
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        slug = re.sub(r"[^\w.-]+", "_", name).strip("_") or "root"
+        path = os.path.join(PROFILE_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{slug}.{ext}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+    except OSError as e:
+        print(f"⚠️ 프로파일 파일 저장 실패: {e}")
+        return None
+
+
+def attach(payload, result):
+    """JSON 응답 dict에 프로파일 결과를 붙인다"""
+    payload = dict(payload)
+    payload["profile"] = result
+    return payload
+
+
+def profile_headers(result):
+    headers = {"Cache-Control": "no-store", "X-Profile-Mode": result["mode"]}
+    if result.get("file"):
+        headers["X-Profile-File"] = result["file"]
+    return headers
+
+
+# ===============================
+# 🌐 Flask 연결
+# ===============================
+def install_profiling(app):
+    """Flask 앱의 모든 엔드포인트에 ?profile= 지원을 붙인다"""
+
+    @app.before_request
+    def _start_profile():
+        try:
+            mode = requested_mode(request.args, request.headers)
+        except ProfileDenied as e:
+            return jsonify({"error": str(e)}), 403
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if mode:
+            g.profile_session = ProfileSession(mode).start()
+
+    @app.after_request
+    def _finish_profile(response):
+        session = g.pop("profile_session", None)
+        if session is None:
+            return response
+        result = session.finish(request.path)
+        if response.is_json and response.status_code == 200:
+            response.set_data(json.dumps(attach(response.get_json(), result), ensure_ascii=False))
+        response.headers.update(profile_headers(result))
+        response.headers.pop("ETag", None)
+        return response
+
+    @app.teardown_request
+    def _abort_profile(exc):
+        # 처리 중 예외로 after_request를 건너뛴 경우에도 샘플러/tracemalloc은 멈춘다
+        session = g.pop("profile_session", None)
+        if session is not None:
+            session.finish(request.path)
+
+    return app
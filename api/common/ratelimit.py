@@ -0,0 +1,119 @@
+# api/common/ratelimit.py
+# 호스트별 적응형 요청 속도 제한 (AIMD)
+#
+# 스크래퍼마다 time.sleep(0.5~1.5)를 고정으로 넣던 것을 대신한다.
+# - 응답이 빠르고 정상이면 요청 속도를 조금씩 올린다 (additive increase)
+# - 429/503, Retry-After, 또는 응답 지연이 목표보다 길면 속도를 절반으로 줄인다 (multiplicative decrease)
+# - 호스트마다 하한(floor)/상한(ceiling) 속도 안에서만 움직인다
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+# rate = 초당 요청 수. start는 기존 고정 sleep 간격에 맞춘 값
+DEFAULT_LIMIT = {"start": 4.0, "min": 0.5, "max": 10.0, "target_latency": 2.0}
+HOST_LIMITS = {
+    "www.thebell.co.kr":    {"start": 1 / 1.2, "min": 0.2, "max": 4.0, "target_latency": 1.5},
+    "www.investchosun.com": {"start": 1 / 0.5, "min": 0.2, "max": 5.0, "target_latency": 1.5},
+    "signalm.sedaily.com":  {"start": 1 / 0.8, "min": 0.2, "max": 4.0, "target_latency": 1.5},
+    "news.google.com":      {"start": 1 / 1.2, "min": 0.1, "max": 1.5, "target_latency": 2.0},
+    "startuprecipe.co.kr":  {"start": 1.0,     "min": 0.2, "max": 3.0, "target_latency": 2.0},
+}
+# RATE_LIMITS_JSON='{"www.thebell.co.kr": {"max": 2}}' 처럼 환경변수로 덮어쓸 수 있다
+for _host, _override in json.loads(os.environ.get("RATE_LIMITS_JSON") or "{}").items():
+    HOST_LIMITS[_host] = {**HOST_LIMITS.get(_host, DEFAULT_LIMIT), **_override}
+
+ADDITIVE_STEP = 0.25        # 정상 응답 1건마다 올리는 속도 (req/s)
+DECREASE_FACTOR = 0.5       # 혼잡 신호 시 곱하는 값
+MAX_RETRY_AFTER = 60        # Retry-After가 이보다 길면 잘라서 적용 (초)
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 초"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return max(0.0, min(seconds, MAX_RETRY_AFTER))
+
+
+class HostLimiter:
+    """한 호스트에 대한 요청 간격 관리. 여러 스레드가 같이 써도 순서대로 슬롯을 예약한다."""
+
+    def __init__(self, host, start, min, max, target_latency):
+        self.host = host
+        self.min_rate = min
+        self.max_rate = max
+        self.rate = start
+        self.target_latency = target_latency
+        self._last_slot = float("-inf")   # 마지막으로 예약된 요청 시각 (monotonic)
+        self._blocked_until = 0.0         # Retry-After로 막힌 시각
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "slow": 0, "waited_s": 0.0}
+
+    def reserve(self):
+        """다음 요청 슬롯을 예약하고 그때까지 남은 시간(초)을 돌려준다 (기다리지는 않음 — asyncio용)."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._last_slot + 1.0 / self.rate, self._blocked_until)
+            self._last_slot = slot
+            wait = slot - now
+            self.stats["requests"] += 1
+            self.stats["waited_s"] += wait
+        return wait
+
+    def acquire(self):
+        """다음 요청 슬롯까지 기다린다. 기다린 시간(초)을 돌려준다."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record(self, latency, status=None, retry_after=None):
+        """응답 결과로 속도를 조정한다. status=None 은 연결 오류/타임아웃."""
+        with self._lock:
+            if status in THROTTLE_STATUSES or status is None:
+                self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+                self.stats["throttled"] += 1
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            elif latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+                self.stats["slow"] += 1
+            else:
+                self.rate = min(self.max_rate, self.rate + ADDITIVE_STEP)
+
+    def snapshot(self):
+        with self._lock:
+            return {"rate": round(self.rate, 3), **{k: round(v, 3) if isinstance(v, float) else v
+                                                     for k, v in self.stats.items()}}
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(url):
+    host = (urlparse(url).hostname or "").lower()
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostLimiter(host, **HOST_LIMITS.get(host, DEFAULT_LIMIT))
+        return limiter
+
+
+def limiter_stats():
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.host: limiter.snapshot() for limiter in limiters}
@@ -0,0 +1,341 @@
+# api/common/raw_archive.py
+# 업스트림 원본 페이지 보관소 (zstd 압축, 내용 주소 기반) + 오프라인 재생(replay) 모드
+#
+# - common/http.fetch(및 aio_http.fetch_async)가 받은 2xx 응답 본문을 sha256 이름의 .zst 파일로 저장한다.
+#   내용이 같은 페이지는 한 번만 저장된다 (매 크롤링마다 같은 목록 페이지를 받아도 용량이 늘지 않음).
+# - index.db(SQLite)에 URL(+쿼리) · 받은 시각 · sha256 · Content-Type을 기록한다.
+# - RAW_ARCHIVE_MODE=replay 이면 fetch가 네트워크 대신 보관소에서 응답을 꺼낸다.
+#   선택자를 고친 뒤 실사이트를 다시 때리지 않고 테스트하거나, 지난 페이지들을 CPU 속도로 다시 파싱할 때 쓴다.
+#   RAW_ARCHIVE_AT=2025-10-31T09:00 을 주면 그 시각 이전의 마지막 스냅샷을 쓴다 (기본: 가장 최근).
+# - 압축/파일 쓰기/색인 기록은 백그라운드 쓰기 스레드가 한다 (요청 경로에서는 큐에 넣기만, article_store와 같은 방식).
+# - stream=True 응답을 파서가 중간에 멈추고 닫으면 남은 본문을 받지 않고, 읽은 데까지만 partial=1로 남긴다
+#   (조기 종료가 그대로 살아 있고, 같은 파서로 replay하면 같은 곳에서 멈추므로 결과도 같다).
+#   stream이 아닌 replay는 완전한 스냅샷을 먼저 찾는다.
+# - 기록은 켜야 동작한다 (RAW_ARCHIVE_MODE=record). 압축 파일 합계가 RAW_ARCHIVE_MAX_BYTES를 넘으면
+#   가장 오래전에 받은 내용부터 지워 예산의 90%까지 줄인다 (/tmp가 차서 인스턴스가 죽지 않도록).
+#
+# RAW_ARCHIVE_MODE: off(기본) | record | replay
+import hashlib
+import atexit
+import io
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import requests
+import zstandard
+from pytz import timezone
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+RAW_ARCHIVE_DIR = os.environ.get("RAW_ARCHIVE_DIR", "/tmp/raw_archive")
+RAW_ARCHIVE_MODE = os.environ.get("RAW_ARCHIVE_MODE", "off")
+RAW_ARCHIVE_MAX_BYTES = int(os.environ.get("RAW_ARCHIVE_MAX_BYTES", 200_000_000))  # 압축 파일 합계 상한, 0 = 무제한
+PRUNE_TO = 0.9  # 상한을 넘으면 이 비율까지 줄인다 (매 저장마다 정리하지 않도록)
+RAW_ARCHIVE_AT = os.environ.get("RAW_ARCHIVE_AT")  # replay 기준 시각 (KST, ISO 형식)
+ZSTD_LEVEL = 9
+FLUSH_TIMEOUT = 10  # flush()가 쓰기 스레드를 기다리는 최대 시간(초)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetches (
+    id           INTEGER PRIMARY KEY,
+    url          TEXT NOT NULL,
+    fetched_at   TEXT NOT NULL,
+    sha256       TEXT NOT NULL,
+    status       INTEGER NOT NULL,
+    content_type TEXT,
+    size         INTEGER NOT NULL,
+    partial      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_fetches_url_time ON fetches (url, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_fetches_time ON fetches (fetched_at);
+"""
+
+_lock = threading.Lock()
+_conn = None
+_local = threading.local()
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+_stored_bytes = None  # objects/ 압축 파일 합계 (처음 필요할 때 한 번 세고, 이후 쓰기/정리 때 갱신)
+
+
+class ArchiveMiss(requests.RequestException):
+    """replay 모드에서 보관소에 없는 URL — 스크래퍼는 요청 실패와 똑같이 다룬다"""
+
+
+def recording():
+    return RAW_ARCHIVE_MODE == "record"
+
+
+def replaying():
+    return RAW_ARCHIVE_MODE == "replay"
+
+
+def archive_key(url, params=None):
+    """보관/조회 키: 쿼리 파라미터까지 붙인 실제 요청 URL (requests와 같은 인코딩)"""
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+def _now():
+    return datetime.now(timezone('Asia/Seoul')).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.join(RAW_ARCHIVE_DIR, "objects"), exist_ok=True)
+        conn = sqlite3.connect(os.path.join(RAW_ARCHIVE_DIR, "index.db"), timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(fetches)")}
+        if "partial" not in columns:  # partial 열이 생기기 전에 만든 보관소
+            conn.execute("ALTER TABLE fetches ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+        _conn = conn
+    return _conn
+
+
+def _blob_path(sha):
+    return os.path.join(RAW_ARCHIVE_DIR, "objects", sha[:2], sha[2:] + ".zst")
+
+
+def _compressor():
+    # ZstdCompressor/Decompressor는 스레드 간에 같이 쓰면 안 됨 → 스레드별로
+    if not hasattr(_local, "cctx"):
+        _local.cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        _local.dctx = zstandard.ZstdDecompressor()
+    return _local.cctx, _local.dctx
+
+
+# ===============================
+# 💾 저장
+# ===============================
+def store(key, content, status=200, content_type=None, fetched_at=None, partial=False):
+    """원본 본문 저장 → sha256. 같은 내용이 이미 있으면 색인 행만 추가한다. (쓰기 스레드에서 — 보통은 enqueue)"""
+    sha = hashlib.sha256(content).hexdigest()
+    path = _blob_path(sha)
+    written = 0
+    try:
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                written = f.write(_compressor()[0].compress(content))
+            os.replace(tmp_path, path)
+        with _lock:
+            conn = _db()
+            with conn:
+                conn.execute(
+                    "INSERT INTO fetches (url, fetched_at, sha256, status, content_type, size, partial) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, fetched_at or _now(), sha, status, content_type, len(content), int(partial)))
+        if written:
+            _charge(written)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️ 원본 보관 실패 ({key}): {e}")
+    return sha
+
+
+def _objects_bytes():
+    stored = 0
+    for root, _, files in os.walk(os.path.join(RAW_ARCHIVE_DIR, "objects")):
+        stored += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return stored
+
+
+def _charge(nbytes):
+    """새 압축 파일 크기를 합계에 더하고, 상한을 넘었으면 정리한다"""
+    global _stored_bytes
+    if not RAW_ARCHIVE_MAX_BYTES:
+        return
+    # 처음 세는 합계에는 방금 쓴 파일도 들어 있다
+    _stored_bytes = _objects_bytes() if _stored_bytes is None else _stored_bytes + nbytes
+    if _stored_bytes > RAW_ARCHIVE_MAX_BYTES:
+        prune(int(RAW_ARCHIVE_MAX_BYTES * PRUNE_TO))
+
+
+def prune(target_bytes):
+    """
+    마지막으로 받은 시각이 가장 오래된 내용부터 파일과 색인 행을 지워 합계를 target_bytes 이하로 → 지운 내용 수
+    (같은 내용을 최근에 또 받았으면 최근 것으로 친다, LRU)
+    """
+    global _stored_bytes
+    if _stored_bytes is None:
+        _stored_bytes = _objects_bytes()
+    removed = []
+    with _lock:
+        conn = _db()
+        shas = conn.execute("SELECT sha256 FROM fetches GROUP BY sha256 "
+                            "ORDER BY MAX(fetched_at), MAX(id)").fetchall()
+        for (sha,) in shas:
+            if _stored_bytes <= target_bytes:
+                break
+            path = _blob_path(sha)
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except FileNotFoundError:
+                size = 0
+            _stored_bytes -= size
+            removed.append((sha,))
+        with conn:
+            conn.executemany("DELETE FROM fetches WHERE sha256 = ?", removed)
+    if removed:
+        print(f"🧹 원본 보관소 정리: {len(removed)}개 삭제 → {_stored_bytes:,} bytes")
+    return len(removed)
+
+
+def _writer_loop():
+    while True:
+        args, kwargs = _queue.get()
+        try:
+            store(*args, **kwargs)
+        except Exception as e:
+            print(f"⚠️ 원본 보관 실패 ({args[0]}): {e}")
+        finally:
+            _queue.task_done()
+
+
+def enqueue(key, content, status=200, content_type=None, partial=False):
+    """보관을 쓰기 스레드에 맡기고 바로 반환 (받은 시각은 지금으로 고정)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="raw-archive-writer", daemon=True)
+            _writer.start()
+    _queue.put(((key, content, status, content_type, _now(), partial), {}))
+
+
+def flush(timeout=FLUSH_TIMEOUT):
+    """쌓인 보관 작업을 다 쓸 때까지 기다린다 (최대 timeout초) → 다 썼으면 True"""
+    if _writer is None:
+        return True
+    deadline = time.monotonic() + timeout
+    with _queue.all_tasks_done:
+        while _queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"⚠️ 원본 보관 대기 시간 초과 ({_queue.unfinished_tasks}건 남음)")
+                return False
+            _queue.all_tasks_done.wait(remaining)
+    return True
+
+
+atexit.register(flush)
+
+
+def read_blob(sha):
+    with open(_blob_path(sha), "rb") as f:
+        return _compressor()[1].decompress(f.read())
+
+
+def lookup(key, at=None, complete_first=False):
+    """
+    key의 스냅샷 (sha256, status, content_type, fetched_at) — at(ISO)이 있으면 그 시각 이전 마지막 것.
+    complete_first: 중간에 닫힌(partial) 스냅샷보다 완전한 것을 먼저 (본문 전체가 필요한 replay)
+    """
+    at = at or RAW_ARCHIVE_AT
+    sql = "SELECT sha256, status, content_type, fetched_at FROM fetches WHERE url = ?"
+    params = [key]
+    if at:
+        sql += " AND fetched_at <= ?"
+        params.append(at)
+    sql += " ORDER BY " + ("partial, " if complete_first else "") + "fetched_at DESC, id DESC LIMIT 1"
+    with _lock:
+        return _db().execute(sql, params).fetchone()
+
+
+def iter_snapshots(url_prefix="", date_from=None, date_to=None):
+    """보관된 스냅샷 (url, fetched_at, sha256) — 오프라인 재파싱용, 받은 시각 순"""
+    sql = "SELECT url, fetched_at, sha256 FROM fetches WHERE url LIKE ? ESCAPE '\\'"
+    params = [url_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"]
+    if date_from:
+        sql += " AND fetched_at >= ?"
+        params.append(date_from)
+    if date_to:
+        sql += " AND fetched_at < ?"
+        params.append(date_to)
+    with _lock:
+        rows = _db().execute(sql + " ORDER BY fetched_at, id", params).fetchall()
+    return rows
+
+
+def archive_stats():
+    with _lock:
+        count, snapshots, raw_bytes = _db().execute(
+            "SELECT COUNT(DISTINCT sha256), COUNT(*), COALESCE(SUM(size), 0) FROM fetches").fetchone()
+    return {"objects": count, "snapshots": snapshots, "raw_bytes": raw_bytes, "stored_bytes": _objects_bytes()}
+
+
+# ===============================
+# 🔁 requests 응답 기록/재생
+# ===============================
+class _TeeRaw:
+    """stream=True 응답의 raw를 감싸 읽은 만큼 복사해 두고, 끝까지 읽으면 보관소에 저장한다.
+    파서가 중간에 멈추고 닫으면 남은 본문은 받지 않고 읽은 데까지만 partial로 저장한다 (조기 종료 유지)."""
+
+    def __init__(self, raw, on_complete):
+        self._raw = raw
+        self._chunks = []
+        self._on_complete = on_complete
+
+    def read(self, amt=None, decode_content=None, **kwargs):
+        data = self._raw.read(amt, decode_content=True, **kwargs)
+        if data:
+            self._chunks.append(data)
+        elif self._on_complete is not None:
+            self._on_complete(b"".join(self._chunks), False)
+            self._on_complete = None
+        return data
+
+    def close(self):
+        if self._on_complete is not None and self._chunks:
+            # Content-Length만큼 다 읽고 빈 read()만 안 한 경우는 완전한 본문
+            partial = getattr(self._raw, "length_remaining", None) != 0
+            self._on_complete(b"".join(self._chunks), partial)
+        self._on_complete = None
+        self._raw.close()
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        while True:
+            data = self.read(amt)
+            if not data:
+                return
+            yield data
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+def record_response(key, resp, stream=False):
+    """fetch 성공 응답을 보관 (stream이면 끝까지 읽힌 뒤에 저장)"""
+    content_type = resp.headers.get("Content-Type")
+    if not stream:
+        enqueue(key, resp.content, resp.status_code, content_type)
+        return
+    status = resp.status_code
+    resp.raw = _TeeRaw(resp.raw, lambda content, partial: enqueue(key, content, status, content_type, partial))
+
+
+def replay_response(url, params=None, stream=False):
+    """보관소의 스냅샷으로 requests.Response를 만들어 돌려준다 (없으면 ArchiveMiss)"""
+    key = archive_key(url, params)
+    row = lookup(key, complete_first=not stream)
+    if row is None:
+        raise ArchiveMiss(f"보관소에 없음: {key}")
+    sha, status, content_type, _ = row
+    content = read_blob(sha)
+    resp = requests.Response()
+    resp.status_code = status
+    resp.url = key
+    resp.headers["Content-Type"] = content_type or "text/html"
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    if stream:
+        resp.raw = io.BytesIO(content)
+    else:
+        resp._content = content
+    return resp
@@ -0,0 +1,95 @@
+# api/common/response_cache.py
+# 우리 엔드포인트 응답의 HTTP 캐시 헤더 (ETag / 304 / Cache-Control s-maxage)
+#
+# - ETag: 결과 집합(기사 목록 등)만으로 계산한 약한 ETag. 요청 통계(fetch)나 시각처럼 매번 바뀌는 값은 뺀다
+#   → 기사가 그대로면 같은 ETag, 클라이언트가 If-None-Match로 보내면 본문 없이 304
+# - Cache-Control: 출처별 s-maxage / stale-while-revalidate → Vercel CDN이 반복 요청을 함수까지 보내지 않고 흡수
+#   (브라우저/GPT Action 쪽은 max-age=0 이라 매번 재검증하고, 304로 가볍게 끝난다)
+#
+# CACHE_POLICY_JSON='{"thebell": {"s_maxage": 120, "swr": 300}}' 로 출처별 값을 덮어쓸 수 있다.
+# 본문은 ?fields=/?max_body_chars=로 모양을 바꾼 뒤 orjson + gzip/br로 보낸다 (common/response_format).
+import hashlib
+import json
+import os
+
+from flask import Response, g, jsonify, request
+
+from .response_format import dumps, encode_body, resolve_cursor, response_shape
+
+# ===============================
+# 🔧 기본 설정 (초)
+# ===============================
+CACHE_POLICIES = {
+    "thebell": {"s_maxage": 300, "swr": 600},          # 하루 종일 새 기사 → 짧게
+    "thesignal": {"s_maxage": 300, "swr": 600},
+    "investchosun": {"s_maxage": 600, "swr": 1800},    # 어제/오늘 기사, 갱신 느림
+    "startuprecipe": {"s_maxage": 3600, "swr": 7200},  # 하루 단위 + 구글 검색이 비쌈
+    "search": {"s_maxage": 60, "swr": 300},            # 저장소 검색 — 수집 직후 반영되도록 짧게
+    "article": {"s_maxage": 86400, "swr": 604800},     # 기사 본문은 거의 안 바뀜
+}
+CACHE_POLICIES.update(json.loads(os.environ.get("CACHE_POLICY_JSON", "{}")))
+
+# 결과 집합이 아닌 값 (요청마다 달라짐) — ETag 계산에서 뺀다
+VOLATILE_KEYS = {"fetch", "timestamp", "enrichment", "extraction", "local", "google", "elapsed_ms", "discovery"}
+
+
+def _stable(value):
+    if isinstance(value, dict):
+        return {k: _stable(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_stable(v) for v in value]
+    return value
+
+
+def result_etag(payload):
+    """응답 dict → 약한 ETag (W/"..."), 결과 집합이 같으면 같은 값"""
+    body = json.dumps(_stable(payload), ensure_ascii=False, sort_keys=True, default=str)
+    return 'W/"%s"' % hashlib.sha1(body.encode("utf-8")).hexdigest()[:20]
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 헤더가 etag와 맞는지 (약한 비교, * 포함)"""
+    if not if_none_match:
+        return False
+    target = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == target:
+            return True
+    return False
+
+
+def cache_control(source):
+    policy = CACHE_POLICIES.get(source)
+    if not policy:
+        return "no-store"
+    return f"public, max-age=0, s-maxage={policy['s_maxage']}, stale-while-revalidate={policy['swr']}"
+
+
+def cache_headers(payload, source):
+    """(ETag, Cache-Control) 헤더 dict — ASGI 앱(index7)처럼 Flask 밖에서 쓸 때"""
+    return {"ETag": result_etag(payload), "Cache-Control": cache_control(source)}
+
+
+# ===============================
+# 🌐 Flask 응답
+# ===============================
+def cached_json(payload, source):
+    """
+    200 JSON 응답 + ETag/Cache-Control, If-None-Match가 맞으면 본문 없는 304.
+    ?fields=/?max_body_chars=를 적용하고(형식이 틀리면 400), Accept-Encoding에 맞춰 압축한다.
+    """
+    try:
+        payload = response_shape(request.args).apply(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    payload = resolve_cursor(payload)  # 잘린 뒤 실제로 나가는 기사 기준 ?since= 커서
+    headers = cache_headers(payload, source)
+    if etag_matches(request.headers.get("If-None-Match"), headers["ETag"]):
+        return Response(status=304, headers=headers)
+    body = dumps(payload, sort_keys=True)  # jsonify와 같은 키 순서
+    if "profile_session" not in g:  # 프로파일링 응답은 after_request에서 본문을 다시 쓰므로 압축하지 않음
+        body, encoding_headers = encode_body(body, request.headers.get("Accept-Encoding"))
+        headers.update(encoding_headers)
+    return Response(body, mimetype="application/json", headers=headers)
+
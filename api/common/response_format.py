@@ -0,0 +1,179 @@
+# api/common/response_format.py
+# 응답 모양/직렬화 — ?fields= 필드 골라내기, ?max_body_chars= 본문 자르기, orjson 직렬화, gzip/br 압축 협상
+#
+# GPT Action은 응답이 너무 크면 "Requests too large"로 실패한다 (그래서 더벨은 100건으로 자른다).
+# 기사마다 요약/본문 전체를 \uXXXX로 이스케이프된 압축 없는 jsonify로 보내던 것을 줄인다:
+# - ?fields=title,url      : 기사 레코드(articles 목록의 dict, parse_article은 응답 자체)에서 이 필드만 남김.
+#                            url/link는 서로 별칭 (출처마다 이름이 달라서). 목록 밖 메타데이터(count, cursor…)는 그대로.
+# - ?max_body_chars=300    : 긴 글 필드(body/summary/content)를 N자까지 + "…" (0이면 빈 문자열)
+# - orjson: json.dumps보다 수 배 빠르고 한글을 UTF-8 그대로 (jsonify는 글자당 \uXXXX 6바이트).
+# - Accept-Encoding에 br/gzip이 있으면 MIN_COMPRESS_BYTES 이상 응답을 압축 (br 우선, q=0은 제외), Vary: Accept-Encoding.
+# - 기사 수 제한: 전체 모양(필드/본문 그대로)이면 엔드포인트의 건수 제한(더벨 100건)을 그대로 두고,
+#   fields/max_body_chars로 줄인 응답은 건수 대신 JSON 바이트 예산(MAX_PAYLOAD_BYTES)으로 자른다 (article_cap).
+#   자르면 count를 맞추고 "truncated": 뺀 건수를 붙인다. 압축은 전송량만 줄이므로 예산은 압축 전 크기로 잰다.
+# - ?since= 델타 커서(article_store.DeltaCursor)는 자르고 난 뒤 실제로 나가는 기사로 만든다 (resolve_cursor)
+#   → 건수 제한/바이트 예산으로 잘린 기사는 다음 폴링에 나온다.
+# 모양을 바꾼 뒤의 payload로 ETag를 계산하므로 fields/max_body_chars가 다르면 ETag도 다르다 (common/response_cache).
+# 크기/속도 비교는 bench/bench_response.py.
+import gzip
+import os
+
+import brotli
+import orjson
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+RECORD_LISTS = ("articles",)                  # 기사 레코드 목록이 들어 있는 응답 키
+TEXT_FIELDS = ("body", "summary", "content")  # max_body_chars를 적용하는 긴 글 필드
+FIELD_ALIASES = {"url": "link", "link": "url"}
+MIN_COMPRESS_BYTES = 1024                     # 이보다 작으면 압축 이득보다 헤더/CPU 비용이 큼
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5                            # 11은 너무 느림 — 응답마다 압축하므로 중간 값
+ELLIPSIS = "…"
+MAX_PAYLOAD_BYTES = int(os.environ.get("MAX_PAYLOAD_BYTES", "100000"))  # 모양을 바꾼 응답의 JSON 바이트 예산
+
+
+class ResponseShape:
+    """요청의 응답 모양 (fields, max_body_chars) — 아무것도 없으면 payload를 그대로 둔다"""
+
+    def __init__(self, fields=None, max_body_chars=None):
+        self.fields = fields
+        self.max_body_chars = max_body_chars
+
+    def __bool__(self):
+        return self.fields is not None or self.max_body_chars is not None
+
+    def _record(self, record):
+        if self.fields is not None:
+            record = {k: v for k, v in record.items() if k in self.fields}
+        if self.max_body_chars is not None:
+            n = self.max_body_chars
+            record = {k: (v[:n] + ELLIPSIS if n else "") if k in TEXT_FIELDS and isinstance(v, str) and len(v) > n
+                      else v for k, v in record.items()}
+        return record
+
+    def apply(self, payload):
+        """응답 dict → 모양을 바꾼 새 dict (원본은 그대로)"""
+        if not self or not isinstance(payload, dict):
+            return payload
+        if not any(key in payload for key in RECORD_LISTS):
+            # 기사 한 건 응답(parse_article) — 응답 자체가 레코드, 성공 여부는 남긴다
+            shaped = self._record(payload)
+            return {"success": payload["success"], **shaped} if "success" in payload else shaped
+        shaped = dict(payload)
+        for key in RECORD_LISTS:
+            if isinstance(payload.get(key), list):
+                shaped[key] = [self._record(r) if isinstance(r, dict) else r for r in payload[key]]
+        return _fit(shaped, MAX_PAYLOAD_BYTES)
+
+
+def _fit(payload, budget):
+    """레코드 목록을 앞에서부터 JSON 바이트 예산 안에서만 남긴다 (메타데이터 크기 포함)"""
+    used = len(dumps({k: v for k, v in payload.items() if k not in RECORD_LISTS}))
+    for key in RECORD_LISTS:
+        records = payload.get(key)
+        if not isinstance(records, list):
+            continue
+        for i, record in enumerate(records):
+            used += len(dumps(record)) + 1
+            if used > budget:
+                payload[key] = records[:i]
+                payload["truncated"] = len(records) - i
+                if isinstance(payload.get("count"), int):
+                    payload["count"] = i
+                break
+    return payload
+
+
+def resolve_cursor(payload):
+    """payload["cursor"]가 DeltaCursor면 payload의 기사 목록(자른 뒤) 기준 문자열로 바꾼다 — 모양을 바꾼 다음에 부른다"""
+    if isinstance(payload, dict) and hasattr(payload.get("cursor"), "resolve"):
+        records = next((payload[key] for key in RECORD_LISTS if isinstance(payload.get(key), list)), [])
+        payload = {**payload, "cursor": payload["cursor"].resolve(records)}
+    return payload
+
+
+def article_cap(args, cap):
+    """
+    엔드포인트의 기사 건수 제한: 전체 모양이면 cap, ?fields=/?max_body_chars=로 줄인 응답이면 None
+    (그때는 ResponseShape.apply가 MAX_PAYLOAD_BYTES로 자른다). 형식이 틀린 값이면 cap (응답은 어차피 400).
+    """
+    try:
+        return None if response_shape(args) else cap
+    except ValueError:
+        return cap
+
+
+def response_shape(args):
+    """?fields=a,b&max_body_chars=N → ResponseShape. 형식이 틀리면 ValueError"""
+    fields = None
+    if args.get("fields"):
+        fields = {f.strip() for f in args["fields"].split(",") if f.strip()}
+        fields |= {FIELD_ALIASES[f] for f in fields if f in FIELD_ALIASES}
+    max_body_chars = None
+    if args.get("max_body_chars") not in (None, ""):
+        try:
+            max_body_chars = int(args["max_body_chars"])
+        except ValueError:
+            raise ValueError("max_body_chars는 0 이상의 정수여야 합니다.") from None
+        if max_body_chars < 0:
+            raise ValueError("max_body_chars는 0 이상의 정수여야 합니다.")
+    return ResponseShape(fields, max_body_chars)
+
+
+# ===============================
+# ⚡ 직렬화 + 압축
+# ===============================
+def _default(value):
+    return str(value)
+
+
+def dumps(payload, sort_keys=False):
+    """payload → UTF-8 JSON 바이트 (orjson, 모르는 타입은 str)"""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return orjson.dumps(payload, default=_default, option=option)
+
+
+def _accepted(accept_encoding):
+    """Accept-Encoding 헤더 → {인코딩: q}"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def negotiate(accept_encoding):
+    """Accept-Encoding → "br" | "gzip" | None (q가 같으면 br 우선)"""
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in ("br", "gzip"):
+        q = accepted.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def encode_body(body, accept_encoding):
+    """JSON 바이트 → (보낼 바이트, 추가 헤더 dict) — 작거나 클라이언트가 압축을 안 받으면 그대로"""
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = negotiate(accept_encoding) if len(body) >= MIN_COMPRESS_BYTES else None
+    if encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return body, headers
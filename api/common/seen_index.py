@@ -0,0 +1,263 @@
+# api/common/seen_index.py
+# 이미 처리한(본문까지 저장한) 기사 URL 색인 — 확장형 Bloom 필터(메모리) + SQLite articles(정확한 확인), 실행 간 유지
+#
+# - 폴링/백필이 같은 기사 URL을 계속 다시 받아 본문을 추출하던 것을, 본문 수집 전에 여기서 걸러
+#   저장된 본문을 그대로 쓴다 (enrich ?with_body=1, operations/backfill.py --urls).
+# - Bloom 필터가 "없음"이면 확실히 처음 보는 URL → DB 조회 없이 바로 수집.
+#   "있을 수 있음"이면 articles 테이블(body IS NOT NULL)에서 정확히 확인 → 거짓 양성은 여기서 걸러지고 통계에 남는다.
+# - 확장형(scalable) Bloom: 층마다 용량 2배, 오탐률은 절반씩 (전체 오탐률 ≤ SEEN_FP_RATE). URL당 약 3바이트 —
+#   URL 문자열 set(URL당 140바이트 이상)과 달리 기사 수가 늘어도 메모리가 작게 유지된다.
+#   해시: blake2b 128비트 → (h1, h2) 이중 해싱으로 k개 위치.
+# - 저장: SEEN_INDEX_PATH(.npz, 기본 ARTICLE_DB_PATH 옆)에 SAVE_EVERY건 추가마다/종료 시 원자적으로 쓴다.
+#   파일이 없으면 DB에서 다시 만들고, 있으면 마지막 동기화 이후 본문이 저장된 URL(last_seen 기준)만 더한다
+#   (다른 프로세스 — 예: 백필 — 가 저장한 본문도 따라잡음).
+# - ARTICLE_STORE=0 이거나 SEEN_INDEX=0 이면 쓰지 않는다 (항상 "처음 봄").
+import atexit
+import hashlib
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+from . import article_store
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+SEEN_INDEX_ENABLED = os.environ.get("SEEN_INDEX", "1") not in ("0", "false")
+SEEN_INDEX_PATH = os.environ.get("SEEN_INDEX_PATH") or f"{article_store.ARTICLE_DB_PATH}.seen.npz"
+SEEN_FP_RATE = float(os.environ.get("SEEN_FP_RATE", "0.01"))   # 전체 목표 오탐률
+INITIAL_CAPACITY = 10_000
+GROWTH = 2               # 다음 층 용량 배수
+TIGHTENING = 0.5         # 다음 층 오탐률 배수 (합이 목표를 넘지 않도록)
+SAVE_EVERY = 500         # 이만큼 추가되면 파일에 쓴다
+_LN2_SQ = math.log(2) ** 2
+
+
+def _hashes(keys):
+    """문자열 목록 → (h1, h2) uint64 배열"""
+    digests = b"".join(hashlib.blake2b(k.encode("utf-8"), digest_size=16).digest() for k in keys)
+    pairs = np.frombuffer(digests, dtype="<u8").reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1] | np.uint64(1)   # h2는 홀수로 (위치가 한 곳에 몰리지 않게)
+
+
+class _Layer:
+    def __init__(self, capacity, fp_rate, bits=None, count=0):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.m = max(64, int(math.ceil(-capacity * math.log(fp_rate) / _LN2_SQ)))
+        self.k = max(1, int(math.ceil(-math.log2(fp_rate))))
+        self.bits = bits if bits is not None else np.zeros((self.m + 7) // 8, dtype=np.uint8)
+        self.count = count
+
+    def _positions(self, h1, h2):
+        i = np.arange(self.k, dtype=np.uint64)
+        return (h1[:, None] + i[None, :] * h2[:, None]) % np.uint64(self.m)   # (n, k), uint64 덧셈은 2^64에서 돈다
+
+    def add(self, h1, h2):
+        pos = self._positions(h1, h2).ravel()
+        np.bitwise_or.at(self.bits, (pos >> np.uint64(3)).astype(np.intp),
+                         (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)))
+        self.count += len(h1)
+
+    def contains(self, h1, h2):
+        pos = self._positions(h1, h2)
+        hit = (self.bits[(pos >> np.uint64(3)).astype(np.intp)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1
+        return hit.all(axis=1)
+
+    def estimated_fp_rate(self):
+        return (1 - math.exp(-self.k * self.count / self.m)) ** self.k
+
+
+class ScalableBloomFilter:
+    """층을 늘려 가며 오탐률을 지키는 Bloom 필터 (Almeida et al. 2007). 스레드 안전."""
+
+    def __init__(self, fp_rate=SEEN_FP_RATE, initial_capacity=INITIAL_CAPACITY):
+        self.fp_rate = fp_rate
+        self.initial_capacity = initial_capacity
+        self.layers = []
+        self._lock = threading.Lock()
+
+    def _new_layer(self):
+        i = len(self.layers)
+        layer = _Layer(self.initial_capacity * GROWTH ** i, self.fp_rate * (1 - TIGHTENING) * TIGHTENING ** i)
+        self.layers.append(layer)
+        return layer
+
+    def contains_many(self, keys):
+        """키 목록 → bool 배열 (False면 확실히 없음)"""
+        if not keys:
+            return np.zeros(0, dtype=bool)
+        h1, h2 = _hashes(keys)
+        with self._lock:
+            found = np.zeros(len(keys), dtype=bool)
+            for layer in self.layers:
+                found |= layer.contains(h1, h2)
+            return found
+
+    def add_many(self, keys):
+        """없는 키만 더한다 → 새로 더한 수"""
+        if not keys:
+            return 0
+        keys = [k for k, present in zip(keys, self.contains_many(keys)) if not present]
+        if not keys:
+            return 0
+        h1, h2 = _hashes(keys)
+        with self._lock:
+            start = 0
+            while start < len(keys):
+                layer = self.layers[-1] if self.layers and self.layers[-1].count < self.layers[-1].capacity \
+                    else self._new_layer()
+                end = start + min(len(keys) - start, layer.capacity - layer.count)
+                layer.add(h1[start:end], h2[start:end])
+                start = end
+        return len(keys)
+
+    def stats(self):
+        with self._lock:
+            miss = 1.0
+            for layer in self.layers:
+                miss *= 1 - layer.estimated_fp_rate()
+            return {"items": sum(l.count for l in self.layers), "layers": len(self.layers),
+                    "capacity": sum(l.capacity for l in self.layers),
+                    "memory_bytes": int(sum(l.bits.nbytes for l in self.layers)),
+                    "estimated_fp_rate": round(1 - miss, 6), "target_fp_rate": self.fp_rate}
+
+    # ---- 저장/불러오기 ----
+    def save(self, path, meta=None):
+        with self._lock:
+            arrays = {f"layer{i}": l.bits for i, l in enumerate(self.layers)}
+            header = {"fp_rate": self.fp_rate, "initial_capacity": self.initial_capacity,
+                      "counts": [l.count for l in self.layers], **(meta or {})}
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, header=np.frombuffer(json.dumps(header).encode(), dtype=np.uint8), **arrays)
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """→ (필터, 헤더 dict)"""
+        with np.load(path) as data:
+            header = json.loads(data["header"].tobytes())
+            bloom = cls(header["fp_rate"], header["initial_capacity"])
+            for i, count in enumerate(header["counts"]):
+                layer = bloom._new_layer()
+                layer.bits, layer.count = data[f"layer{i}"].copy(), count
+        return bloom, header
+
+
+# ===============================
+# 🗂️ 프로세스 공용 색인 (Bloom + articles 테이블 확인)
+# ===============================
+_state_lock = threading.Lock()
+_bloom = None
+_synced_at = None
+_unsaved = 0
+_counts = {"checks": 0, "bloom_positive": 0, "confirmed": 0, "false_positive": 0}
+
+
+def enabled():
+    return SEEN_INDEX_ENABLED and article_store.ARTICLE_STORE_ENABLED
+
+
+def _processed_urls(since=None):
+    """본문이 저장된 URL (since: last_seen 이후만)"""
+    sql, params = "SELECT url FROM articles WHERE body IS NOT NULL", []
+    if since:
+        sql += " AND last_seen >= ?"
+        params.append(since)
+    return [row[0] for row in article_store._reader().execute(sql, params)]
+
+
+def _index():
+    """색인을 불러오거나 DB에서 만든다 (처음 한 번), 이후엔 그대로"""
+    global _bloom, _synced_at
+    with _state_lock:
+        if _bloom is not None:
+            return _bloom
+        synced_at = article_store._now()
+        bloom, since = None, None
+        if os.path.exists(SEEN_INDEX_PATH):
+            try:
+                bloom, header = ScalableBloomFilter.load(SEEN_INDEX_PATH)
+                since = header.get("synced_at")
+            except Exception as e:
+                print(f"⚠️ seen 색인 파일을 읽지 못해 다시 만듭니다: {e}")
+                bloom = None
+        if bloom is None:
+            bloom, since = ScalableBloomFilter(), None
+        bloom.add_many(_processed_urls(since))
+        _bloom, _synced_at = bloom, synced_at
+        return bloom
+
+
+def mark_seen(urls):
+    """본문까지 저장한 URL을 색인에 더한다 (article_store.save_articles가 body와 함께 부른다)"""
+    global _unsaved
+    if not enabled() or not urls:
+        return
+    added = _index().add_many(list(urls))
+    with _state_lock:
+        _unsaved += added
+        due = _unsaved >= SAVE_EVERY
+    if due:
+        save()
+
+
+def known_bodies(urls):
+    """
+    URL 목록 → {이미 처리한 URL: 저장된 본문}. Bloom이 없다고 하면 DB를 보지 않는다.
+    Bloom 양성 중 DB에 본문이 없는 것은 거짓 양성으로 센다.
+    """
+    urls = [u for u in dict.fromkeys(urls) if u]
+    if not enabled() or not urls:
+        return {}
+    maybe = [u for u, hit in zip(urls, _index().contains_many(urls)) if hit]
+    found = {}
+    if maybe:
+        article_store.flush()  # 큐에 있는 본문까지 확인되도록
+        conn = article_store._reader()
+        for i in range(0, len(maybe), 500):
+            chunk = maybe[i:i + 500]
+            found.update(conn.execute(
+                "SELECT url, body FROM articles WHERE body IS NOT NULL AND url IN (%s)" % ",".join("?" * len(chunk)),
+                chunk).fetchall())
+    with _state_lock:
+        _counts["checks"] += len(urls)
+        _counts["bloom_positive"] += len(maybe)
+        _counts["confirmed"] += len(found)
+        _counts["false_positive"] += len(maybe) - len(found)
+    return found
+
+
+def save():
+    """색인을 파일에 쓴다 (바뀐 게 없으면 그냥 둠). 실패하면 쌓인 건수를 그대로 두어 다음에 다시 시도한다."""
+    global _unsaved
+    with _state_lock:
+        bloom, synced_at, dirty = _bloom, _synced_at, _unsaved
+    if bloom is None or not dirty:
+        return
+    try:
+        bloom.save(SEEN_INDEX_PATH, {"synced_at": synced_at})
+    except OSError as e:
+        print(f"⚠️ seen 색인 저장 실패: {e}")
+        return
+    with _state_lock:
+        _unsaved -= dirty  # 저장하는 동안 더해진 건수는 남긴다
+
+
+atexit.register(save)
+
+
+def seen_stats():
+    """응답/벤치마크용: 필터 크기·메모리·추정 오탐률 + 이 프로세스의 조회 통계(관측 오탐률)"""
+    if not enabled():
+        return {"enabled": False}
+    stats = _index().stats()
+    with _state_lock:
+        counts = dict(_counts)
+    negatives = counts["checks"] - counts["confirmed"]   # 실제로는 처리한 적 없는 URL 조회 수
+    counts["observed_fp_rate"] = round(counts["false_positive"] / negatives, 6) if negatives else 0.0
+    return {"enabled": True, **stats, **counts}
@@ -0,0 +1,113 @@
+# api/common/stream_parse.py
+# 응답 본문을 받는 동안 파싱하기 (fetch(..., stream=True) + lxml 증분 파서)
+#
+# resp.text를 기다렸다가 파싱하면 페이지마다 네트워크 시간 + 파싱 시간이 그대로 더해진다.
+# 여기서는 받은 조각(chunk)을 바로 lxml 파서에 넣는다.
+#   - iter_elements : 목록 항목 같은 요소가 닫히는 즉시 넘겨준다 (구글 검색처럼 첫 일치에서 멈추면 나머지는 받지도 않음)
+#   - read_document : 기사 본문처럼 문서 전체가 필요한 경우, 받는 동안 트리를 만들어 두고 끝나면 바로 넘겨준다
+# 인코딩은 첫 조각으로 판별한다 (common/charset: 헤더 → BOM → <meta charset>).
+# utf-8 등은 파서에 바이트를 그대로 넣고, cp949 등은 조각마다 증분 디코딩한 str을 넣는다 (libxml2 iconv보다 빠름).
+import codecs
+import itertools
+import time
+
+import lxml.html
+from lxml import etree
+
+from .charset import NATIVE_ENCODINGS, SNIFF_BYTES, sniff_encoding
+
+# ===============================
+# 🔧 기본 설정
+# ===============================
+CHUNK_SIZE = SNIFF_BYTES    # 첫 조각 = 문자셋 판별 구간
+
+
+def _open(resp, chunk_size, encoding=None):
+    """
+    (파서 인코딩, 본문 조각 이터레이터) — 첫 조각을 미리 읽어 인코딩을 정한 뒤 다시 앞에 붙인다.
+    NATIVE_ENCODINGS가 아니면 조각을 str로 증분 디코딩해서 돌려주고 파서 인코딩은 None.
+    """
+    chunks = resp.iter_content(chunk_size)
+    first = next(chunks, b"")
+    encoding = encoding or sniff_encoding(resp.headers.get("Content-Type"), first)
+    chunks = itertools.chain([first], chunks)
+    if encoding in NATIVE_ENCODINGS:
+        return encoding, chunks
+    return None, _decode(chunks, encoding)
+
+
+def _decode(chunks, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_elements(resp, match, encoding=None, chunk_size=CHUNK_SIZE, stats=None):
+    """
+    스트리밍 응답을 HTMLPullParser에 흘려 넣으면서 match(el)이 참인 요소가 닫히는 즉시 yield 한다.
+    넘겨준 요소는 다음 항목으로 넘어갈 때 비운다 (필요한 값은 yield 받은 자리에서 꺼낼 것).
+    stats dict를 넘기면 items(일치 요소 수), first_item_ms(첫 항목까지), bytes(읽은 양)를 채운다.
+    끝까지 읽거나 호출 측이 멈추면 응답을 닫는다.
+    """
+    stats = {} if stats is None else stats
+    stats.setdefault("items", 0)
+    started = time.perf_counter()
+    try:
+        encoding, chunks = _open(resp, chunk_size, encoding)
+        parser = etree.HTMLPullParser(events=("end",), encoding=encoding)
+        for chunk in _feed(chunks, parser, stats):
+            for _, el in parser.read_events():
+                if match(el):
+                    stats["items"] += 1
+                    if "first_item_ms" not in stats:
+                        stats["first_item_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                    yield el
+                    el.clear(keep_tail=True)
+    finally:
+        resp.close()
+
+
+def _feed(chunks, parser, stats):
+    # 조각을 파서에 넣고 돌려준다 — 마지막에 close()로 남은 이벤트까지 내보낸다
+    stats["bytes"] = 0
+    for chunk in chunks:
+        stats["bytes"] += len(chunk)   # str 조각이면 글자 수
+        parser.feed(chunk)
+        yield chunk
+    parser.close()
+    yield b""
+
+
+def element_html(el):
+    """스트리밍으로 받은 요소 → HTML 조각 (기존 BeautifulSoup 항목 파서에 넘길 때)"""
+    return etree.tostring(el, encoding="unicode", method="html", with_tail=False)
+
+
+def element_text(el):
+    """BeautifulSoup get_text(strip=True)와 같은 규칙의 텍스트"""
+    return "".join(s.strip() for s in el.itertext())
+
+
+def has_class(el, name):
+    return name in (el.get("class") or "").split()
+
+
+def read_document(resp, encoding=None, chunk_size=CHUNK_SIZE):
+    """
+    스트리밍 응답 → (lxml.html 문서, 본문 문자열). 받는 동안 트리를 만들어 두므로
+    마지막 조각이 도착하면 바로 XPath 등을 쓸 수 있다. 문자열은 readability 등 문서 전체가 필요한 곳용.
+    """
+    received = []
+    try:
+        encoding, chunks = _open(resp, chunk_size, encoding)
+        parser = lxml.html.HTMLParser(encoding=encoding)
+        for chunk in chunks:
+            received.append(chunk)
+            parser.feed(chunk)
+        doc = parser.close()
+    finally:
+        resp.close()
+    if encoding is None:
+        return doc, "".join(received)
+    return doc, b"".join(received).decode(encoding, errors="replace")
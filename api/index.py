@@ -1,15 +1,32 @@
-from flask import Flask, Response, jsonify
+import os
+import sys
+from flask import Flask, Response, jsonify, request
 import requests
 from bs4 import BeautifulSoup
 import csv
 from datetime import datetime, timedelta
 import io
-import time
 import re
 from pytz import timezone
 
-
-app = Flask(__name__)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # api/common 임포트용
+from common.article_store import new_since, parse_cursor, save_articles
+from common.categories import crawl_categories, merge_categories, parse_categories
+from common.clustering import cluster_from_args
+from common.export import wants_xlsx, xlsx_response
+from common.feeds import KST, discover, discovery_mode, end_discovery, start_discovery
+from common.fetch_policy import MAX_FAILED_PAGES_IN_ROW, note, end_fetch_stats, start_fetch_stats
+from common.http import fetch
+from common.postprocess import process, split_before
+from common.keywords import UnknownKeywordSet, keyword_filter_from_args
+from common.profiling import install_profiling
+from common.response_cache import cached_json
+from common.stream_parse import element_html, has_class, iter_elements
+
+
+app = install_profiling(Flask(__name__))
+app.teardown_request(end_fetch_stats)  # 요청별 fetch 통계/헤지 설정이 재사용된 워커 스레드에 남지 않도록
+app.teardown_request(end_discovery)
 
 BASE_URL = "https://signalm.sedaily.com/Main/Content/SubMain"
 HEADERS = {
@@ -18,84 +35,178 @@ HEADERS = {
     "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8"
 }
 CUTOFF_TIME = datetime.now() - timedelta(hours=24)
+DEFAULT_NCLASS = "GX11"
 
 fieldnames = ["title", "link", "summary", "published_at"]
+XLSX_COLUMNS = [("URL", "link"), ("Title", "title"), ("Summary", "summary"), ("Published", "published_at"),
+                ("Categories", "categories"), ("Cluster", "cluster")]
 
  
 
 # === 기존 함수들 그대로 사용 ===
-def parse_time_text(time_str):
-    return datetime.strptime(time_str.strip(), "%Y-%m-%d %H:%M")
-
-def get_page_articles(page):
-    params = {"NClass": "GX11", "Page": page, "Kind": "Time"}
+def get_page_articles(page, nclass=DEFAULT_NCLASS):
+    """페이지 기사 목록, 요청 자체가 실패하면 None (빈 페이지 [] 와 구분)"""
+    params = {"NClass": nclass, "Page": page, "Kind": "Time"}
     try:
-        resp = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=10)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        # 본문을 받는 동안 기사 블록이 닫히는 대로 파싱 (common/stream_parse)
+        resp = fetch(BASE_URL, params=params, headers=HEADERS, timeout=10, stream=True)
+        items = iter_elements(resp, lambda el: el.tag == "div" and has_class(el, "contPadding"))
+        articles = [_parse_item(BeautifulSoup(element_html(el), 'html.parser').div) for el in items]
     except Exception as e:
         print(f"페이지 {page} 요청 실패: {e}")
-        return []
+        return None
+    return [a for a in articles if a]
 
+
+def parse_page_articles(html):
+    """목록 페이지 HTML → 기사 dict 목록 (동기/비동기 크롤러가 함께 쓴다)"""
+    soup = BeautifulSoup(html, 'html.parser')
     news_list = soup.select("div.contPadding")
     if not news_list:
         return []
 
     articles = []
     for item in news_list:
-        try:
-            a_tag = item.select_one("a")
-            if not a_tag:
-                continue
-            title_tag = a_tag.select_one("strong")
-            title = title_tag.get_text(strip=True) if title_tag else None
-            link = "https://signalm.sedaily.com" + a_tag['href'] if a_tag['href'].startswith('/') else a_tag['href']
-            time_tag = item.select_one("span.time")
-            if not time_tag:
-                continue
-            published_at = parse_time_text(time_tag.get_text())
-            summary_tag = item.select_one("span.mmsn_con")
-            summary = summary_tag.get_text(strip=True) if summary_tag else ""
-            articles.append({
-                "title": title,
-                "link": link,
-                "summary": summary,
-                "published_at": published_at.strftime("%Y-%m-%d %H:%M")
-            })
-        except Exception as e:
-            print(f"기사 파싱 오류: {e}")
-            continue
+        article = _parse_item(item)
+        if article:
+            articles.append(article)
     return articles
 
 
-# === Flask 엔드포인트 ===
-@app.route("/api/thesignal", methods=["GET"])
-def thesignal():
-    """24시간 내 뉴스 스크래핑 후 CSV로 반환"""
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
+def _parse_item(item):
+    """
+    기사 블록(div.contPadding) 하나 → 기사 dict, 형식이 다르면 None.
+    published_at은 페이지의 "YYYY-MM-DD HH:MM" 그대로 — 날짜 검사/비교는 목록 단위로 (common/postprocess)
+    """
+    try:
+        a_tag = item.select_one("a")
+        if not a_tag:
+            return None
+        title_tag = a_tag.select_one("strong")
+        title = title_tag.get_text(strip=True) if title_tag else None
+        link = "https://signalm.sedaily.com" + a_tag['href'] if a_tag['href'].startswith('/') else a_tag['href']
+        time_tag = item.select_one("span.time")
+        if not time_tag:
+            return None
+        published_at = time_tag.get_text(strip=True)
+        summary_tag = item.select_one("span.mmsn_con")
+        summary = summary_tag.get_text(strip=True) if summary_tag else ""
+        return {
+            "title": title,
+            "link": link,
+            "summary": summary,
+            "published_at": published_at
+        }
+    except Exception as e:
+        print(f"기사 파싱 오류: {e}")
+        return None
+
+
+def feed_article(item):
+    """피드 항목(common/feeds) → _parse_item과 같은 기사 dict, CUTOFF_TIME 이전이면 None"""
+    published_at = item.published.replace(tzinfo=None)
+    if published_at < CUTOFF_TIME:
+        return None
+    link = "https://signalm.sedaily.com" + item.link if item.link.startswith('/') else item.link
+    return {
+        "title": item.title,
+        "link": link,
+        "summary": item.summary,
+        "published_at": published_at.strftime("%Y-%m-%d %H:%M")
+    }
+
+
+def get_recent_articles(max_pages=10, nclass=DEFAULT_NCLASS):
+    """CUTOFF_TIME(24시간) 이후 기사 — 피드(설정 또는 자동 탐색)가 있으면 피드로, 없거나 못 쓰면 목록 HTML (common/feeds)"""
+    return discover("thesignal", KST.localize(CUTOFF_TIME), feed_article,
+                    lambda: crawl_listing_pages(max_pages, nclass), category=nclass, headers=HEADERS)
+
 
+def crawl_listing_pages(max_pages=10, nclass=DEFAULT_NCLASS):
+    """CUTOFF_TIME(24시간) 이후 기사를 최신순으로 수집 — 오래된 기사가 나오면 중단"""
     all_articles = []
     page = 1
-    max_pages = 10
+    failures_in_row = 0
 
     while page <= max_pages:
-        articles = get_page_articles(page)
+        articles = get_page_articles(page, nclass)
+        if articles is None:
+            # 실패한 페이지는 건너뛰고 다음 페이지로 (연속 실패면 중단)
+            note("failed_pages")
+            failures_in_row += 1
+            if failures_in_row >= MAX_FAILED_PAGES_IN_ROW:
+                break
+            page += 1
+            continue
+        failures_in_row = 0
         if not articles:
             break
 
-        for art in articles:
-            pub_dt = datetime.strptime(art["published_at"], "%Y-%m-%d %H:%M")
-            if pub_dt >= CUTOFF_TIME:
-                writer.writerow(art)
-                all_articles.append(art)
-            else:
-                # 오래된 기사면 종료
-                page = max_pages + 1
-                break
-        page += 1
-        time.sleep(0.8)
+        recent, reached_old = split_recent(articles)
+        all_articles.extend(recent)
+        if reached_old:
+            break
+        page += 1  # 요청 간격은 common.ratelimit이 호스트별로 조절
+
+    return all_articles
+
+
+def get_thesignal_articles(nclasses=(DEFAULT_NCLASS,), max_pages=10):
+    """여러 NClass를 동시에 수집 → 링크 기준 중복 제거, 최신순 (categories: 속한 NClass 전부)"""
+    results = crawl_categories(lambda nclass: get_recent_articles(max_pages, nclass), list(nclasses))
+    return merge_sorted(results)
+
+
+def merge_sorted(results):
+    """{NClass: 기사 목록} → 중복 제거 후 published_at 최신순 (같은 시각은 카테고리 순서 유지)"""
+    return process(merge_categories(results, "link"), time_key="published_at", sort="desc")
+
+
+def split_recent(articles):
+    """최신순 목록에서 CUTOFF_TIME 이후 기사만 → (기사 목록, 오래된 기사를 만났는지). 날짜 형식이 틀린 기사는 빠진다"""
+    return split_before(articles, "published_at", CUTOFF_TIME)
+
+
+# === Flask 엔드포인트 ===
+@app.route("/api/thesignal", methods=["GET"])
+def thesignal():
+    """24시간 내 뉴스 스크래핑 후 CSV로 반환
+    ?categories=<NClass,...> 이면 여러 분류를 동시에 수집, 겹치는 기사는 하나로 합치고 categories에 모두 표시 (기본 GX11)
+    ?keywords=<세트이름>[&min_score=] 이면 제목+요약 키워드 점수를 붙이고 필터
+    ?hedge=1 이면 느린 요청에 헤지 요청을 추가 (fetch: 요청/재시도/헤지/실패 페이지 수)
+    ?format=xlsx 이면 하이퍼링크 셀이 있는 엑셀 파일로 반환
+    ?since=<cursor> 이면 그 커서 이후 처음 수집된 기사만 반환 (응답의 cursor를 다음 폴링 때 since로 — 잘려서 못 나간 기사는 다음 폴링에, 다른 저장소의 커서면 전부)
+    ?cluster=1[&cluster_threshold=0.65] 이면 같은 딜 기사끼리 cluster 번호 + clusters(대표 제목)
+    피드(설정 또는 자동 탐색한 RSS/Atom/사이트맵) 우선, 없거나 오래됐으면 목록 HTML (discovery: 어느 쪽을 썼는지/바이트/CPU, ?discovery=html 이면 HTML만)
+    결과 집합 ETag + Cache-Control(s-maxage), If-None-Match가 맞으면 304 (common/response_cache)
+    ?fields=title,url 이면 기사마다 그 필드만, ?max_body_chars=N 이면 요약/본문을 N자까지 (gzip/br 압축, common/response_format)
+    """
+    try:
+        keyword_filter = keyword_filter_from_args(request.args)
+    except UnknownKeywordSet as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        since = parse_cursor(request.args.get("since"))
+    except ValueError:
+        return jsonify({"error": "since 커서 형식이 올바르지 않습니다."}), 400
+    try:
+        nclasses = parse_categories(request.args.get("categories"), DEFAULT_NCLASS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        cluster = cluster_from_args(request.args)
+        mode = discovery_mode(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction="ignore")  # categories 열은 CSV에서 뺌
+    writer.writeheader()
+
+    fetch_stats = start_fetch_stats(hedge=request.args.get("hedge") in ("1", "true"))
+    discovery = start_discovery(mode)
+    all_articles = get_thesignal_articles(nclasses)
+    writer.writerows(all_articles)
 
     """csv_bytes = output.getvalue().encode("cp949")
     output.close()
@@ -109,12 +220,28 @@ def thesignal():
         }
     )"""
 
-    # ✅ CSV 대신 JSON 반환
-    return jsonify({
+    save_articles("thesignal", all_articles, url="link", published_at="published_at")
+
+    if keyword_filter:
+        all_articles = keyword_filter(all_articles, ["title", "summary"])
+    all_articles, cursor = new_since("thesignal", all_articles, since, url="link")
+    cluster_info = cluster(all_articles, ["title", "summary"], url_key="link") if cluster else {}
+
+    if wants_xlsx(request.args):
+        return xlsx_response(all_articles, XLSX_COLUMNS, link=("link", "title"), name="thesignal")
+
+    # ✅ CSV 대신 JSON 반환 (ETag/Cache-Control → 같은 결과면 304, CDN이 반복 요청 흡수)
+    return cached_json({
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "categories": nclasses,
         "count": len(all_articles),
-        "articles": all_articles
-    })
+        "articles": all_articles,
+        "cursor": cursor,
+        "since": request.args.get("since"),
+        **cluster_info,
+        "discovery": discovery.as_dict(),
+        "fetch": fetch_stats.as_dict()
+    }, "thesignal")
 
 """// 기존: res.setHeader("Content-Type", "text/csv");
 // 수정: res.setHeader("Content-Type", "application/json");
@@ -1,12 +1,31 @@
-from flask import Flask, jsonify
+import os
+import sys
+from flask import Flask, jsonify, request
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from urllib.parse import urljoin
-import time
 from pytz import timezone
 
-app = Flask(__name__)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # api/common 임포트용
+from common.article_store import new_since, parse_cursor, save_articles
+from common.clustering import cluster_from_args
+from common.enrich import DEFAULT_CONCURRENCY, enrich_with_body
+from common.export import wants_xlsx, xlsx_response
+from common.feeds import KST, discover, discovery_mode, end_discovery, start_discovery
+from common.fetch_policy import MAX_FAILED_PAGES_IN_ROW, note, end_fetch_stats, start_fetch_stats
+from common.http import fetch
+from common.keywords import UnknownKeywordSet, keyword_filter_from_args
+from common.profiling import install_profiling
+from common.response_cache import cached_json
+from common.response_format import article_cap
+from common.stream_parse import element_html, iter_elements
+
+app = install_profiling(Flask(__name__))
+app.teardown_request(end_fetch_stats)  # 요청별 fetch 통계/헤지 설정이 재사용된 워커 스레드에 남지 않도록
+app.teardown_request(end_discovery)
+
+XLSX_COLUMNS = [("URL", "url"), ("Title", "title"), ("Body", "body"), ("Date", "date"), ("Cluster", "cluster")]
 # -----------------------------
 # 🔹 유료 기사 여부 확인 함수
 # -----------------------------
@@ -33,13 +52,115 @@ app = Flask(__name__)
 # -----------------------------
 # 🔹 뉴스 크롤링 함수
 # -----------------------------
+def parse_news_page(html, today_str):
+    """
+    목록 페이지 HTML → 오늘 기사 [(제목, 요약, URL, 날짜), ...]
+    기사 목록(li)이 아예 없으면 None (마지막 페이지). 동기/비동기 크롤러가 함께 쓴다.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    article_items = soup.find_all('li', recursive=True)
+    if not article_items:
+        return None
+
+    rows = []
+    for li in article_items:
+        row = _parse_item(li, today_str)
+        if row:
+            rows.append(row)
+    return rows
+
+
+def iter_news_stream(resp, today_str, stats=None):
+    """
+    parse_news_page의 스트리밍 버전: fetch(..., stream=True) 응답을 받는 동안 항목(li)이 닫히는 즉시
+    (제목, 요약, URL, 날짜)를 넘긴다. stats["items"]가 0이면 기사 목록이 없는 페이지.
+    """
+    for el in iter_elements(resp, lambda el: el.tag == 'li', stats=stats):
+        if el.find('.//dl') is None:
+            continue
+        row = _parse_item(BeautifulSoup(element_html(el), 'html.parser').li, today_str)
+        if row:
+            yield row
+
+
+def _parse_item(li, today_str):
+    """목록 항목(li) 하나 → (제목, 요약, URL, 날짜), 오늘 기사가 아니거나 형식이 다르면 None"""
+    dl = li.find('dl')
+    if not dl:
+        return None
+
+    # 날짜
+    date_span = dl.find('span', class_='date')
+    if not date_span:
+        return None
+    date_text = date_span.get_text(strip=True)
+    if not date_text.startswith(today_str):
+        return None
+
+    # 제목
+    dt_tag = dl.find('dt')
+    if not dt_tag:
+        return None
+    title = dt_tag.get_text(strip=True)
+
+    # 요약
+    dd_tag = dl.find('dd')
+    body = (
+        dd_tag.get_text(strip=True)
+        .replace('\n', ' ')
+        .replace('\r', ' ')
+        .replace('\t', ' ')
+        if dd_tag else ''
+    )
+
+    # 링크
+    a_tag = dl.find('a')
+    href = a_tag.get('href') if a_tag else ''
+    full_url = urljoin("https://www.thebell.co.kr/free/content/", href) if href else ''
+    """if not full_url: # 유료 확인 시 추가 
+        continue
+
+    # 유료 여부 확인
+    if is_free_article(full_url, headers):
+        titles.append(title)
+        bodies.append(body)
+        urls.append(full_url)
+        dates.append(date_text)
+        page_has_today = True
+    else:
+        print(f"유료 기사 제외: {title}")"""
+
+    return title, body, full_url, date_text
+
+
+def feed_row(item, today_str):
+    """피드 항목(common/feeds) → _parse_item과 같은 (제목, 요약, URL, 날짜), 오늘 기사가 아니면 None"""
+    date_text = item.published.strftime('%Y-%m-%d %H:%M:%S')
+    if not date_text.startswith(today_str):
+        return None
+    body = item.summary.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
+    full_url = urljoin("https://www.thebell.co.kr/free/content/", item.link) if item.link else ''
+    return item.title, body, full_url, date_text
+
+
 def get_todays_news():
-    today_str = datetime.now(timezone('Asia/Seoul')).strftime('%Y-%m-%d')
+    """오늘 기사 → (titles, bodies, urls, dates). 피드(설정 또는 자동 탐색)가 있으면 피드로, 없거나 못 쓰면 목록 HTML (common/feeds)"""
+    now = datetime.now(KST)
+    today_str = now.strftime('%Y-%m-%d')
+    midnight = KST.localize(datetime.combine(now.date(), datetime.min.time()))
+    rows = discover("thebell", midnight, lambda item: feed_row(item, today_str),
+                    lambda: list(zip(*crawl_listing_pages(today_str))))
+    return tuple(map(list, zip(*rows))) if rows else ([], [], [], [])
+
+
+def crawl_listing_pages(today_str):
+    """목록 HTML을 페이지 순서대로 돌며 오늘 기사 → (titles, bodies, urls, dates)"""
     # today_str = datetime.now().strftime('%Y-%m-%d')
     titles, bodies, urls, dates = [], [], [], []
 
     page = 1
     max_pages = 50
+    failures_in_row = 0
     headers = {
         'User-Agent': (
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
@@ -52,80 +173,36 @@ def get_todays_news():
     while page <= max_pages:
         url = f"https://www.thebell.co.kr/free/content/article.asp?page={page}&svccode=00"
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
-
-            article_items = soup.find_all('li', recursive=True)
-            if not article_items:
-                print(f"⏹️  {page}페이지: 기사 없음 → 종료")
-                break
-
+            # 본문을 받는 동안 항목이 닫히는 대로 파싱 (common/stream_parse)
+            resp = fetch(url, headers=headers, timeout=10, stream=True)
+            page_stats = {}
             page_has_today = False
-            for li in article_items:
-                dl = li.find('dl')
-                if not dl:
-                    continue
-
-                # 날짜
-                date_span = dl.find('span', class_='date')
-                if not date_span:
-                    continue
-                date_text = date_span.get_text(strip=True)
-                if not date_text.startswith(today_str):
-                    continue
-
-                # 제목
-                dt_tag = dl.find('dt')
-                if not dt_tag:
-                    continue
-                title = dt_tag.get_text(strip=True)
-
-                # 요약
-                dd_tag = dl.find('dd')
-                body = (
-                    dd_tag.get_text(strip=True)
-                    .replace('\n', ' ')
-                    .replace('\r', ' ')
-                    .replace('\t', ' ')
-                    if dd_tag else ''
-                )
-
-                # 링크
-                a_tag = dl.find('a')
-                href = a_tag.get('href') if a_tag else ''
-                full_url = urljoin("https://www.thebell.co.kr/free/content/", href) if href else ''
-                """if not full_url: # 유료 확인 시 추가 
-                    continue
-
-                # 유료 여부 확인
-                if is_free_article(full_url, headers):
-                    titles.append(title)
-                    bodies.append(body)
-                    urls.append(full_url)
-                    dates.append(date_text)
-                    page_has_today = True
-                else:
-                    print(f"유료 기사 제외: {title}")"""
-
+            for title, body, full_url, date_text in iter_news_stream(resp, today_str, page_stats):
                 titles.append(title)
                 bodies.append(body)
                 urls.append(full_url)
                 dates.append(date_text)
-
                 page_has_today = True
+            if not page_stats["items"]:
+                print(f"⏹️  {page}페이지: 기사 없음 → 종료")
+                break
 
             if not page_has_today and page > 1:
                 print(f"⏹️  {page}페이지 이후 오늘 기사 없음 → 종료")
                 break
 
-            page += 1
-            # ime.sleep(0.6)
-            time.sleep(1.2)  # 요청 간격 증가 (서버 부하 방지)
+            page += 1  # 요청 간격은 common.ratelimit이 호스트별로 조절 (서버 부하 방지)
+            failures_in_row = 0
 
         except Exception as e:
+            # 한 페이지 실패로 전체 수집을 멈추지 않고 다음 페이지로 (연속 실패면 중단)
             print(f"❌ {page}페이지 오류: {e}")
-            break
+            note("failed_pages")
+            failures_in_row += 1
+            if failures_in_row >= MAX_FAILED_PAGES_IN_ROW:
+                print(f"⏹️  {failures_in_row}페이지 연속 실패 → 종료")
+                break
+            page += 1
 
     return titles, bodies, urls, dates
 
@@ -136,24 +213,71 @@ def get_todays_news():
 @app.route("/api/thebell", methods=["GET"])
 def crawl_thebell():
     """
-    GET /api/thebell
+    GET /api/thebell[?with_body=1]
     → JSON 형식으로 오늘 뉴스 데이터 반환
+    → with_body=1 이면 기사 본문(content)까지 병렬로 수집해 함께 반환
+    → keywords=<세트이름>[&min_score=] 이면 제목+요약 키워드 점수를 붙이고 필터
+    → hedge=1 이면 느린 요청에 헤지 요청을 추가 (fetch: 요청/재시도/헤지/실패 페이지 수)
+    → format=xlsx 이면 하이퍼링크 셀이 있는 엑셀 파일로 반환 (100건 제한 없음)
+    → since=<cursor> 이면 그 커서 이후 처음 수집된 기사만 반환 (응답의 cursor를 다음 폴링 때 since로 — 잘려서 못 나간 기사는 다음 폴링에, 다른 저장소의 커서면 전부)
+    → cluster=1[&cluster_threshold=0.65] 이면 같은 딜 기사끼리 cluster 번호 + clusters(대표 제목) (100건 자르기 전 전체 기준)
+    → 피드(설정 또는 자동 탐색한 RSS/Atom/사이트맵) 우선, 없거나 오래됐으면 목록 HTML (discovery: 어느 쪽을 썼는지/바이트/CPU, discovery=html 이면 HTML만)
+    → 결과 집합 ETag + Cache-Control(s-maxage), If-None-Match가 맞으면 304 (common/response_cache)
+    → fields=title,url 이면 기사마다 그 필드만, max_body_chars=N 이면 요약/본문을 N자까지 (gzip/br 압축, common/response_format)
+      이때는 100건 제한 대신 JSON 바이트 예산(MAX_PAYLOAD_BYTES, 기본 100KB)까지 담고, 넘친 건수는 truncated
     """
-    titles, bodies, urls, dates = get_todays_news()
-
-    # Requests too large 오류 -> 기사 수 100개로 제한 
-    titles, bodies, urls, dates = titles[:100], bodies[:100], urls[:100], dates[:100]
+    try:
+        keyword_filter = keyword_filter_from_args(request.args)
+    except UnknownKeywordSet as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        since = parse_cursor(request.args.get("since"))
+    except ValueError:
+        return jsonify({"error": "since 커서 형식이 올바르지 않습니다."}), 400
+    try:
+        cluster = cluster_from_args(request.args)
+        mode = discovery_mode(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    fetch_stats = start_fetch_stats(hedge=request.args.get("hedge") in ("1", "true"))
+    discovery = start_discovery(mode)
+    titles, bodies, urls, dates = get_todays_news()
 
     articles = [
         {"title": t, "body": b, "url": u, "date": d}
         for t, b, u, d in zip(titles, bodies, urls, dates)
     ]
 
-    return jsonify({
+    save_articles("thebell", articles, summary="body", published_at="date")
+
+    if keyword_filter:
+        articles = keyword_filter(articles, ["title", "body"])
+    articles, cursor = new_since("thebell", articles, since)
+    cluster_info = cluster(articles, ["title", "body"]) if cluster else {}
+
+    if wants_xlsx(request.args):
+        return xlsx_response(articles, XLSX_COLUMNS, link=("url", "title"), name="thebell")
+
+    # Requests too large 오류 -> 전체 모양이면 기사 수 100개로 제한 (키워드 필터 후 자름)
+    # fields=/max_body_chars=로 줄인 응답은 건수 대신 바이트 예산으로 자른다 (common/response_format)
+    articles = articles[:article_cap(request.args, 100)]
+
+    payload = {
         "date": datetime.now(timezone('Asia/Seoul')).strftime("%Y-%m-%d"),
         "count": len(articles),
-        "articles": articles
-    })
+        "articles": articles,
+        "cursor": cursor,
+        "since": request.args.get("since"),
+        **cluster_info
+    }
+    if request.args.get("with_body") in ("1", "true"):
+        concurrency = request.args.get("concurrency", DEFAULT_CONCURRENCY, type=int)
+        payload["enrichment"] = enrich_with_body(articles, url_key="url", concurrency=concurrency)
+        save_articles("thebell", articles, summary="body", body="content", published_at="date")
+    payload["discovery"] = discovery.as_dict()
+    payload["fetch"] = fetch_stats.as_dict()
+
+    return cached_json(payload, "thebell")
 
  
\ No newline at end of file
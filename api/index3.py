@@ -1,14 +1,29 @@
-from flask import Flask, jsonify
+import contextvars
+import os
+import sqlite3
+import sys
+from flask import Flask, jsonify, request
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import pandas as pd
-import re
-import time
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pytz import timezone
 
-app = Flask(__name__)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # api/common 임포트용
+from common.article_store import recent_articles, save_articles
+from common.charset import response_text
+from common.company_index import ArticleIndex, normalize_company
+from common.export import wants_xlsx, xlsx_response
+from common.fetch_policy import end_fetch_stats, start_fetch_stats
+from common.http import fetch
+from common.google_news import GOOGLE_BATCH_SIZE, search_google_news, search_google_news_batch
+from common.keywords import UnknownKeywordSet, get_matcher, keyword_filter_from_args
+from common.postprocess import day_window, process
+from common.profiling import install_profiling
+from common.response_cache import cached_json
+
+app = install_profiling(Flask(__name__))
+app.teardown_request(end_fetch_stats)  # 요청별 fetch 통계/헤지 설정이 재사용된 워커 스레드에 남지 않도록
 
 # ===============================
 # 🔧 기본 설정
@@ -32,29 +47,32 @@ headers = {
     "Connection": "keep-alive",
 }
 
-TITLE_KEYWORDS = ['투자', '유치', '선정', '지원금', '시리즈', '스타트업']
+# 제목 키워드 (common/keyword_sets.json의 "startup_funding" 세트, Aho-Corasick 매처)
+TITLE_KEYWORDS = get_matcher("startup_funding")
+XLSX_COLUMNS = [("Company", "company"), ("Stage", "stage"), ("Startup Link", "startup_link"),
+                ("News Title", "news_title"), ("News Link", "news_link"), ("News Source", "news_source")]
 
 
 # ===============================
 # 🧩 Part 1: 스타트업리시피 기업 추출
 # ===============================
 def crawl_startup_invest():
+    """어제/오늘 투자 기업 [{company, stage, startup_link}] (회사명 중복 제거, 표 순서) — 실패하면 []"""
     url = "https://startuprecipe.co.kr/invest"
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        response = fetch(url, headers=headers, timeout=10)
     except Exception as e:
         print(f"❌ 사이트 접속 실패: {e}")
-        return pd.DataFrame()
+        return []
 
-    soup = BeautifulSoup(response.text, 'lxml')
+    soup = BeautifulSoup(response_text(response), 'lxml')
     tbody = soup.find('tbody')
     if not tbody:
         print("⚠️ tbody를 찾을 수 없습니다.")
-        return pd.DataFrame()
+        return []
 
     rows = tbody.find_all('tr')
-    results = []
+    results, dates = [], []
 
     for row in rows:
         cols = row.find_all('td')
@@ -67,13 +85,10 @@ def crawl_startup_invest():
 
         """if date_text != (YESTERDAY or TODAY):
             continue"""
-        if date_text not in (YESTERDAY, TODAY):
-            continue
         if '인수합병' in stage_text:
             continue
 
-        company_name = re.sub(r'\s*\(.*?\)\s*', '', company_text)
-        company_name = re.sub(r'[^\w가-힣&\s-]', '', company_name).strip()
+        company_name = normalize_company(company_text)
         if not company_name:
             continue
 
@@ -84,68 +99,99 @@ def crawl_startup_invest():
             link = 'https://startuprecipe.co.kr' + href if href.startswith('/') else href
 
         results.append({
-            'company': company_name,
+            'company': company_name.strip(),
             'stage': stage_text,
             'startup_link': link
         })
+        dates.append(date_text)
 
+    # 어제/오늘 날짜만 + 회사명 중복 제거를 한 번에 (common/postprocess)
+    since, until = day_window((YESTERDAY, TODAY))
+    results = process(results, times=dates, since=since, until=until, dedup='company')
     if not results:
         print("⚠️ 어제 또는 오늘 날짜의 투자 기업이 없습니다.")
         return []
+    return results
+
+
+# ===============================
+# 🗂️ Part 1.5: 당일 수집 기사에서 먼저 찾기
+# ===============================
+def _local_thebell():
+    from index2 import get_todays_news
+    titles, bodies, urls, _ = get_todays_news()
+    return [{"title": t, "summary": b, "link": u, "source": "thebell"} for t, b, u in zip(titles, bodies, urls)]
 
 
-    df = pd.DataFrame(results).drop_duplicates(subset=['company'])
+def _local_investchosun():
+    from index4 import get_todays_investchosun_news
+    titles, bodies, urls, _ = get_todays_investchosun_news()
+    return [{"title": t, "summary": b, "link": u, "source": "investchosun"} for t, b, u in zip(titles, bodies, urls)]
 
-    # 내부 처리에는 pandas 사용
-    df["company"] = df["company"].str.strip()
-    # 리턴할 때만 변환
-    return df.to_dict(orient="records")
+
+def _local_thesignal():
+    from index import get_recent_articles
+    return [{"title": a["title"], "summary": a["summary"], "link": a["link"], "source": "thesignal"}
+            for a in get_recent_articles()]
+
+
+LOCAL_SOURCES = {
+    "thebell": _local_thebell,
+    "investchosun": _local_investchosun,
+    "thesignal": _local_thesignal,
+}
+
+
+def stored_local_articles():
+    """
+    더벨/인베스트조선/시그널 목록 엔드포인트가 어제·오늘 수집해 저장소에 남긴 기사 (추가 크롤링 없음).
+    저장소가 꺼져 있거나 읽을 수 없으면 빈 목록 (기본 local_first 는 이때 실시간 수집으로 넘어간다).
+    """
+    try:
+        rows = recent_articles(list(LOCAL_SOURCES), YESTERDAY)
+    except sqlite3.Error as e:
+        print(f"⚠️ 저장소 기사 조회 실패: {e}")
+        return []
+    return [{"title": r["title"] or "", "summary": r["summary"] or "", "link": r["url"], "source": r["source"]}
+            for r in rows]
+
+
+def collect_local_articles():
+    """더벨/인베스트조선/시그널 당일 기사를 동시에 실시간 수집 (한 곳이 실패해도 나머지는 사용)"""
+    articles = []
+    with ThreadPoolExecutor(max_workers=len(LOCAL_SOURCES)) as pool:
+        futures = {name: pool.submit(contextvars.copy_context().run, fn) for name, fn in LOCAL_SOURCES.items()}
+        for name, fut in futures.items():
+            try:
+                articles.extend(fut.result())
+            except Exception as e:
+                print(f"⚠️ {name} 기사 수집 실패: {e}")
+    return articles
+
+
+def match_companies_locally(companies, articles):
+    """회사명 → 당일 기사 (제목 우선, TITLE_KEYWORDS 일치 우선). 못 찾은 회사는 빠진다."""
+    article_index = ArticleIndex(articles)
+    hits = {}
+    for company_info in companies:
+        article = article_index.lookup(company_info['company'], TITLE_KEYWORDS)
+        if article:
+            hits[company_info['company']] = article
+    return hits
 
 
 # ===============================
 # 📰 Part 2: 구글 뉴스 검색
 # ===============================
-def search_google_news_for_company(company_name):
-    query = f'"{company_name}"'
-    params = {
-        'q': query,
-        'tbs': 'qdr:d',  # 최근 1일
-        'hl': 'ko',
-        'gl': 'kr',
-        'num': 10
-    }
+def search_google_news_for_company(company_name, backend=None):
+    # backend: "rss"(검색 피드 스트리밍, 실패하면 html로) | "html"(결과 페이지 스크래핑) — 기본값은 GOOGLE_NEWS_BACKEND(rss)
+    return search_google_news(company_name, TITLE_KEYWORDS, headers, backend=backend)
 
-    search_url = 'https://news.google.com/search?' + urllib.parse.urlencode(params)
 
-    try:
-        time.sleep(1.2)
-        response = requests.get(search_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-
-        article_links = soup.find_all('a', href=True)
-        for a in article_links:
-            title_tag = a.find(['h3', 'h4']) or a
-            title_text = title_tag.get_text(strip=True)
-            if len(title_text) < 5:
-                continue
-
-            if any(keyword in title_text for keyword in TITLE_KEYWORDS):
-                raw_link = a['href']
-                if raw_link.startswith('./'):
-                    link = 'https://news.google.com' + raw_link[1:]
-                elif raw_link.startswith('/'):
-                    link = 'https://news.google.com' + raw_link
-                elif '/url?q=' in raw_link:
-                    link = urllib.parse.unquote(raw_link.split('/url?q=')[1].split('&')[0])
-                else:
-                    link = raw_link
-
-                return {'title': title_text, 'link': link}
-        return {'title': None, 'link': None}
-    except Exception as e:
-        print(f"❌ 뉴스 검색 실패 ({company_name}): {e}")
-        return {'title': None, 'link': None}
+def search_google_news_for_companies(company_names, backend=None, batch_size=5):
+    # 회사 여러 개를 OR 쿼리로 묶어 검색 → 못 찾은 회사만 단건 검색
+    return search_google_news_batch(company_names, TITLE_KEYWORDS, headers, backend=backend,
+                                    batch_size=batch_size)
 
 
 # ===============================
@@ -155,38 +201,107 @@ def search_google_news_for_company(company_name):
 @app.route("/api/startuprecipe", methods=["GET"])
 def crawl_startuprecipe():
     """
-    GET /api/startuprecipe
+    GET /api/startuprecipe[?google_backend=html][&google_batch=1]
     → 어제 날짜 기준 스타트업리시피 투자 기사 + 관련 구글뉴스 결과를 JSON으로 반환
+    → 구글 뉴스는 RSS 검색 피드가 기본 (실패하면 결과 페이지로), google_backend=html 이면 결과 페이지만
+    → 구글 검색은 회사 google_batch개(기본 GOOGLE_BATCH_SIZE=5)씩 OR 쿼리로 묶는다 (구글 요청 수 절감, 이름이 겹치는
+      회사는 다른 묶음으로). google_batch=1 이면 회사별 단건 검색
+    → keywords=<세트이름>[&min_score=] 이면 뉴스 제목에 키워드 점수를 붙이고 필터
+    → 기본적으로 당일 더벨/인베스트조선/시그널 기사에서 먼저 찾고, 없는 회사만 구글 검색 (local_first=0 이면 끔)
+      (당일 기사 = 목록 엔드포인트가 어제·오늘 저장소에 남긴 기사, 저장소에 그 기간 기사가 없으면 세 곳을 지금 크롤링.
+       저장소는 ARTICLE_DB_PATH 를 모든 인스턴스가 공유할 때만 채워져 있다. local_first=store 이면 저장소만,
+       local_first=live 이면 저장소를 건너뛰고 항상 크롤링)
+    → hedge=1 이면 느린 요청에 헤지 요청을 추가 (fetch: 요청/재시도/헤지/실패 페이지 수)
+    → format=xlsx 이면 하이퍼링크 셀이 있는 엑셀 파일로 반환
+    → 결과 집합 ETag + Cache-Control(s-maxage), If-None-Match가 맞으면 304 (common/response_cache)
+    → fields=title,url 이면 기사마다 그 필드만, max_body_chars=N 이면 요약/본문을 N자까지 (gzip/br 압축, common/response_format)
     """
+    local_first = request.args.get("local_first", "1")
+    if local_first in ("0", "false"):
+        local_first = None
+    elif local_first not in ("store", "live"):
+        local_first = "auto"
+    google_backend = request.args.get("google_backend")
+    google_batch = request.args.get("google_batch", GOOGLE_BATCH_SIZE, type=int)
+    fetch_stats = start_fetch_stats(hedge=request.args.get("hedge") in ("1", "true"))
+    try:
+        keyword_filter = keyword_filter_from_args(request.args)
+    except UnknownKeywordSet as e:
+        return jsonify({"error": str(e)}), 400
+
     companies = crawl_startup_invest()  # ✅ list[dict] 반환
 
     if not companies:   # ✅ list는 빈 경우 이렇게 검사
-        return jsonify({
+        return cached_json({
             "date_range": f"{YESTERDAY} ~ {TODAY}",
             "count": 0,
             "articles": [],
             "message": "No news for yesterday."
-        })
+        }, "startuprecipe")
+
+    local_hits, local_stats = {}, None
+    if local_first:
+        print(f"🗂️ 당일 수집 기사에서 먼저 검색 중 ({local_first})...")
+        local_from, local_articles = "store", []
+        if local_first != "live":
+            local_articles = stored_local_articles()
+        if local_first == "live" or (local_first == "auto" and not local_articles):
+            # ✅ 공유 저장소가 아니면(인스턴스마다 /tmp) 대개 비어 있다 → 전부 구글로 넘기지 않고 지금 크롤링
+            local_from, local_articles = "live", collect_local_articles()
+            for source in LOCAL_SOURCES:
+                save_articles(source, [a for a in local_articles if a["source"] == source], url="link")
+        local_hits = match_companies_locally(companies, local_articles)
+        local_stats = {"from": local_from, "articles": len(local_articles), "matched": len(local_hits)}
+
+    remaining = [c['company'] for c in companies if c['company'] not in local_hits]
+    google_stats = None
+    if google_batch > 1 and remaining:
+        print(f"🔎 {len(remaining)}개 기업 묶음 뉴스 검색 중 (묶음 크기 {google_batch})...")
+        news_by_company, google_stats = search_google_news_for_companies(
+            remaining, backend=google_backend, batch_size=google_batch)
 
     results = []
     for company_info in companies:  # ✅ list 요소는 dict
         company = company_info['company']
-        print(f"🔎 {company} 뉴스 검색 중...")
-        news = search_google_news_for_company(company)
+        if company in local_hits:
+            hit = local_hits[company]
+            news, news_source = {'title': hit['title'], 'link': hit['link']}, hit['source']
+        elif google_stats is not None:
+            news, news_source = news_by_company[company], "google"
+        else:
+            print(f"🔎 {company} 뉴스 검색 중...")
+            news, news_source = search_google_news_for_company(company, backend=google_backend), "google"
 
         results.append({
             "company": company,
             "stage": company_info['stage'],
             "startup_link": company_info['startup_link'],
             "news_title": news['title'],
-            "news_link": news['link']
+            "news_link": news['link'],
+            "news_source": news_source if news['title'] else None
         })
 
-    return jsonify({
+    save_articles("startuprecipe", [r for r in results if r["news_source"] == "google"],
+                  url="news_link", title="news_title", summary=None)
+
+    if keyword_filter:
+        results = keyword_filter(results, ["news_title"])
+
+    if wants_xlsx(request.args):
+        return xlsx_response(results, XLSX_COLUMNS, link=("news_link", "news_title"), name="startuprecipe")
+
+    payload = {
         "date_range": f"{YESTERDAY} ~ {TODAY}",
         "count": len(results),
         "articles": results
-    })
+    }
+    if local_stats is not None:
+        payload["local"] = local_stats
+    if google_stats is not None:
+        payload["google"] = google_stats
+    payload["fetch"] = fetch_stats.as_dict()
+
+    return cached_json(payload, "startuprecipe")
 
 
 """@app.route("/api/startuprecipe/debug")
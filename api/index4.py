@@ -1,15 +1,32 @@
+import os
+import sys
 from flask import Flask, jsonify, Response, request
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import time
 from urllib.parse import urljoin, quote
 import io
 import csv
 from pytz import timezone
 
-
-app = Flask(__name__)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # api/common 임포트용
+from common.article_store import new_since, parse_cursor, save_articles
+from common.categories import crawl_categories, merge_categories, parse_categories
+from common.clustering import cluster_from_args
+from common.enrich import DEFAULT_CONCURRENCY, enrich_with_body
+from common.export import wants_xlsx, xlsx_response
+from common.feeds import KST, discover, discovery_mode, end_discovery, start_discovery
+from common.fetch_policy import MAX_FAILED_PAGES_IN_ROW, note, end_fetch_stats, start_fetch_stats
+from common.http import fetch
+from common.keywords import UnknownKeywordSet, keyword_filter_from_args
+from common.postprocess import day_window, process
+from common.profiling import install_profiling
+from common.response_cache import cached_json
+from common.stream_parse import element_html, has_class, iter_elements
+
+app = install_profiling(Flask(__name__))
+app.teardown_request(end_fetch_stats)  # 요청별 fetch 통계/헤지 설정이 재사용된 워커 스레드에 남지 않도록
+app.teardown_request(end_discovery)
 
 # ===============================
 # 🔧 기본 설정
@@ -27,89 +44,163 @@ HEADERS = {
     ),
     "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8"
 }
+DEFAULT_CATID = "2"
+XLSX_COLUMNS = [("URL", "url"), ("Title", "title"), ("Body", "body"), ("Date", "dates"), ("Categories", "categories"),
+                ("Cluster", "cluster")]
 
 
 # ===============================
 # 📰 인베스트조선 뉴스 크롤러
 # ===============================
-def get_todays_investchosun_news():
-    titles, bodies, urls, dates = [], [], [], []
-    page = 1
-    max_pages = 30
+def parse_news_page(html, days=None):
+    """
+    목록 페이지 HTML → days(기본: 어제/오늘) 날짜 기사 [(제목, 요약, URL, 날짜), ...]
+    기사 목록이 아예 없으면 None (마지막 페이지). 동기/비동기 크롤러와 보관소 재파싱이 함께 쓴다.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    article_items = soup.select("ul.list_ul > li")
+    if not article_items:
+        return None
 
-    session = requests.Session()
-    base_url = "https://www.investchosun.com/svc/news/list.html"
+    rows = []
+    for li in article_items:
+        row = _parse_item(li)
+        if row:
+            rows.append(row)
+    return in_days(rows, days)
 
-    while page <= max_pages:
-        params = {"catid": "2", "pn": str(page)}
 
-        try:
-            resp = session.get(base_url, params=params, headers=HEADERS, timeout=10)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
+def in_days(rows, days=None):
+    """(제목, 요약, URL, 날짜) 목록 중 days(기본: 어제/오늘) 날짜 행만, 순서 유지 (common/postprocess로 한 번에)"""
+    since, until = day_window(days or (YESTERDAY, TODAY))
+    return process(rows, time_key=3, since=since, until=until)
 
-            article_items = soup.select("ul.list_ul > li")
-            if not article_items:
-                break
 
-            page_has_today = False
+def _is_list_item(el):
+    parent = el.getparent()
+    return el.tag == "li" and parent is not None and parent.tag == "ul" and has_class(parent, "list_ul")
+
+
+def iter_news_stream(resp, stats=None):
+    """
+    parse_news_page의 스트리밍 버전: 받는 동안 ul.list_ul > li 가 닫히는 즉시 (제목, 요약, URL, 날짜)를 넘긴다.
+    날짜로 거르지 않는다 — 페이지를 다 읽은 뒤 in_days로. stats["items"]가 0이면 기사 목록이 없는 페이지.
+    """
+    for el in iter_elements(resp, _is_list_item, stats=stats):
+        row = _parse_item(BeautifulSoup(element_html(el), "html.parser").li)
+        if row:
+            yield row
+
+
+def _parse_item(li):
+    """목록 항목(li) 하나 → (제목, 요약, URL, 날짜), 형식이 다르면 None (날짜 거르기는 in_days)"""
+    dt = li.find("dt")
+    if not dt:
+        return None
+
+    a_tag = dt.find("a", href=True)
+    if not a_tag:
+        return None
+
+    title = a_tag.get_text(strip=True)
+    relative_url = a_tag["href"]
+    full_url = urljoin("https://www.investchosun.com", relative_url)
+
+    dd_summary = li.find("dd", class_="summary")
+    body = ""
+    if dd_summary:
+        summary_a = dd_summary.find("a")
+        if summary_a:
+            body = " ".join(summary_a.get_text(strip=True).split())
+        else:
+            body = dd_summary.get_text(strip=True)
 
-            for li in article_items:
-                dt = li.find("dt")
-                if not dt:
-                    continue
+    dd_date = li.find("dd", class_="date")
+    if not dd_date:
+        return None
 
-                a_tag = dt.find("a", href=True)
-                if not a_tag:
-                    continue
+    date_span = dd_date.find("span")
+    if not date_span:
+        return None
 
-                title = a_tag.get_text(strip=True)
-                relative_url = a_tag["href"]
-                full_url = urljoin("https://www.investchosun.com", relative_url)
+    date_text = date_span.get_text(strip=True).strip()
 
-                dd_summary = li.find("dd", class_="summary")
-                body = ""
-                if dd_summary:
-                    summary_a = dd_summary.find("a")
-                    if summary_a:
-                        body = " ".join(summary_a.get_text(strip=True).split())
-                    else:
-                        body = dd_summary.get_text(strip=True)
+    return title, body, full_url, date_text
 
-                dd_date = li.find("dd", class_="date")
-                if not dd_date:
-                    continue
 
-                date_span = dd_date.find("span")
-                if not date_span:
-                    continue
+def feed_row(item, days=None):
+    """피드 항목(common/feeds) → _parse_item과 같은 (제목, 요약, URL, 날짜), days 밖이면 None"""
+    date_text = item.published.strftime('%Y.%m.%d')
+    if date_text not in (days or (YESTERDAY, TODAY)):
+        return None
+    return item.title, " ".join(item.summary.split()), urljoin("https://www.investchosun.com", item.link), date_text
 
-                date_text = date_span.get_text(strip=True).strip()
 
-                if date_text not in (YESTERDAY, TODAY):
-                    continue
+def feed_window_start():
+    """피드가 덮어야 하는 구간의 시작 = YESTERDAY 0시 (KST)"""
+    return KST.localize(datetime.strptime(YESTERDAY, '%Y.%m.%d'))
 
-                if full_url in urls:
-                    continue
 
-                titles.append(title)
-                bodies.append(body)
-                urls.append(full_url)
-                dates.append(date_text)
+def dedupe_rows(rows):
+    """URL 기준 중복 제거 — 먼저 나온 것만 (common/postprocess)"""
+    return process(rows, dedup=2)
 
-                page_has_today = True
+
+def get_todays_investchosun_news(catid=DEFAULT_CATID):
+    """catid 하나 → (titles, bodies, urls, dates). 피드(설정 또는 자동 탐색)가 있으면 피드로, 없거나 못 쓰면 목록 HTML (common/feeds)"""
+    rows = discover("investchosun", feed_window_start(), feed_row, lambda: list(zip(*crawl_listing_pages(catid))),
+                    category=catid, headers=HEADERS)
+    rows = dedupe_rows(rows)
+    return tuple(map(list, zip(*rows))) if rows else ([], [], [], [])
+
+
+def crawl_listing_pages(catid=DEFAULT_CATID):
+    """목록 HTML을 페이지 순서대로 돌며 어제/오늘 기사 → (titles, bodies, urls, dates) — URL 중복 제거는 dedupe_rows"""
+    rows = []
+    page = 1
+    max_pages = 30
+    failures_in_row = 0
+
+    base_url = "https://www.investchosun.com/svc/news/list.html"
+
+    while page <= max_pages:
+        params = {"catid": catid, "pn": str(page)}
+
+        try:
+            # 본문을 받는 동안 항목이 닫히는 대로 파싱 (common/stream_parse)
+            resp = fetch(base_url, params=params, headers=HEADERS, timeout=10, stream=True)
+            page_stats = {}
+            page_rows = in_days(list(iter_news_stream(resp, stats=page_stats)))
+            rows.extend(page_rows)
+            page_has_today = bool(page_rows)
+            if not page_stats["items"]:
+                break
 
             if not page_has_today and page > 1:
                 break
 
-            page += 1
-            time.sleep(0.5)
+            page += 1  # 요청 간격은 common.ratelimit이 호스트별로 조절
+            failures_in_row = 0
 
         except Exception as e:
+            # 실패한 페이지만 건너뛰고 계속 (연속 실패면 중단)
             print(f"❌ {page}페이지 오류: {e}")
-            break
+            note("failed_pages")
+            failures_in_row += 1
+            if failures_in_row >= MAX_FAILED_PAGES_IN_ROW:
+                break
+            page += 1
+
+    return tuple(map(list, zip(*rows))) if rows else ([], [], [], [])
+
+
+def get_investchosun_articles(catids=(DEFAULT_CATID,)):
+    """여러 catid를 동시에 수집 → URL 기준 중복 제거한 기사 dict 목록 (categories: 속한 catid 전부)"""
+    def crawl(catid):
+        titles, bodies, urls, dates = get_todays_investchosun_news(catid)
+        return [{"title": t, "body": b, "url": u, "dates": d} for t, b, u, d in zip(titles, bodies, urls, dates)]
 
-    return titles, bodies, urls, dates
+    return merge_categories(crawl_categories(crawl, list(catids)), "url")
 
 
 # ===============================
@@ -136,22 +227,68 @@ def create_csv_bytes(titles, bodies, urls):
 @app.route("/api/investchosun", methods=["GET"])
 def crawl_investchosun():
     """
-    GET /api/investchosun
-    → 어제 날짜 기준 인베스트조선 기사 수집 후 JSON 반환
+    GET /api/investchosun[?with_body=1][&categories=2,3]
+    → 어제 날짜 기준 인베스트조선 기사 수집 후 JSON 반환 (fetch: 요청/재시도/헤지/실패 페이지 수)
+    → categories=<catid,...> 이면 여러 카테고리를 동시에 수집, 겹치는 기사는 하나로 합치고 categories에 모두 표시 (기본 2)
+    → with_body=1 이면 기사 본문(content)까지 병렬로 수집해 함께 반환
+    → keywords=<세트이름>[&min_score=] 이면 제목+요약 키워드 점수를 붙이고 필터
+    → format=xlsx 이면 하이퍼링크 셀이 있는 엑셀 파일로 반환 (create_csv_bytes의 HYPERLINK 수식 대신)
+    → since=<cursor> 이면 그 커서 이후 처음 수집된 기사만 반환 (응답의 cursor를 다음 폴링 때 since로 — 잘려서 못 나간 기사는 다음 폴링에, 다른 저장소의 커서면 전부)
+    → cluster=1[&cluster_threshold=0.65] 이면 같은 딜 기사끼리 cluster 번호 + clusters(대표 제목)
+    → 피드(설정 또는 자동 탐색한 RSS/Atom/사이트맵) 우선, 없거나 오래됐으면 목록 HTML (discovery: 어느 쪽을 썼는지/바이트/CPU, discovery=html 이면 HTML만)
+    → 결과 집합 ETag + Cache-Control(s-maxage), If-None-Match가 맞으면 304 (common/response_cache)
+    → fields=title,url 이면 기사마다 그 필드만, max_body_chars=N 이면 요약/본문을 N자까지 (gzip/br 압축, common/response_format)
     """
      
-    titles, bodies, urls, dates = get_todays_investchosun_news()
-
-    articles = [
-        {"title": t, "body": b, "url": u, "dates": d}
-        for t, b, u, d in zip(titles, bodies, urls, dates)
-    ]
- 
-    return jsonify({
+    try:
+        keyword_filter = keyword_filter_from_args(request.args)
+    except UnknownKeywordSet as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        since = parse_cursor(request.args.get("since"))
+    except ValueError:
+        return jsonify({"error": "since 커서 형식이 올바르지 않습니다."}), 400
+    try:
+        catids = parse_categories(request.args.get("categories"), DEFAULT_CATID)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        cluster = cluster_from_args(request.args)
+        mode = discovery_mode(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    fetch_stats = start_fetch_stats(hedge=request.args.get("hedge") in ("1", "true"))
+    discovery = start_discovery(mode)
+    articles = get_investchosun_articles(catids)
+
+    save_articles("investchosun", articles, summary="body", published_at="dates")
+
+    if keyword_filter:
+        articles = keyword_filter(articles, ["title", "body"])
+    articles, cursor = new_since("investchosun", articles, since)
+    cluster_info = cluster(articles, ["title", "body"]) if cluster else {}
+
+    if wants_xlsx(request.args):
+        return xlsx_response(articles, XLSX_COLUMNS, link=("url", "title"), name="investchosun")
+
+    payload = {
         "date": TODAY,
+        "categories": catids,
         "count": len(articles),
-        "articles": articles
-    })
+        "articles": articles,
+        "cursor": cursor,
+        "since": request.args.get("since"),
+        **cluster_info
+    }
+    if request.args.get("with_body") in ("1", "true"):
+        concurrency = request.args.get("concurrency", DEFAULT_CONCURRENCY, type=int)
+        payload["enrichment"] = enrich_with_body(articles, url_key="url", concurrency=concurrency)
+        save_articles("investchosun", articles, summary="body", body="content", published_at="dates")
+    payload["discovery"] = discovery.as_dict()
+    payload["fetch"] = fetch_stats.as_dict()
+
+    return cached_json(payload, "investchosun")
 
 
 # ===============================
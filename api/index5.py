@@ -1,10 +1,21 @@
 # readability-lxml를 활용해서 url 제공 시 뉴스 기사의 본문을 파싱하는 api 
+import os
+import sqlite3
+import sys
 from flask import Flask, jsonify, request
 import requests
-from bs4 import BeautifulSoup
-from readability import Document
 
-app = Flask(__name__)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # api/common 임포트용
+from common.article import ArticleParseError, extract_article, template_stats
+from common.article_store import get_article, save_articles
+from common.fetch_policy import CircuitOpenError
+from common.http import fetch
+from common.profiling import install_profiling
+from common.response_cache import cached_json
+from common.seen_index import known_bodies
+from common.stream_parse import read_document
+
+app = install_profiling(Flask(__name__))
 
 # ===============================
 # 🔧 HEADERS 필수 추가!
@@ -20,47 +31,79 @@ HEADERS = {
 }
 
 
+def stored_article(url):
+    """이미 본문까지 저장한 기사면 (제목, 본문) — seen 색인이 없다고 하면 DB를 보지 않는다. 없거나 읽지 못하면 None"""
+    try:
+        body = known_bodies([url]).get(url)
+        row = get_article(url) if body else None
+    except sqlite3.Error as e:
+        print(f"⚠️ 저장된 본문 조회 실패: {e}")
+        return None
+    if not row or not row["title"]:
+        return None
+    return row["title"], body
+
+
 @app.route("/api/parse_article", methods=["GET"])
 def parse_article():
     """
     GET /api/parse_article?url=<뉴스_URL>
     → 제공된 뉴스 URL의 본문을 readability-lxml로 파싱하여 JSON으로 반환
+    → max_body_chars=N 이면 본문을 N자까지, fields=title,content 처럼 필드만 골라서 (common/response_format)
+    → 이미 본문까지 저장한 기사(common/seen_index)는 요청 없이 저장본을 돌려준다 ("extraction": {"method": "stored"}),
+      refresh=1 이면 저장본을 무시하고 다시 받는다
     """
     url = request.args.get('url')
     if not url:
         return jsonify({"error": "URL 파라미터가 필요합니다."}), 400
 
+    stored = None if request.args.get("refresh") in ("1", "true") else stored_article(url)
+    if stored:
+        title, content_text = stored
+        return cached_json({
+            "success": True,
+            "title": title,
+            "content": content_text,
+            "url": url,
+            "extraction": {"method": "stored"}
+        }, "article")
+
     try:
         # URL에서 페이지 내용 가져오기
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        response.raise_for_status()
-        response.encoding = 'utf-8'  # 한글 깨짐 방지
-
-        # readability-lxml로 본문 추출
-        doc = Document(response.text)
-        title = doc.title().strip()
-        content_html = doc.summary()
+        # 받는 동안 lxml 트리를 만들어 둔다 (인코딩은 헤더/BOM/<meta charset>으로 판별 — EUC-KR 페이지도 그대로)
+        response = fetch(url, headers=HEADERS, timeout=15, stream=True)
+        doc, html = read_document(response)
 
-        # HTML에서 순수 텍스트 추출
-        soup = BeautifulSoup(content_html, 'html.parser')
-        content_text = soup.get_text(separator=' ', strip=True)
+        # 도메인 템플릿(XPath) 우선, 없거나 빗나가면 readability-lxml로 본문 추출
+        title, content_text, extraction = extract_article(html, url, doc=doc)
+        save_articles("article", [{"url": url, "title": title, "content": content_text}], summary=None, body="content")
 
-        # 빈 결과 처리
-        if not title or not content_text:
-            return jsonify({"error": "기사 제목 또는 본문을 찾을 수 없습니다."}), 404
-
-        return jsonify({
+        return cached_json({
             "success": True,
             "title": title,
             "content": content_text,
-            "url": url
-        })
+            "url": url,
+            "extraction": extraction
+        }, "article")
 
+    except ArticleParseError as e:
+        return jsonify({"error": str(e)}), 404
+    except CircuitOpenError as e:
+        return jsonify({"error": f"일시적으로 요청 중단: {str(e)}"}), 503
     except requests.exceptions.RequestException as e:
         return jsonify({"error": f"URL 요청 오류: {str(e)}"}), 500
     except Exception as e:
         return jsonify({"error": f"파싱 오류: {str(e)}"}), 500
 
 
+@app.route("/api/parse_article/templates", methods=["GET"])
+def parse_article_templates():
+    """
+    GET /api/parse_article/templates
+    → 도메인별 추출 템플릿, 적중률, readability 대비 절약 시간(ms)
+    """
+    return jsonify(template_stats())
+
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
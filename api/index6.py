@@ -0,0 +1,68 @@
+# 저장된 기사(api/common/article_store.py) 전문 검색 api
+import os
+import sys
+from flask import Flask, jsonify, request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # api/common 임포트용
+from common.article_store import MAX_SEARCH_LIMIT, iter_articles, search_articles, store_unavailable
+from common.clustering import cluster_from_args
+from common.export import wants_xlsx, xlsx_response
+from common.profiling import install_profiling
+from common.response_cache import cached_json
+
+app = install_profiling(Flask(__name__))
+
+XLSX_COLUMNS = [("URL", "url"), ("Source", "source"), ("Title", "title"), ("Summary", "summary"),
+                ("Published", "published_at"), ("First Seen", "first_seen"), ("Body Chars", "body_chars")]
+
+
+@app.route("/api/search", methods=["GET"])
+def search():
+    """
+    GET /api/search?q=<검색어>[&source=thebell,investchosun][&from=YYYY-MM-DD][&to=YYYY-MM-DD][&limit=50]
+    → 지금까지 수집된 기사 중 제목/요약/본문에 검색어가 모두 들어간 기사를 최신순으로 반환
+    → cluster=1[&cluster_threshold=0.65] 이면 여러 출처 기사를 딜별로 묶어 cluster 번호 + clusters(대표 제목)
+      (예: from=to=오늘&limit=200&cluster=1 → 더벨/인베스트조선/시그널 당일 기사 묶음)
+    → format=xlsx 이면 조건에 맞는 기사 전부(limit 무시)를 하이퍼링크 셀이 있는 엑셀 파일로 반환
+      (DB 커서에서 한 행씩 바로 파일에 쓰므로 여러 날치도 메모리에 모으지 않음)
+    → fields=title,url 이면 기사마다 그 필드만, max_body_chars=N 이면 요약을 N자까지 (gzip/br 압축, common/response_format)
+    → 공유 저장소가 없으면(서버리스에서 ARTICLE_DB_PATH 미설정 등) 빈 결과 대신 503
+    """
+    unavailable = store_unavailable()
+    if unavailable:
+        return jsonify({"error": unavailable}), 503
+    q = request.args.get("q", "").strip()
+    sources = [s for s in request.args.get("source", "").split(",") if s]
+    date_from = request.args.get("from")
+    date_to = request.args.get("to")
+    limit = request.args.get("limit", 50, type=int)
+
+    if not q and not (sources or date_from or date_to):
+        return jsonify({"error": "q, source, from, to 중 하나 이상이 필요합니다."}), 400
+    try:
+        cluster = cluster_from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        if wants_xlsx(request.args):
+            rows = iter_articles(q, sources=sources, date_from=date_from, date_to=date_to)
+            return xlsx_response(rows, XLSX_COLUMNS, link=("url", "title"), name="search")
+        articles = search_articles(q, sources=sources, date_from=date_from, date_to=date_to, limit=limit)
+    except Exception as e:
+        return jsonify({"error": f"검색 오류: {str(e)}"}), 500
+    cluster_info = cluster(articles, ["title", "summary"]) if cluster else {}
+
+    return cached_json({
+        "query": q,
+        "sources": sources,
+        "date_range": f"{date_from or ''} ~ {date_to or ''}",
+        "limit": min(limit, MAX_SEARCH_LIMIT),
+        "count": len(articles),
+        "articles": articles,
+        **cluster_info
+    }, "search")
+
+
+if __name__ == "__main__":
+    app.run(debug=True)
@@ -0,0 +1,407 @@
+# asyncio 크롤러 + ASGI 앱 — 기존 Flask 엔드포인트와 같은 JSON을 /api/async/* 로 제공
+#
+# Flask 뷰는 크롤링 동안 워커 하나를 통째로 붙잡는다 (인스턴스 하나 = 동시에 크롤링 하나).
+# 여기서는 요청 대기를 이벤트 루프에 맡기고(common/aio_http), 파싱만 스레드풀로 넘겨
+# 한 인스턴스가 여러 크롤링 요청을 동시에 처리한다. 목록 파싱 함수는 동기 엔드포인트와 같은 것을 쓴다.
+#
+# 로컬 실행: uvicorn index7:app --app-dir api   (ASGI 서버 아무거나)
+# 모든 경로에서 ?profile=cpu|memory 지원 (PROFILE_TOKEN 필요, common/profiling) — Flask 엔드포인트와 같음
+# ?fields= / ?max_body_chars= / gzip·br 압축도 Flask 엔드포인트와 같음 (common/response_format)
+import os
+import sys
+from datetime import datetime
+from urllib.parse import parse_qsl
+
+import httpx
+from pytz import timezone
+from werkzeug.datastructures import Headers, MultiDict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # api/common 임포트용
+import index
+import index2
+import index4
+from common.aio_http import close_client, fetch_async, run_parse
+from common.article import ArticleParseError, extract_article_bytes
+from common.article_store import new_since, parse_cursor, save_articles
+from common.categories import crawl_categories_async, merge_categories, parse_categories
+from common.clustering import cluster_from_args
+from common.charset import response_text
+from common.enrich import DEFAULT_CONCURRENCY, enrich_with_body_async
+from common.feeds import discover_async, discovery_mode, end_discovery, start_discovery
+from common.fetch_policy import MAX_FAILED_PAGES_IN_ROW, CircuitOpenError, end_fetch_stats, note, start_fetch_stats
+from common.keywords import UnknownKeywordSet, keyword_filter_from_args
+from common.profiling import ProfileDenied, ProfileSession, attach, profile_headers, requested_mode
+from common.raw_archive import ArchiveMiss
+from common.response_cache import cache_headers, etag_matches
+from common.response_format import article_cap, dumps, encode_body, resolve_cursor, response_shape
+
+KST = timezone('Asia/Seoul')
+
+
+# ===============================
+# 📰 비동기 목록 크롤러 (페이지 순서/중단 조건은 동기 버전과 동일)
+# ===============================
+async def _crawl_pages(fetch_page, parse_page, max_pages):
+    """
+    fetch_page(page) → 응답, parse_page(html) → 페이지 결과(None이면 마지막 페이지).
+    페이지 결과를 차례로 yield 한다. 실패한 페이지는 건너뛰고, 연속 실패면 중단.
+    """
+    failures_in_row = 0
+    for page in range(1, max_pages + 1):
+        try:
+            resp = await fetch_page(page)
+            rows = await run_parse(parse_page, response_text(resp))
+        except Exception as e:
+            print(f"❌ {page}페이지 오류: {e}")
+            note("failed_pages")
+            failures_in_row += 1
+            if failures_in_row >= MAX_FAILED_PAGES_IN_ROW:
+                return
+            continue
+        failures_in_row = 0
+        if rows is None:
+            return
+        yield page, rows
+
+
+async def get_todays_news_async():
+    """index2.get_todays_news의 비동기 버전 → (titles, bodies, urls, dates) — 피드 우선, 없으면 목록 HTML"""
+    now = datetime.now(KST)
+    today_str = now.strftime('%Y-%m-%d')
+    midnight = KST.localize(datetime.combine(now.date(), datetime.min.time()))
+
+    async def crawl_html():
+        return list(zip(*await crawl_thebell_pages_async(today_str)))
+
+    rows = await discover_async("thebell", midnight, lambda item: index2.feed_row(item, today_str), crawl_html)
+    return tuple(map(list, zip(*rows))) if rows else ([], [], [], [])
+
+
+async def crawl_thebell_pages_async(today_str):
+    """index2.crawl_listing_pages의 비동기 버전"""
+    titles, bodies, urls, dates = [], [], [], []
+
+    async def fetch_page(page):
+        url = f"https://www.thebell.co.kr/free/content/article.asp?page={page}&svccode=00"
+        return await fetch_async(url, timeout=10)
+
+    async for page, rows in _crawl_pages(fetch_page, lambda html: index2.parse_news_page(html, today_str), 50):
+        for title, body, full_url, date_text in rows:
+            titles.append(title)
+            bodies.append(body)
+            urls.append(full_url)
+            dates.append(date_text)
+        if not rows and page > 1:
+            break
+    return titles, bodies, urls, dates
+
+
+async def get_todays_investchosun_news_async(catid=index4.DEFAULT_CATID):
+    """index4.get_todays_investchosun_news의 비동기 버전 → (titles, bodies, urls, dates) — 피드 우선, 없으면 목록 HTML"""
+    async def crawl_html():
+        return list(zip(*await crawl_investchosun_pages_async(catid)))
+
+    rows = await discover_async("investchosun", index4.feed_window_start(), index4.feed_row, crawl_html,
+                                category=catid, headers=index4.HEADERS)
+    rows = index4.dedupe_rows(rows)
+    return tuple(map(list, zip(*rows))) if rows else ([], [], [], [])
+
+
+async def crawl_investchosun_pages_async(catid=index4.DEFAULT_CATID):
+    """index4.crawl_listing_pages의 비동기 버전"""
+    all_rows = []
+
+    async def fetch_page(page):
+        params = {"catid": catid, "pn": str(page)}
+        return await fetch_async("https://www.investchosun.com/svc/news/list.html", params=params,
+                                 headers=index4.HEADERS, timeout=10)
+
+    async for page, rows in _crawl_pages(fetch_page, index4.parse_news_page, 30):
+        all_rows.extend(rows)
+        if not rows and page > 1:
+            break
+    return tuple(map(list, zip(*all_rows))) if all_rows else ([], [], [], [])
+
+
+async def get_investchosun_articles_async(catids=(index4.DEFAULT_CATID,)):
+    """index4.get_investchosun_articles의 비동기 버전 — catid별 크롤링을 이벤트 루프에서 동시에"""
+    async def crawl(catid):
+        titles, bodies, urls, dates = await get_todays_investchosun_news_async(catid)
+        return [{"title": t, "body": b, "url": u, "dates": d} for t, b, u, d in zip(titles, bodies, urls, dates)]
+
+    return merge_categories(await crawl_categories_async(crawl, list(catids)), "url")
+
+
+async def get_recent_articles_async(max_pages=10, nclass=index.DEFAULT_NCLASS):
+    """index.get_recent_articles의 비동기 버전 — 피드 우선, 없으면 목록 HTML"""
+    return await discover_async("thesignal", KST.localize(index.CUTOFF_TIME), index.feed_article,
+                                lambda: crawl_thesignal_pages_async(max_pages, nclass), category=nclass,
+                                headers=index.HEADERS)
+
+
+async def crawl_thesignal_pages_async(max_pages=10, nclass=index.DEFAULT_NCLASS):
+    """index.crawl_listing_pages의 비동기 버전"""
+    all_articles = []
+
+    async def fetch_page(page):
+        params = {"NClass": nclass, "Page": page, "Kind": "Time"}
+        return await fetch_async(index.BASE_URL, params=params, headers=index.HEADERS, timeout=10)
+
+    async for _, articles in _crawl_pages(fetch_page, index.parse_page_articles, max_pages):
+        if not articles:
+            break
+        recent, reached_old = index.split_recent(articles)
+        all_articles.extend(recent)
+        if reached_old:
+            break
+    return all_articles
+
+
+async def get_thesignal_articles_async(nclasses=(index.DEFAULT_NCLASS,), max_pages=10):
+    """index.get_thesignal_articles의 비동기 버전"""
+    results = await crawl_categories_async(lambda nclass: get_recent_articles_async(max_pages, nclass), list(nclasses))
+    return index.merge_sorted(results)
+
+
+# ===============================
+# 🚀 엔드포인트 (각각 Flask 뷰와 같은 JSON)
+# ===============================
+def _hedge(args):
+    return args.get("hedge") in ("1", "true")
+
+
+async def _cluster(cluster, articles, fields, url_key="url"):
+    """?cluster=1 이면 파싱 스레드풀에서 클러스터링 (common/clustering) → 응답에 합칠 dict"""
+    if not cluster:
+        return {}
+    return await run_parse(cluster, articles, fields, url_key)
+
+
+async def thebell(args):
+    """GET /api/async/thebell — /api/thebell 과 같은 파라미터/응답"""
+    try:
+        keyword_filter = keyword_filter_from_args(args)
+    except UnknownKeywordSet as e:
+        return 400, {"error": str(e)}
+    try:
+        since = parse_cursor(args.get("since"))
+    except ValueError:
+        return 400, {"error": "since 커서 형식이 올바르지 않습니다."}
+    try:
+        cluster = cluster_from_args(args)
+        mode = discovery_mode(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    fetch_stats = start_fetch_stats(hedge=_hedge(args))
+    discovery = start_discovery(mode)
+    titles, bodies, urls, dates = await get_todays_news_async()
+    articles = [{"title": t, "body": b, "url": u, "date": d} for t, b, u, d in zip(titles, bodies, urls, dates)]
+    save_articles("thebell", articles, summary="body", published_at="date")
+
+    if keyword_filter:
+        articles = keyword_filter(articles, ["title", "body"])
+    articles, cursor = await run_parse(new_since, "thebell", articles, since)  # 저장 큐 flush는 블로킹
+    cluster_info = await _cluster(cluster, articles, ["title", "body"])
+    articles = articles[:article_cap(args, 100)]  # 전체 모양일 때만 100건, 줄인 응답은 바이트 예산 (index2와 같음)
+
+    payload = {"date": datetime.now(KST).strftime("%Y-%m-%d"), "count": len(articles), "articles": articles,
+               "cursor": cursor, "since": args.get("since"), **cluster_info}
+    if args.get("with_body") in ("1", "true"):
+        concurrency = args.get("concurrency", DEFAULT_CONCURRENCY, type=int)
+        payload["enrichment"] = await enrich_with_body_async(articles, url_key="url", concurrency=concurrency)
+        save_articles("thebell", articles, summary="body", body="content", published_at="date")
+    payload["discovery"] = discovery.as_dict()
+    payload["fetch"] = fetch_stats.as_dict()
+    return 200, payload
+
+
+async def investchosun(args):
+    """GET /api/async/investchosun — /api/investchosun 과 같은 파라미터/응답"""
+    try:
+        keyword_filter = keyword_filter_from_args(args)
+    except UnknownKeywordSet as e:
+        return 400, {"error": str(e)}
+    try:
+        since = parse_cursor(args.get("since"))
+    except ValueError:
+        return 400, {"error": "since 커서 형식이 올바르지 않습니다."}
+    try:
+        catids = parse_categories(args.get("categories"), index4.DEFAULT_CATID)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    try:
+        cluster = cluster_from_args(args)
+        mode = discovery_mode(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    fetch_stats = start_fetch_stats(hedge=_hedge(args))
+    discovery = start_discovery(mode)
+    articles = await get_investchosun_articles_async(catids)
+    save_articles("investchosun", articles, summary="body", published_at="dates")
+
+    if keyword_filter:
+        articles = keyword_filter(articles, ["title", "body"])
+    articles, cursor = await run_parse(new_since, "investchosun", articles, since)
+    cluster_info = await _cluster(cluster, articles, ["title", "body"])
+
+    payload = {"date": index4.TODAY, "categories": catids, "count": len(articles), "articles": articles,
+               "cursor": cursor, "since": args.get("since"), **cluster_info}
+    if args.get("with_body") in ("1", "true"):
+        concurrency = args.get("concurrency", DEFAULT_CONCURRENCY, type=int)
+        payload["enrichment"] = await enrich_with_body_async(articles, url_key="url", concurrency=concurrency)
+        save_articles("investchosun", articles, summary="body", body="content", published_at="dates")
+    payload["discovery"] = discovery.as_dict()
+    payload["fetch"] = fetch_stats.as_dict()
+    return 200, payload
+
+
+async def thesignal(args):
+    """GET /api/async/thesignal — /api/thesignal 과 같은 파라미터/응답"""
+    try:
+        keyword_filter = keyword_filter_from_args(args)
+    except UnknownKeywordSet as e:
+        return 400, {"error": str(e)}
+    try:
+        since = parse_cursor(args.get("since"))
+    except ValueError:
+        return 400, {"error": "since 커서 형식이 올바르지 않습니다."}
+    try:
+        nclasses = parse_categories(args.get("categories"), index.DEFAULT_NCLASS)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    try:
+        cluster = cluster_from_args(args)
+        mode = discovery_mode(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    fetch_stats = start_fetch_stats(hedge=_hedge(args))
+    discovery = start_discovery(mode)
+    all_articles = await get_thesignal_articles_async(nclasses)
+    save_articles("thesignal", all_articles, url="link", published_at="published_at")
+
+    if keyword_filter:
+        all_articles = keyword_filter(all_articles, ["title", "summary"])
+    all_articles, cursor = await run_parse(new_since, "thesignal", all_articles, since, "link")
+    cluster_info = await _cluster(cluster, all_articles, ["title", "summary"], "link")
+
+    return 200, {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "categories": nclasses,
+        "count": len(all_articles),
+        "articles": all_articles,
+        "cursor": cursor,
+        "since": args.get("since"),
+        **cluster_info,
+        "discovery": discovery.as_dict(),
+        "fetch": fetch_stats.as_dict()
+    }
+
+
+async def parse_article(args):
+    """GET /api/async/parse_article?url= — /api/parse_article 과 같은 응답"""
+    url = args.get('url')
+    if not url:
+        return 400, {"error": "URL 파라미터가 필요합니다."}
+
+    try:
+        response = await fetch_async(url, timeout=15)
+        # 문자셋 판별 후 바이트째로 lxml에 (동기 버전과 동일, EUC-KR 페이지도 그대로)
+        title, content_text, extraction = await run_parse(extract_article_bytes, response.content, url,
+                                                          response.headers.get("Content-Type"))
+        save_articles("article", [{"url": url, "title": title, "content": content_text}], summary=None, body="content")
+        return 200, {"success": True, "title": title, "content": content_text, "url": url, "extraction": extraction}
+    except ArticleParseError as e:
+        return 404, {"error": str(e)}
+    except CircuitOpenError as e:
+        return 503, {"error": f"일시적으로 요청 중단: {str(e)}"}
+    except (httpx.HTTPError, ArchiveMiss) as e:
+        return 500, {"error": f"URL 요청 오류: {str(e)}"}
+    except Exception as e:
+        return 500, {"error": f"파싱 오류: {str(e)}"}
+
+
+ROUTES = {
+    "/api/async/thebell": thebell,
+    "/api/async/investchosun": investchosun,
+    "/api/async/thesignal": thesignal,
+    "/api/async/parse_article": parse_article,
+}
+
+
+# ===============================
+# 🔌 ASGI 앱
+# ===============================
+def _header_list(headers):
+    return [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+
+
+async def _send_json(send, status, payload, extra_headers=None, accept_encoding=None):
+    body = dumps(payload)
+    if accept_encoding is not None:
+        body, encoding_headers = encode_body(body, accept_encoding)
+        extra_headers = {**(extra_headers or {}), **encoding_headers}
+    headers = [(b"content-type", b"application/json; charset=utf-8"), (b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers + _header_list(extra_headers or {})})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await close_client()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    handler = ROUTES.get(scope["path"])
+    if handler is None:
+        return await _send_json(send, 404, {"error": "Not Found"})
+    if scope["method"] != "GET":
+        return await _send_json(send, 405, {"error": "Method Not Allowed"})
+
+    args = MultiDict(parse_qsl(scope.get("query_string", b"").decode("utf-8")))
+    request_headers = Headers([(k.decode("latin-1"), v.decode("latin-1")) for k, v in scope.get("headers") or []])
+    try:
+        mode = requested_mode(args, request_headers)
+    except ProfileDenied as e:
+        return await _send_json(send, 403, {"error": str(e)})
+    except ValueError as e:
+        return await _send_json(send, 400, {"error": str(e)})
+    try:
+        shape = response_shape(args)  # ?fields= / ?max_body_chars= (common/response_format)
+    except ValueError as e:
+        return await _send_json(send, 400, {"error": str(e)})
+    session = ProfileSession(mode).start() if mode else None
+    try:
+        status, payload = await handler(args)
+    except Exception as e:
+        print(f"❌ {scope['path']} 처리 오류: {e}")
+        status, payload = 500, {"error": str(e)}
+    finally:
+        # 서버가 요청마다 컨텍스트를 복사하지 않아도 다음 요청이 이 요청의 통계/헤지 설정을 이어받지 않도록
+        end_fetch_stats()
+        end_discovery()
+    if session is not None:
+        # 프로파일링한 응답은 결과를 본문에 붙이고 캐시/304 없이 바로 보낸다 (common/profiling)
+        result = session.finish(scope["path"])
+        return await _send_json(send, status, attach(resolve_cursor(payload), result), profile_headers(result))
+    if status != 200:
+        return await _send_json(send, status, payload)
+
+    # Flask 뷰와 같은 ETag/Cache-Control (common/response_cache) — 경로 끝이 출처 이름
+    source = "article" if handler is parse_article else scope["path"].rsplit("/", 1)[-1]
+    payload = resolve_cursor(shape.apply(payload))
+    headers = cache_headers(payload, source)
+    if etag_matches(request_headers.get("If-None-Match"), headers["ETag"]):
+        await send({"type": "http.response.start", "status": 304, "headers": _header_list(headers)})
+        return await send({"type": "http.response.body", "body": b""})
+    await _send_json(send, status, payload, headers, request_headers.get("Accept-Encoding", ""))
+
@@ -0,0 +1,98 @@
+# api/operations/backfill.py
+# 대량 백필: 여러 날짜 더벨 목록 / 본문이 빠진 저장 기사 / URL 목록을 수집-파싱 분리 파이프라인(common/pipeline.py)으로 처리
+#
+# 실행 예:
+#   python api/operations/backfill.py --missing-body --source thebell --limit 500
+#   python api/operations/backfill.py --urls urls.txt              # 이미 본문을 저장한 URL은 건너뜀 (common/seen_index)
+#   python api/operations/backfill.py --thebell-pages 40        # 오늘 이전 날짜 포함 목록 40페이지
+# 공통 옵션: --fetch-workers 6 --parse-workers <코어 수> --queue-size 32
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # api/common 임포트용
+from common.article_store import flush, save_articles, urls_missing_body
+from common.charset import decode_html
+from common.pipeline import DEFAULT_FETCH_WORKERS, DEFAULT_QUEUE_SIZE, run_pipeline
+from common.seen_index import known_bodies, save as save_seen_index, seen_stats
+
+THEBELL_LIST_URL = "https://www.thebell.co.kr/free/content/article.asp?page={page}&svccode=00"
+SAVE_BATCH = 50
+
+
+def parse_thebell_listing(url, raw):
+    """파서 프로세스용: 더벨 목록 페이지 → 날짜 상관없이 모든 기사 (index2와 같은 파서)"""
+    from index2 import parse_news_page
+    rows = parse_news_page(decode_html(raw), "") or []
+    return {"url": url, "articles": [{"title": t, "body": b, "url": u, "date": d} for t, b, u, d in rows]}
+
+
+def _save(source, records, listing):
+    if listing:
+        save_articles(source, [a for r in records for a in r.get("articles", [])],
+                      summary="body", published_at="date")
+    else:
+        save_articles(source, [r for r in records if "error" not in r], summary=None, body="content")
+
+
+def run(jobs, source, listing=False, fetch_workers=DEFAULT_FETCH_WORKERS, parse_workers=None,
+        queue_size=DEFAULT_QUEUE_SIZE):
+    """jobs: [(url, source), ...] — 파싱 결과를 SAVE_BATCH건씩 저장소에 반영, 파이프라인 통계 반환"""
+    sources = dict(jobs)
+    stats = {}
+    pending = {}
+    parse_fn = {"parse_fn": parse_thebell_listing} if listing else {}
+    for record in run_pipeline(list(sources), fetch_workers=fetch_workers, parse_workers=parse_workers,
+                               queue_size=queue_size, stats=stats, **parse_fn):
+        if "error" in record:
+            print(f"  ❌ {record['url']}: {record['error']}")
+        batch = pending.setdefault(sources.get(record["url"], source), [])
+        batch.append(record)
+        if len(batch) >= SAVE_BATCH:
+            _save(sources.get(record["url"], source), batch, listing)
+            batch.clear()
+    for src, batch in pending.items():
+        _save(src, batch, listing)
+    flush()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--missing-body", action="store_true", help="저장소에서 본문이 없는 기사")
+    mode.add_argument("--urls", help="기사 URL 목록 파일 (한 줄에 하나)")
+    mode.add_argument("--thebell-pages", type=int, help="더벨 목록 N페이지 (여러 날짜)")
+    parser.add_argument("--source", help="--missing-body: 출처 제한 / --urls: 저장 시 출처 이름 (기본 article)")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS)
+    parser.add_argument("--parse-workers", type=int, default=None, help="기본값: CPU 코어 수, 0이면 프로세스 없이")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument("--refetch", action="store_true", help="--urls: 이미 본문을 저장한 URL도 다시 받음")
+    args = parser.parse_args()
+
+    listing = False
+    if args.missing_body:
+        jobs = urls_missing_body(args.source, args.limit)
+    elif args.urls:
+        with open(args.urls, encoding="utf-8") as f:
+            jobs = [(line.strip(), args.source or "article") for line in f if line.strip()][:args.limit]
+        if not args.refetch:
+            known = known_bodies([url for url, _ in jobs])
+            jobs = [job for job in jobs if job[0] not in known]
+            print(f"⏭️ 이미 본문을 저장한 URL {len(known)}건 건너뜀")
+    else:
+        jobs = [(THEBELL_LIST_URL.format(page=p), "thebell") for p in range(1, args.thebell_pages + 1)]
+        listing = True
+
+    print(f"🚚 백필 시작: {len(jobs)}건")
+    started = time.perf_counter()
+    stats = run(jobs, args.source or "article", listing, args.fetch_workers, args.parse_workers, args.queue_size)
+    save_seen_index()
+    print(f"✅ 백필 완료 ({time.perf_counter() - started:.1f}초): {stats}")
+    print(f"🗂️ seen 색인: {seen_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import time
 from urllib.parse import urljoin, quote
 import csv
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # api/common 임포트용
+from common.charset import response_text
+from common.export import EXPORT_FORMAT, write_xlsx
+from common.fetch_policy import MAX_FAILED_PAGES_IN_ROW
+from common.http import fetch
+
 # 4개 컬럼 CSV 저장 함수 (URL, Title, Body, Hyperlink)
 def save_to_csv_with_hyperlink(titles, bodies, urls, filename=None):
     if len(titles) != len(bodies) or len(titles) != len(urls):
@@ -28,6 +35,21 @@ def save_to_csv_with_hyperlink(titles, bodies, urls, filename=None):
     print(f"   → 엑셀에서 'Hyperlink' 컬럼 클릭하면 바로 이동!")
 
 
+# XLSX 저장 (EXPORT_FORMAT=xlsx) — HYPERLINK 수식 대신 하이퍼링크 셀, 행 단위로 바로 파일에 씀
+def save_to_xlsx_with_hyperlink(titles, bodies, urls, filename=None):
+    if len(titles) != len(bodies) or len(titles) != len(urls):
+        raise ValueError("titles, bodies, urls의 길이가 동일해야 합니다.")
+
+    if not filename:
+        today = datetime.now().strftime('%Y%m%d')
+        filename = f"investchosun_news_{today}.xlsx"
+
+    rows = ({"url": u, "title": t, "body": b} for t, b, u in zip(titles, bodies, urls))
+    count = write_xlsx(filename, rows, [("URL", "url"), ("Title", "title"), ("Body", "body")], link=("url", "title"))
+    print(f"XLSX 저장 완료: {filename}")
+    print(f"   → 총 {count}건")
+
+
 def get_todays_investchosun_news():
     # today_str = datetime.now().strftime('%Y.%m.%d')  # "2025.10.27"
     today_str = (datetime.now() - timedelta(days=1)).strftime('%Y.%m.%d')
@@ -36,12 +58,12 @@ def get_todays_investchosun_news():
     urls = []
     page = 1
     max_pages = 50
+    failures_in_row = 0
 
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36',
     }
 
-    session = requests.Session()
     base_url = "https://www.investchosun.com/svc/news/list.html"
 
     print(f"[{today_str}] 인베스트조선 뉴스 수집 시작...")
@@ -53,9 +75,8 @@ def get_todays_investchosun_news():
         }
 
         try:
-            resp = session.get(base_url, params=params, headers=headers, timeout=15)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            resp = fetch(base_url, params=params, headers=headers, timeout=15)
+            soup = BeautifulSoup(response_text(resp), 'html.parser')
 
             # 기사 목록: ul.list_ul > li
             article_items = soup.select('ul.list_ul > li')
@@ -126,12 +147,16 @@ def get_todays_investchosun_news():
                 break
 
             print(f"{page}페이지 완료 (누적 {len(titles)}건)")
-            page += 1
-            time.sleep(0.8)
+            page += 1  # 요청 간격은 common.ratelimit이 호스트별로 조절
+            failures_in_row = 0
 
         except requests.RequestException as e:
+            # fetch가 재시도까지 마친 뒤의 실패 → 이 페이지만 건너뜀 (연속 실패면 중단)
             print(f"{page}페이지 요청 실패: {e}")
-            break
+            failures_in_row += 1
+            if failures_in_row >= MAX_FAILED_PAGES_IN_ROW:
+                break
+            page += 1
         except Exception as e:
             print(f"파싱 오류: {e}")
             break
@@ -153,7 +178,10 @@ if __name__ == "__main__":
         print(f"     요약: {body}")
         print(f"     {url}\n")
 
-    # CSV 저장 (4개 컬럼)
-    save_to_csv_with_hyperlink(titles, bodies, urls)
+    # CSV 저장 (4개 컬럼), EXPORT_FORMAT=xlsx 이면 엑셀 파일
+    if EXPORT_FORMAT == "xlsx":
+        save_to_xlsx_with_hyperlink(titles, bodies, urls)
+    else:
+        save_to_csv_with_hyperlink(titles, bodies, urls)
 
-    print("CSV 파일 생성 완료!")
\ No newline at end of file
+    print(f"{EXPORT_FORMAT.upper()} 파일 생성 완료!")
\ No newline at end of file
@@ -1,10 +1,17 @@
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import pandas as pd
-import re
-import time
-import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # api/common 임포트용
+from common.charset import response_text
+from common.company_index import normalize_company
+from common.export import EXPORT_FORMAT, write_xlsx
+from common.google_news import search_google_news
+from common.http import fetch
+from common.keywords import get_matcher
 
 # =============================================================================
 # 설정
@@ -17,8 +24,8 @@ headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36'
 }
 
-# 키워드 리스트 (제목에 포함되어야 함)
-TITLE_KEYWORDS = ['투자', '유치', '선정', '지원금', '시리즈']
+# 키워드 (제목에 포함되어야 함) — api/index3.py와 같은 "startup_funding" 세트 사용
+TITLE_KEYWORDS = get_matcher("startup_funding")
 
 # =============================================================================
 # PART 1: startuprecipe.co.kr 크롤링 (전처리)
@@ -26,13 +33,12 @@ TITLE_KEYWORDS = ['투자', '유치', '선정', '지원금', '시리즈']
 def crawl_startup_invest():
     url = "https://startuprecipe.co.kr/invest"
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        response = fetch(url, headers=headers, timeout=10)
     except Exception as e:
         print(f"사이트 접속 실패: {e}")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.text, 'lxml')
+    soup = BeautifulSoup(response_text(response), 'lxml')
     tbody = soup.find('tbody')
     if not tbody:
         print("tbody를 찾을 수 없습니다.")
@@ -55,8 +61,7 @@ def crawl_startup_invest():
         if '인수합병' in stage_text:
             continue
 
-        company_name = re.sub(r'\s*\(.*?\)\s*', '', company_text)
-        company_name = re.sub(r'[^\w가-힣&\s-]', '', company_name).strip()
+        company_name = normalize_company(company_text)
         if not company_name:
             continue
 
@@ -81,62 +86,13 @@ def crawl_startup_invest():
 # =============================================================================
 # PART 2: 구글 뉴스 검색 - 회사명 검색 후 제목 키워드 필터링
 # =============================================================================
-def search_google_news_for_company(company_name):
+def search_google_news_for_company(company_name, backend=None):
     """
     1. 회사명으로 구글 뉴스 검색 (최근 1일)
     2. 결과 기사 중 제목에 TITLE_KEYWORDS 포함된 첫 번째 기사 반환
+    backend: "rss"(기본, 검색 피드 스트리밍, 첫 매치에서 중단, 실패하면 html) | "html"(결과 페이지 스크래핑)
     """
-    query = f'"{company_name}"'  # 회사명만 검색
-    params = {
-        'q': query,
-        'tbs': 'qdr:d',  # 최근 1일
-        'hl': 'ko',
-        'gl': 'kr',
-        'num': 10        # 최대 10개 요청 → 필터링
-    }
-    
-    search_url = 'https://news.google.com/search?' + urllib.parse.urlencode(params)
-    
-    try:
-        time.sleep(1.5)
-        response = requests.get(search_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-
-        # 모든 기사 링크 찾기
-        article_links = soup.find_all('a', href=True)
-        
-        for a in article_links:
-            # 제목 추출 (h3, h4, div 등 가능)
-            title_tag = a.find(['h3', 'h4']) or a
-            title_text = title_tag.get_text(strip=True)
-            
-            if len(title_text) < 5:
-                continue
-
-            # 제목에 키워드 포함 여부 확인
-            if any(keyword in title_text for keyword in TITLE_KEYWORDS):
-                # 링크 정제
-                raw_link = a['href']
-                if raw_link.startswith('./'):
-                    link = 'https://news.google.com' + raw_link[1:]
-                elif raw_link.startswith('/'):
-                    link = 'https://news.google.com' + raw_link
-                elif '/url?q=' in raw_link:
-                    link = urllib.parse.unquote(raw_link.split('/url?q=')[1].split('&')[0])
-                else:
-                    link = raw_link
-
-                return {
-                    'title': title_text,
-                    'link': link
-                }
-        
-        return {'title': None, 'link': None}
-    
-    except Exception as e:
-        print(f"뉴스 검색 실패 ({company_name}): {e}")
-        return {'title': None, 'link': None}
+    return search_google_news(company_name, TITLE_KEYWORDS, headers, backend=backend)
 
 # =============================================================================
 # MAIN
@@ -167,10 +123,15 @@ else:
             'hyperlink' : hyperlink
         })
 
-    # 최종 저장
+    # 최종 저장 (EXPORT_FORMAT=xlsx 이면 hyperlink 수식 대신 하이퍼링크 셀)
     df_final = pd.DataFrame(results)
-    final_csv = f'startuprecipe_news_{YESTERDAY}.csv'
-    df_final.to_csv(final_csv, index=False, encoding='utf-8-sig')
+    if EXPORT_FORMAT == "xlsx":
+        final_csv = f'startuprecipe_news_{YESTERDAY}.xlsx'
+        write_xlsx(final_csv, results, [('company', 'company'), ('news_title', 'news_title'), ('news_link', 'news_link')],
+                   link=('news_link', 'news_title'))
+    else:
+        final_csv = f'startuprecipe_news_{YESTERDAY}.csv'
+        df_final.to_csv(final_csv, index=False, encoding='utf-8-sig')
 
     print(f"\n완료! {len(df_final)}건 처리 → {final_csv}")
     print("\n결과 요약:")
@@ -1,12 +1,17 @@
 # api/operations/newsclipping_thebell.py
-import time
+import os
+import sys
 from datetime import datetime, timedelta
 from urllib.parse import urljoin
 
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # api/common 임포트용
+from common.charset import response_text
+from common.fetch_policy import MAX_FAILED_PAGES_IN_ROW
+from common.http import fetch
+
 
 def run(params: dict = None):
     """
@@ -21,6 +26,7 @@ def run(params: dict = None):
     titles, bodies, urls = [], [], []
     page = 1
     max_pages = 50
+    failures_in_row = 0
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -34,9 +40,8 @@ def run(params: dict = None):
         print(f"  페이지 {page}: {url}")
 
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
+            resp = fetch(url, headers=headers, timeout=10)
+            soup = BeautifulSoup(response_text(resp), "html.parser")
             items = soup.find_all("li")
             has_today = False
 
@@ -71,12 +76,15 @@ def run(params: dict = None):
             if not items:
                 break
 
-            page += 1
-            time.sleep(0.7)
+            page += 1  # 요청 간격은 common.ratelimit이 호스트별로 조절
+            failures_in_row = 0
 
         except Exception as e:
             print(f"  페이지 {page} 오류: {e}")
-            break
+            failures_in_row += 1
+            if failures_in_row >= MAX_FAILED_PAGES_IN_ROW:
+                break
+            page += 1  # 실패한 페이지만 건너뜀
 
     # DataFrame 생성
     df = pd.DataFrame({
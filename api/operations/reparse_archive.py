@@ -0,0 +1,90 @@
+# api/operations/reparse_archive.py
+# 원본 보관소(common/raw_archive)에 쌓인 목록 페이지를 현재 파서로 다시 파싱해 기사 저장소에 반영 (네트워크 없음)
+# (보관소는 엔드포인트를 RAW_ARCHIVE_MODE=record 로 돌려야 쌓인다 — 기본은 off)
+#
+# 실행 예:
+#   python api/operations/reparse_archive.py --source thebell --from 2025-09-01 --to 2025-11-01
+#   python api/operations/reparse_archive.py --source all --parse-workers 4
+# 선택자를 고친 뒤 지난 몇 달치를 CPU 속도로 다시 뽑을 때 쓴다. 스냅샷의 날짜는 "받은 날"을 기준으로 판단한다.
+# (스크래퍼를 통째로 오프라인으로 돌리려면 RAW_ARCHIVE_MODE=replay 로 엔드포인트/스크립트를 실행)
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # api/common 임포트용
+from common.article_store import flush, save_articles
+from common.charset import decode_html
+from common.pipeline import run_pipeline
+from common.raw_archive import archive_stats, iter_snapshots, read_blob
+
+# 출처 → 보관소 URL 접두어
+LISTING_PREFIXES = {
+    "thebell": "https://www.thebell.co.kr/free/content/article.asp?",
+    "investchosun": "https://www.investchosun.com/svc/news/list.html?",
+    "thesignal": "https://signalm.sedaily.com/Main/Content/SubMain?",
+}
+
+
+def read_snapshot(job):
+    return read_blob(job[2])
+
+
+def parse_snapshot(job, raw):
+    """파서 프로세스용: (url, fetched_at, sha256, source) 스냅샷 → 기사 dict 목록 (각 엔드포인트와 같은 파서)"""
+    url, fetched_at, _, source = job
+    html = decode_html(raw)  # 보관 당시 Content-Type은 색인에만 있으므로 BOM/<meta>로 판별
+    day = datetime.strptime(fetched_at[:10], "%Y-%m-%d")
+    if source == "thebell":
+        from index2 import parse_news_page
+        rows = parse_news_page(html, day.strftime("%Y-%m-%d")) or []
+        articles = [{"title": t, "summary": b, "url": u, "published_at": d} for t, b, u, d in rows]
+    elif source == "investchosun":
+        from index4 import parse_news_page
+        days = ((day - timedelta(days=1)).strftime("%Y.%m.%d"), day.strftime("%Y.%m.%d"))
+        rows = parse_news_page(html, days) or []
+        articles = [{"title": t, "summary": b, "url": u, "published_at": d} for t, b, u, d in rows]
+    else:
+        from index import parse_page_articles
+        articles = [{"title": a["title"], "summary": a["summary"], "url": a["link"], "published_at": a["published_at"]}
+                    for a in parse_page_articles(html)]
+    return {"url": url, "source": source, "articles": articles}
+
+
+def run(sources, date_from=None, date_to=None, parse_workers=0):
+    jobs = [(url, fetched_at, sha, source)
+            for source in sources
+            for url, fetched_at, sha in iter_snapshots(LISTING_PREFIXES[source], date_from, date_to)]
+    print(f"🗂️ 스냅샷 {len(jobs)}개 재파싱 (파서 프로세스 {parse_workers}개)")
+    started = time.perf_counter()
+    stats = {}
+    saved = {}
+    for record in run_pipeline(jobs, parse_fn=parse_snapshot, fetch_fn=read_snapshot, fetch_workers=2,
+                               parse_workers=parse_workers, stats=stats):
+        if "error" in record:
+            print(f"  ❌ {record['url']}: {record['error']}")
+            continue
+        save_articles(record["source"], record["articles"], published_at="published_at")
+        saved[record["source"]] = saved.get(record["source"], 0) + len(record["articles"])
+    flush()
+    elapsed = time.perf_counter() - started
+    print(f"✅ {elapsed:.1f}초, {len(jobs) / elapsed if elapsed else 0:.0f} 페이지/초, 출처별 기사 {saved}")
+    return stats, saved
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", choices=[*LISTING_PREFIXES, "all"], default="all")
+    parser.add_argument("--from", dest="date_from", help="받은 시각 하한 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="받은 시각 상한, 미포함 (YYYY-MM-DD)")
+    parser.add_argument("--parse-workers", type=int, default=0, help="0이면 현재 프로세스에서 파싱")
+    args = parser.parse_args()
+
+    sources = list(LISTING_PREFIXES) if args.source == "all" else [args.source]
+    print(f"보관소: {archive_stats()}")
+    run(sources, args.date_from, args.date_to, args.parse_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# bench/bench_async.py
+# 동시 요청 처리량: Flask(동기 뷰) vs ASGI(api/index7.py, asyncio 크롤러) — 로컬 스텁 서버 기준
+#
+# 실행: python bench/bench_async.py [--clients 8] [--rounds 2] [--latency-ms 80] [--path thesignal] [--json]
+#
+# - flask x1      : 동기 워커 1개 (Vercel 인스턴스 하나가 크롤링 하나만 처리하는 상황)
+# - flask x{N}    : 스레드 N개가 각자 Flask 뷰 실행 (스레드 워커로 늘린 경우)
+# - asgi          : 이벤트 루프 하나에서 ASGI 앱에 N개 요청을 동시에
+# 스텁 서버 호스트 속도 제한은 크게 풀어 둔다 (측정 대상은 워커 모델이지 예의 있는 요청 간격이 아님).
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import stub_server
+
+HOSTS = ["www.thebell.co.kr", "www.investchosun.com", "signalm.sedaily.com"]
+FLASK_ROUTES = {
+    "thebell": ("index2", "/api/thebell"),
+    "investchosun": ("index4", "/api/investchosun"),
+    "thesignal": ("index", "/api/thesignal"),
+}
+
+
+def _summary(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    return {"mode": label, "requests": len(latencies), "elapsed_s": round(elapsed, 2),
+            "req_per_s": round(len(latencies) / elapsed, 2),
+            "p50_s": round(statistics.median(latencies), 2),
+            "p95_s": round(latencies[max(0, int(len(latencies) * 0.95) - 1)], 2)}
+
+
+def run_flask(path, n, workers):
+    module, route = FLASK_ROUTES[path]
+    client = __import__(module).app.test_client()
+
+    def one(_):
+        started = time.monotonic()
+        resp = client.get(route)
+        assert resp.status_code == 200, resp.status_code
+        return time.monotonic() - started, resp.get_json()["count"]
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(one, range(n)))
+    return [r[0] for r in results], time.monotonic() - started, results[0][1]
+
+
+async def _call_asgi(app, path):
+    """ASGI 앱을 서버 없이 직접 호출 → (상태 코드, JSON)"""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []}
+    await app(scope, receive, send)
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return sent[0]["status"], json.loads(body)
+
+
+def run_asgi(path, n):
+    import index7
+
+    async def main():
+        async def one():
+            started = time.monotonic()
+            status, payload = await _call_asgi(index7.app, f"/api/async/{path}")
+            assert status == 200, status
+            return time.monotonic() - started, payload["count"]
+
+        started = time.monotonic()
+        results = await asyncio.gather(*(one() for _ in range(n)))
+        elapsed = time.monotonic() - started
+        await index7.close_client()
+        return [r[0] for r in results], elapsed, results[0][1]
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--rounds", type=int, default=2, help="클라이언트당 요청 수")
+    parser.add_argument("--latency-ms", type=int, default=80)
+    parser.add_argument("--path", choices=sorted(FLASK_ROUTES), default="thesignal")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    server, state, base_url = stub_server.start(latency_ms=args.latency_ms)
+    os.environ["UPSTREAM_STUB_URL"] = base_url  # common.http 임포트 전에 설정
+    os.environ["RATE_LIMITS_JSON"] = json.dumps({h: {"start": 500, "max": 1000} for h in HOSTS})
+    os.environ.setdefault("ARTICLE_STORE", "0")
+
+    n = args.clients * args.rounds
+    rows = []
+    for label, runner in [("flask x1", lambda: run_flask(args.path, n, 1)),
+                          (f"flask x{args.clients}", lambda: run_flask(args.path, n, args.clients)),
+                          ("asgi", lambda: run_asgi(args.path, n))]:
+        latencies, elapsed, count = runner()
+        rows.append({**_summary(label, latencies, elapsed), "articles": count})
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps({"path": args.path, "latency_ms": args.latency_ms, "results": rows},
+                         ensure_ascii=False, indent=2))
+        return
+    print(f"/{args.path}: {n} requests, {args.clients} concurrent, stub latency {args.latency_ms}ms, cpus {os.cpu_count()}")
+    print(f"{'mode':<12} {'req/s':>7} {'elapsed_s':>10} {'p50_s':>7} {'p95_s':>7} {'articles':>9}")
+    for r in rows:
+        print(f"{r['mode']:<12} {r['req_per_s']:>7} {r['elapsed_s']:>10} {r['p50_s']:>7} {r['p95_s']:>7} {r['articles']:>9}")
+
+
+if __name__ == "__main__":
+    main()
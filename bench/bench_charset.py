@@ -0,0 +1,110 @@
+# bench/bench_charset.py
+# 응답 디코딩+파싱: requests resp.text / apparent_encoding 추측 / utf-8 고정 vs common/charset 판별 후 한 번만 디코딩
+#
+# 실행: python bench/bench_charset.py [--pages 200] [--repeat 3] [--json]
+# 코퍼스: bench/fixtures.article_page — 절반은 utf-8(Content-Type에 charset), 절반은 EUC-KR(<meta>만, 헤더 charset 없음)
+# 네트워크 없이 requests.Response를 직접 만들어 디코딩/파싱 비용만 잰다. 제목이 제대로 읽힌 페이지 수도 함께 센다.
+import argparse
+import json
+import os
+import sys
+import time
+
+import lxml.html
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import fixtures
+from common.charset import decode_html, parse_document
+
+
+def corpus(n):
+    pages = []
+    for i in range(n):
+        path = f"news{i % 20}.example.com/article/{i}"
+        if i % 2:
+            html = fixtures.article_page(path, charset="euc-kr")
+            content, content_type = html.encode("cp949", "xmlcharrefreplace"), "text/html"
+        else:
+            html = fixtures.article_page(path)
+            content, content_type = html.encode(), "text/html; charset=utf-8"
+        title = lxml.html.document_fromstring(html).findtext(".//title")
+        pages.append((content, content_type, title))
+    return pages
+
+
+def _response(content, content_type):
+    resp = requests.Response()
+    resp._content = content
+    resp.headers["Content-Type"] = content_type
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
+def requests_text(content, content_type):
+    """기존 스크래퍼: resp.text (헤더에 charset 없으면 requests 기본값 ISO-8859-1)"""
+    return lxml.html.document_fromstring(_response(content, content_type).text)
+
+
+def apparent_encoding(content, content_type):
+    """헤더를 못 믿을 때 흔히 쓰는 resp.encoding = resp.apparent_encoding (본문 통계 추측)"""
+    resp = _response(content, content_type)
+    resp.encoding = resp.apparent_encoding
+    return lxml.html.document_fromstring(resp.text)
+
+
+def forced_utf8(content, content_type):
+    """기존 parse_article: response.encoding = 'utf-8' 고정"""
+    resp = _response(content, content_type)
+    resp.encoding = "utf-8"
+    return lxml.html.document_fromstring(resp.text)
+
+
+def sniffed_str(content, content_type):
+    """판별은 같게 하되 인코딩과 상관없이 항상 str로 디코딩한 뒤 lxml에"""
+    return lxml.html.document_fromstring(decode_html(content, content_type))
+
+
+def sniffed(content, content_type):
+    """common/charset: 헤더 → BOM → <meta> 판별, utf-8은 바이트째 lxml에 / cp949는 파이썬 디코딩 후"""
+    return parse_document(content, content_type)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    pages = corpus(args.pages)
+    rows = []
+    for label, fn in (("resp.text", requests_text), ("apparent_encoding", apparent_encoding),
+                      ("forced utf-8", forced_utf8), ("sniff + decode + str", sniffed_str),
+                      ("sniff + parse_document", sniffed)):
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            docs = [fn(content, content_type) for content, content_type, _ in pages]
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        correct = sum(doc.findtext(".//title") == title for doc, (_, _, title) in zip(docs, pages))
+        rows.append({"mode": label, "ms_per_page": round(best / len(pages) * 1000, 3),
+                     "titles_ok": correct, "pages": len(pages)})
+
+    base = rows[0]["ms_per_page"]
+    for r in rows:
+        r["speedup"] = round(base / r["ms_per_page"], 2)
+    if args.json:
+        print(json.dumps({"pages": args.pages, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"{args.pages} article pages (half utf-8 with header charset, half EUC-KR with <meta> only), best of {args.repeat}")
+    print(f"{'mode':<24} {'ms/page':>8} {'speedup':>8} {'titles ok':>10}")
+    for r in rows:
+        print(f"{r['mode']:<24} {r['ms_per_page']:>8} {r['speedup']:>8} {r['titles_ok']:>6}/{r['pages']}")
+
+
+if __name__ == "__main__":
+    main()
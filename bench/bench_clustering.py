@@ -0,0 +1,102 @@
+# bench/bench_clustering.py
+# 기사 클러스터링(common/clustering) 속도 + 품질: 기사 수별 소요 시간, 정답 딜 기준 pair precision/recall
+#
+# 실행: python bench/bench_clustering.py [--sizes 200,500,1000] [--threshold 0.35] [--repeat 3] [--json]
+#
+# 코퍼스: 딜(회사 + 사건) 하나를 여러 매체가 서로 다른 제목 틀로 쓴 것처럼 만든다 (딜당 1~6건, 요약에 금액/관용 문장).
+# 같은 딜 기사끼리 같은 클러스터에 들어가면 정답. pair precision = 같은 클러스터로 묶은 쌍 중 실제 같은 딜 비율.
+# 회사 x 사건 조합이 540개뿐이라 기사 ~1,800건을 넘으면 같은 조합의 "다른 딜"이 생겨 precision이 실제보다 낮게 나온다.
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import fixtures
+from common.clustering import DEFAULT_THRESHOLD, cluster_articles
+
+TEMPLATES = [
+    "{c}, {p}",
+    "[단독] {c} {p}",
+    "{c} {p}…{a} 규모",
+    "{p} 나선 {c}, {a}",
+    "{c}, {a} {p} 마무리",
+    "'{c}' {p} 속도",
+]
+BOILERPLATE = [
+    "투자 업계에 따르면 이번 거래는 기존 주주와 신규 투자자가 함께 참여했다.",
+    "업계 관계자는 밸류에이션이 직전 라운드 대비 두 배 이상 높아졌다고 설명했다.",
+    "회사는 확보한 자금을 연구개발과 해외 시장 확대에 투입할 계획이다.",
+    "시장에서는 하반기 추가 거래 가능성도 거론된다.",
+    "자세한 조건은 공개되지 않았다.",
+]
+
+
+def corpus(n, seed=0):
+    """→ (기사 dict 목록, 정답 딜 번호 목록)"""
+    rng = fixtures._rng("clustering", seed)
+    articles, truth = [], []
+    deals = [(c, p) for c in fixtures.COMPANIES for p in fixtures.DEAL_PHRASES]
+    rng.shuffle(deals)
+    deal = 0
+    while len(articles) < n:
+        # 회사+사건 조합은 딜마다 다르게 (같은 회사의 다른 사건, 같은 사건 유형의 다른 회사는 얼마든지 나온다)
+        company, phrase = deals[deal % len(deals)]
+        amount = f"{rng.randint(5, 900) * 10}억원"
+        for _ in range(min(rng.randint(1, 6), n - len(articles))):
+            title = rng.choice(TEMPLATES).format(c=company, p=phrase, a=amount)
+            lead = f"{company}가 {amount} 규모의 {phrase}에 나섰다."
+            summary = " ".join([lead] + rng.sample(BOILERPLATE, 2))
+            articles.append({"title": title, "summary": summary, "url": f"https://example.com/{len(articles)}"})
+            truth.append(deal)
+        deal += 1
+    return articles, truth
+
+
+def pair_scores(labels, truth):
+    """같은 클러스터로 묶은 쌍 vs 실제 같은 딜 쌍 → (precision, recall)"""
+    def pairs(counter):
+        return sum(c * (c - 1) // 2 for c in counter.values())
+
+    predicted = pairs(Counter(labels))
+    actual = pairs(Counter(truth))
+    both = pairs(Counter(zip(labels, truth)))
+    return (round(both / predicted, 3) if predicted else 1.0), (round(both / actual, 3) if actual else 1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="200,500,1000")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    for n in (int(s) for s in args.sizes.split(",")):
+        articles, truth = corpus(n)
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            _, clusters, stats = cluster_articles(articles, ["title", "summary"], threshold=args.threshold)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        precision, recall = pair_scores([a["cluster"] for a in articles], truth)
+        rows.append({"articles": n, "deals": len(set(truth)), "ms": round(best * 1000, 1), "clusters": stats["clusters"],
+                     "pair_precision": precision, "pair_recall": recall})
+
+    if args.json:
+        print(json.dumps({"threshold": args.threshold, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"threshold {args.threshold}, best of {args.repeat}")
+    print(f"{'articles':>8} {'deals':>6} {'ms':>8} {'clusters':>9} {'precision':>10} {'recall':>7}")
+    for r in rows:
+        print(f"{r['articles']:>8} {r['deals']:>6} {r['ms']:>8} {r['clusters']:>9} {r['pair_precision']:>10} {r['pair_recall']:>7}")
+
+
+if __name__ == "__main__":
+    main()
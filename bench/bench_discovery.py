@@ -0,0 +1,108 @@
+# bench/bench_discovery.py
+# 목록 수집: 목록 HTML 페이지 크롤링 vs 피드 우선(common/feeds) — 크롤링 1회당 받은 바이트, 요청 수, CPU, 소요 시간
+#
+# 실행: python bench/bench_discovery.py [--repeat 3] [--latency-ms 30] [--feed-urls] [--json]
+# 기본은 배포 기본값 그대로 자동 탐색 (인베스트조선/시그널: 목록의 <link rel="alternate">. 더벨 스텁은 요약 없는 뉴스
+# 사이트맵만 있어 목록 레코드를 다 못 채우므로 자동 탐색이 쓰지 않는다 → HTML).
+# --feed-urls 면 스텁의 피드 경로(.../rss.xml, .../atom.xml)를 FEED_URLS_JSON으로 직접 연결한다.
+# 같은 크롤러를 discovery=html / auto로 돌리고 두 방식의 레코드가 완전히 같아야 한다 (다르면 AssertionError로 중단).
+# 자동 탐색 요청은 첫 크롤링에만 든다.
+# 바이트/요청 수는 스텁 통계, CPU는 크롤링 스레드의 thread_time.
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import stub_server
+
+HOSTS = ("www.thebell.co.kr", "www.investchosun.com", "signalm.sedaily.com")
+FEED_URLS = {
+    "thebell": "https://www.thebell.co.kr/free/content/rss.xml",
+    "investchosun": "https://www.investchosun.com/rss.xml?catid={category}",
+    "thesignal": "https://signalm.sedaily.com/Main/Content/atom.xml?NClass={category}",
+}
+
+
+def crawlers():
+    """출처별 (스텁 호스트, 크롤링 함수) — 엔드포인트가 부르는 것과 같은 함수"""
+    import index
+    import index2
+    import index4
+    return {
+        "thebell": ("www.thebell.co.kr", lambda: list(zip(*index2.get_todays_news()))),
+        "investchosun": ("www.investchosun.com", lambda: list(zip(*index4.get_todays_investchosun_news()))),
+        "thesignal": ("signalm.sedaily.com", lambda: index.get_recent_articles()),
+    }
+
+
+def _measure(state, host, crawl, mode):
+    from common.feeds import start_discovery
+    before = state.snapshot().get(host, {"ok": 0, "bytes": 0})
+    discovery = start_discovery(mode)
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    records = crawl()
+    cpu_ms = (time.thread_time() - cpu_started) * 1000
+    wall_ms = (time.perf_counter() - started) * 1000
+    after = state.snapshot()[host]
+    sources = sorted({c["source"] for c in discovery.as_dict()["crawls"]})
+    return records, {"requests": after["ok"] - before["ok"], "bytes": after["bytes"] - before["bytes"],
+                     "cpu_ms": cpu_ms, "wall_ms": wall_ms, "source": ",".join(sources)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=int, default=30)
+    parser.add_argument("--feed-urls", action="store_true", help="자동 탐색 대신 FEED_URLS_JSON으로 피드 주소 지정")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    server, state, base_url = stub_server.start(latency_ms=args.latency_ms)
+    os.environ["UPSTREAM_STUB_URL"] = base_url  # common.http 임포트 전에 설정
+    os.environ["RAW_ARCHIVE_MODE"] = "off"
+    os.environ["RATE_LIMITS_JSON"] = json.dumps({h: {"start": 500, "max": 1000} for h in HOSTS})
+    if args.feed_urls:
+        os.environ["FEED_URLS_JSON"] = json.dumps(FEED_URLS)
+
+    rows = []
+    for source, (host, crawl) in crawlers().items():
+        runs = {"html": [], "auto": []}
+        records = {}
+        for _ in range(args.repeat):
+            for mode in runs:
+                records[mode], stats = _measure(state, host, crawl, mode)
+                runs[mode].append(stats)
+            assert records["auto"] == records["html"], f"{source}: 피드 경로와 HTML 경로의 레코드가 다름"
+        html, feed = ({k: statistics.median(r[k] for r in runs[m]) for k in ("requests", "bytes", "cpu_ms", "wall_ms")}
+                      for m in ("html", "auto"))
+        rows.append({
+            "source": source, "items": len(records["auto"]), "identical": records["html"] == records["auto"],
+            "feed_used": runs["auto"][-1]["source"],
+            "html": {k: round(v, 1) for k, v in html.items()},
+            "feed": {k: round(v, 1) for k, v in feed.items()},
+            "bytes_saved": int(html["bytes"] - feed["bytes"]),
+            "cpu_ms_saved": round(html["cpu_ms"] - feed["cpu_ms"], 1),
+        })
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps({"repeat": args.repeat, "latency_ms": args.latency_ms, "results": rows},
+                         ensure_ascii=False, indent=2))
+        return
+    print(f"median of {args.repeat} crawls per mode, stub latency {args.latency_ms}ms")
+    print(f"{'source':<13} {'items':>5} {'same':>5} {'mode':<5} {'reqs':>5} {'bytes':>9} {'cpu_ms':>8} {'wall_ms':>8}")
+    for r in rows:
+        for mode in ("html", "feed"):
+            m = r[mode]
+            print(f"{r['source']:<13} {r['items']:>5} {str(r['identical']):>5} {mode:<5} {m['requests']:>5} "
+                  f"{int(m['bytes']):>9} {m['cpu_ms']:>8} {m['wall_ms']:>8}")
+        print(f"{'':<13} saved per crawl: {r['bytes_saved']} bytes, {r['cpu_ms_saved']} ms CPU (feed source: {r['feed_used']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench/bench_keywords.py
+# 키워드 매칭 벤치마크: any()/in 반복 방식 vs KeywordMatcher (common/keywords.py)
+# (KeywordMatcher는 키워드가 AUTOMATON_MIN_KEYWORDS개 미만이면 in 반복, 이상이면 Aho-Corasick 오토마톤을 쓴다)
+#
+# 실행: python bench/bench_keywords.py [--articles 2000] [--json]
+# 키워드 수를 늘려 가며 기사 제목+요약 전체를 점수 매기는 데 걸린 시간을 비교한다.
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+from common.keywords import KeywordMatcher, get_matcher
+
+SYLLABLES = "가나다라마바사아자차카타파하투자유치시리즈펀드인수합병상장지분매각결성출자운용"
+
+
+def _word(rng, lo=2, hi=4):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(lo, hi)))
+
+
+def make_keywords(rng, count):
+    base = dict(get_matcher("deal").weights)
+    keywords = dict(list(base.items())[:count])
+    while len(keywords) < count:
+        keywords[_word(rng, 3, 5)] = round(rng.uniform(0.5, 3.0), 1)
+    return keywords
+
+
+def make_texts(rng, count, keywords):
+    vocab = list(keywords)
+    texts = []
+    for _ in range(count):
+        words = [_word(rng) for _ in range(rng.randint(15, 40))]  # 제목 + 요약 분량
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words)), rng.choice(vocab))
+        texts.append(" ".join(words))
+    return texts
+
+
+def naive_score(keywords, text):
+    text = text.lower()
+    return sum(w for k, w in keywords.items() if k in text)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--counts", default="6,25,100,300,1000,3000")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rows = []
+    for count in [int(c) for c in args.counts.split(",")]:
+        keywords = {k.lower(): w for k, w in make_keywords(rng, count).items()}
+        texts = make_texts(rng, args.articles, keywords)
+
+        started = time.perf_counter()
+        naive = [naive_score(keywords, t) for t in texts]
+        naive_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        compile_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        ac = [matcher.score(t)[0] for t in texts]
+        ac_s = time.perf_counter() - started
+
+        assert all(abs(a - b) < 1e-9 for a, b in zip(naive, ac)), "점수 불일치"
+        rows.append({
+            "keywords": count,
+            "articles": args.articles,
+            "naive_ms": round(naive_s * 1000, 1),
+            "matcher_ms": round(ac_s * 1000, 1),
+            "compile_ms": round(compile_s * 1000, 1),
+            "speedup": round(naive_s / ac_s, 2),
+        })
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    print(f"{'keywords':>8} {'naive_ms':>10} {'matcher_ms':>10} {'compile_ms':>10} {'speedup':>8}")
+    for r in rows:
+        print(f"{r['keywords']:>8} {r['naive_ms']:>10} {r['matcher_ms']:>10} {r['compile_ms']:>10} {r['speedup']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench/bench_pipeline.py
+# 기사 본문 백필: 스레드에서 받고 바로 파싱(enrich 방식) vs 수집/파싱 분리 파이프라인(common/pipeline.py, 파서 프로세스 수별)
+#
+# 실행: python bench/bench_pipeline.py [--articles 200] [--domains 40] [--latency-ms 30] [--json]
+# 코퍼스: bench/fixtures.article_page (도메인이 많을수록 템플릿 캐시 적중이 줄어 readability 비중이 커짐)
+# 파서 프로세스 이득은 코어 수에 비례한다 — 결과 머리에 cpu 수를 함께 찍는다.
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import stub_server
+
+
+def corpus(n, domains):
+    return [f"https://news{i % domains}.example.com/article/{i}" for i in range(n)]
+
+
+def run_threads(urls, workers):
+    """기존 방식: 스레드 하나가 받고 곧바로 파싱 (파싱이 GIL을 쥔다)"""
+    from common.pipeline import fetch_raw, parse_article_record
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        records = list(pool.map(lambda u: parse_article_record(u, fetch_raw(u)), urls))
+    return records, time.perf_counter() - started, {}
+
+
+def run_split(urls, workers, parse_workers):
+    from common.pipeline import run_pipeline
+    stats = {}
+    started = time.perf_counter()
+    records = list(run_pipeline(urls, fetch_workers=workers, parse_workers=parse_workers, stats=stats))
+    return records, time.perf_counter() - started, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--domains", type=int, default=40)
+    parser.add_argument("--latency-ms", type=int, default=30)
+    parser.add_argument("--fetch-workers", type=int, default=6)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    server, _, base_url = stub_server.start(latency_ms=args.latency_ms)
+    urls = corpus(args.articles, args.domains)
+    # common.* 임포트 전에 설정 (파서 프로세스도 이 환경을 물려받음)
+    os.environ["UPSTREAM_STUB_URL"] = base_url
+    os.environ["RATE_LIMITS_JSON"] = json.dumps(
+        {f"news{i}.example.com": {"start": 500, "max": 1000} for i in range(args.domains)})
+    template_dir = tempfile.mkdtemp()
+
+    modes = [("threads (fetch+parse)", lambda: run_threads(urls, args.fetch_workers)),
+             ("pipeline, inline parse", lambda: run_split(urls, args.fetch_workers, 0))]
+    for n in sorted({1, 2, 4, os.cpu_count() or 1}):
+        modes.append((f"pipeline, {n} parser proc", lambda n=n: run_split(urls, args.fetch_workers, n)))
+
+    rows = []
+    for i, (label, runner) in enumerate(modes):
+        # 모드마다 빈 템플릿 캐시로 시작 (앞 모드가 배운 템플릿을 물려받지 않게)
+        os.environ["ARTICLE_TEMPLATE_PATH"] = os.path.join(template_dir, f"templates_{i}.json")
+        from common import article
+        article.TEMPLATE_CACHE_PATH, article._cache = os.environ["ARTICLE_TEMPLATE_PATH"], None
+        records, elapsed, stats = runner()
+        ok = sum("error" not in r for r in records)
+        rows.append({"mode": label, "ok": ok, "elapsed_s": round(elapsed, 2),
+                     "pages_per_s": round(len(records) / elapsed, 1),
+                     "backpressure_waits": stats.get("backpressure_waits"), "max_queue": stats.get("max_queue")})
+    server.shutdown()
+
+    base = rows[0]["elapsed_s"]
+    for r in rows:
+        r["speedup"] = round(base / r["elapsed_s"], 2)
+    if args.json:
+        print(json.dumps({"cpus": os.cpu_count(), "articles": args.articles, "results": rows},
+                         ensure_ascii=False, indent=2))
+        return
+    print(f"{args.articles} articles over {args.domains} domains, stub latency {args.latency_ms}ms, cpus {os.cpu_count()}")
+    print(f"{'mode':<26} {'ok':>4} {'elapsed_s':>10} {'pages/s':>8} {'speedup':>8} {'bp_waits':>9} {'max_q':>6}")
+    for r in rows:
+        print(f"{r['mode']:<26} {r['ok']:>4} {r['elapsed_s']:>10} {r['pages_per_s']:>8} {r['speedup']:>8} "
+              f"{str(r['backpressure_waits'] or ''):>9} {str(r['max_queue'] or ''):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# bench/bench_postprocess.py
+# 목록 후처리: 행별 파이썬(기존 코드 방식) vs 배치 한 번(common/postprocess) — 백필 규모 레코드 수별 소요 시간
+#
+# 실행: python bench/bench_postprocess.py [--sizes 10000,100000,1000000] [--repeat 3] [--json]
+#
+# 케이스 (기존 방식 → 새 방식, 결과가 완전히 같은지도 확인):
+#   - thesignal   : strptime → strftime → strptime으로 CUTOFF 비교 + 문자열 정렬 → process(since, sort="desc")
+#   - investchosun: 날짜 문자열 멤버십 + 리스트 멤버십 URL 중복 제거 → process(day window, dedup=URL)
+#                   (리스트 멤버십은 O(n²)이라 --list-dedup-max 이하 크기만 잰다; set 버전도 함께)
+#   - startuprecipe: 날짜 멤버십 + pandas drop_duplicates → process(day window, dedup=company)
+# 코퍼스: 30일치 기사, 25%는 앞 기사와 URL/회사가 같은 중복, 구간은 최근 7일.
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import fixtures
+from common.postprocess import day_window, process
+
+END = datetime(2026, 1, 31, 23, 59)
+CUTOFF = END - timedelta(days=7)
+
+
+def corpus(n, seed=0):
+    rng = fixtures._rng("postprocess", seed, n)
+    rows = []
+    for i in range(n):
+        if rows and rng.random() < 0.25:
+            dup = rows[rng.randrange(len(rows))]
+            rows.append(dict(dup, title=dup["title"] + " (재전송)"))
+            continue
+        stamp = END - timedelta(minutes=rng.randrange(30 * 24 * 60))
+        rows.append({"title": f"기사 {i}", "link": f"https://example.com/{i}", "company": f"회사{i % (n // 3 + 1)}",
+                     "published_at": stamp.strftime("%Y-%m-%d %H:%M"), "dates": stamp.strftime("%Y.%m.%d")})
+    return rows
+
+
+# ===============================
+# 🐢 기존 방식 (행별 파이썬)
+# ===============================
+def legacy_thesignal(rows):
+    recent = []
+    for art in rows:
+        published = datetime.strptime(art["published_at"].strip(), "%Y-%m-%d %H:%M")
+        art = dict(art, published_at=published.strftime("%Y-%m-%d %H:%M"))
+        if datetime.strptime(art["published_at"], "%Y-%m-%d %H:%M") >= CUTOFF:
+            recent.append(art)
+    return sorted(recent, key=lambda a: a["published_at"], reverse=True)
+
+
+def _days():
+    return [(CUTOFF + timedelta(days=d)).strftime("%Y.%m.%d") for d in range((END - CUTOFF).days + 1)]
+
+
+def legacy_investchosun_list(rows):
+    days, urls, out = _days(), [], []
+    for art in rows:
+        if art["dates"] not in days or art["link"] in urls:
+            continue
+        urls.append(art["link"])
+        out.append(art)
+    return out
+
+
+def legacy_investchosun_set(rows):
+    days, seen, out = set(_days()), set(), []
+    for art in rows:
+        if art["dates"] not in days or art["link"] in seen:
+            continue
+        seen.add(art["link"])
+        out.append(art)
+    return out
+
+
+def legacy_startuprecipe(rows):
+    import pandas as pd
+    days = set(d.replace(".", "-") for d in _days())
+    kept = [r for r in rows if r["published_at"][:10] in days]
+    return pd.DataFrame(kept).drop_duplicates(subset=["company"]).to_dict(orient="records")
+
+
+# ===============================
+# 🚀 배치 한 번 (common/postprocess)
+# ===============================
+def batch_thesignal(rows):
+    return process(rows, time_key="published_at", since=CUTOFF, sort="desc")
+
+
+def batch_investchosun(rows):
+    since, until = day_window(_days())
+    return process(rows, time_key="dates", since=since, until=until, dedup="link")
+
+
+def batch_startuprecipe(rows):
+    since, until = day_window(_days())
+    return process(rows, times=[r["published_at"][:10] for r in rows], since=since, until=until, dedup="company")
+
+
+def _best(fn, rows, repeat):
+    best, out = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn(rows)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best * 1000, 1), out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--list-dedup-max", type=int, default=20000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        import pandas  # noqa: F401
+        has_pandas = True
+    except ImportError:
+        has_pandas = False
+
+    cases = [
+        ("thesignal", [("per-row", legacy_thesignal)], batch_thesignal),
+        ("investchosun", [("list dedup", legacy_investchosun_list), ("set dedup", legacy_investchosun_set)],
+         batch_investchosun),
+        ("startuprecipe", [("pandas", legacy_startuprecipe)] if has_pandas else [], batch_startuprecipe),
+    ]
+    rows = []
+    for n in (int(s) for s in args.sizes.split(",")):
+        records = corpus(n)
+        for name, legacies, batch in cases:
+            batch_ms, expected = _best(batch, records, args.repeat)
+            for label, legacy in legacies:
+                if label == "list dedup" and n > args.list_dedup_max:
+                    continue
+                legacy_ms, got = _best(legacy, records, 1 if label == "list dedup" else args.repeat)
+                rows.append({"records": n, "case": name, "legacy": label, "legacy_ms": legacy_ms,
+                             "batch_ms": batch_ms, "speedup": round(legacy_ms / batch_ms, 1) if batch_ms else None,
+                             "kept": len(expected), "identical": got == expected})
+
+    if args.json:
+        print(json.dumps({"repeat": args.repeat, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"best of {args.repeat} (list dedup: 1 run)")
+    print(f"{'records':>9} {'case':<14} {'legacy':<11} {'legacy_ms':>10} {'batch_ms':>9} {'speedup':>8} {'kept':>8} {'same':>5}")
+    for r in rows:
+        print(f"{r['records']:>9} {r['case']:<14} {r['legacy']:<11} {r['legacy_ms']:>10} {r['batch_ms']:>9} "
+              f"{r['speedup']:>8} {r['kept']:>8} {str(r['identical']):>5}")
+
+
+if __name__ == "__main__":
+    main()
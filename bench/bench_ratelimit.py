@@ -0,0 +1,95 @@
+# bench/bench_ratelimit.py
+# 고정 sleep vs 호스트별 AIMD limiter(common/ratelimit.py) — 처리량 대비 예의(429 발생 수) 비교
+#
+# 실행: python bench/bench_ratelimit.py [--requests 30] [--capacity 4] [--latency-ms 60] [--json]
+# 로컬 스텁 서버(bench/stub_server.py)가 호스트당 초당 capacity건을 넘으면 429 + Retry-After: 1 로 거절한다.
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import stub_server
+
+URL = "https://www.thebell.co.kr/free/content/article.asp?page=1&svccode=00"
+
+
+def run_fixed_sleep(base_url, n, interval):
+    import requests
+    session = requests.Session()
+    ok = throttled = 0
+    started = time.monotonic()
+    for _ in range(n):
+        resp = session.get(f"{base_url}/www.thebell.co.kr/free/content/article.asp?page=1&svccode=00", timeout=10)
+        if resp.status_code == 429:
+            throttled += 1
+        else:
+            ok += 1
+        time.sleep(interval)
+    return ok, throttled, time.monotonic() - started
+
+
+def run_limiter(n, workers):
+    import requests
+    from common import ratelimit
+    from common.http import fetch
+    ratelimit._limiters.clear()
+    ok = throttled = 0
+
+    def one(_):
+        try:
+            fetch(URL, timeout=10)
+            return True
+        except requests.HTTPError:
+            return False
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for success in pool.map(one, range(n)):
+            ok += success
+            throttled += not success
+    elapsed = time.monotonic() - started
+    return ok, throttled, elapsed, ratelimit.limiter_stats().get("www.thebell.co.kr")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--capacity", type=int, default=4, help="스텁 서버 호스트당 초당 허용 요청 수")
+    parser.add_argument("--latency-ms", type=int, default=60)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    server, state, base_url = stub_server.start(capacity=args.capacity, latency_ms=args.latency_ms)
+    os.environ["UPSTREAM_STUB_URL"] = base_url  # common.http 임포트 전에 설정
+
+    rows = []
+    for label, interval in [("fixed sleep 1.2s (기존 더벨)", 1.2), ("fixed sleep 0 (제한 없음)", 0.0)]:
+        ok, throttled, elapsed = run_fixed_sleep(base_url, args.requests, interval)
+        rows.append({"strategy": label, "ok": ok, "throttled_429": throttled,
+                     "elapsed_s": round(elapsed, 2), "ok_per_s": round(ok / elapsed, 2)})
+        time.sleep(1.1)  # 스텁 서버 1초 창 비우기
+
+    for workers in (1, 4):
+        ok, throttled, elapsed, stats = run_limiter(args.requests, workers)
+        rows.append({"strategy": f"AIMD limiter ({workers} threads)", "ok": ok, "throttled_429": throttled,
+                     "elapsed_s": round(elapsed, 2), "ok_per_s": round(ok / elapsed, 2),
+                     "final_rate": stats and stats["rate"]})
+        time.sleep(1.1)
+
+    server.shutdown()
+    if args.json:
+        print(json.dumps({"capacity_per_s": args.capacity, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"stub capacity: {args.capacity} req/s per host, requests per run: {args.requests}")
+    print(f"{'strategy':<30} {'ok':>4} {'429':>4} {'elapsed_s':>10} {'ok/s':>6} {'final_rate':>10}")
+    for r in rows:
+        print(f"{r['strategy']:<30} {r['ok']:>4} {r['throttled_429']:>4} {r['elapsed_s']:>10} {r['ok_per_s']:>6} {str(r.get('final_rate', '')):>10}")
+
+
+if __name__ == "__main__":
+    main()
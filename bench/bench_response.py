@@ -0,0 +1,106 @@
+# bench/bench_response.py
+# 응답 직렬화: jsonify(ASCII 이스케이프, 압축 없음) vs orjson + ?fields= / ?max_body_chars= + gzip/br (common/response_format)
+#
+# 실행: python bench/bench_response.py [--articles 100,500] [--repeat 5] [--json]
+# - payload: 더벨 엔드포인트 모양 (title/body/url/date), with_body는 기사 본문(content, 25문단)까지.
+#   글은 fixtures 문장의 낱말을 무작위로 섞어 만든다 (같은 문장 반복이면 압축률이 비현실적으로 높게 나옴).
+# - 모양: full / fields=title,url / max_body_chars=200
+# - 바이트: jsonify와 같은 출력(json.dumps ensure_ascii, sort_keys, 공백 없음) / orjson / orjson+gzip / orjson+br
+# - 시간: 직렬화(+압축) 최소값 ms
+# - kept: 모양을 바꾼 응답이 MAX_PAYLOAD_BYTES 예산으로 잘린 뒤 남은 기사 수 (전체 모양은 자르지 않음)
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import fixtures
+from common.response_format import ResponseShape, dumps, encode_body
+
+SHAPES = {
+    "full": ResponseShape(),
+    "fields=title,url": ResponseShape(fields={"title", "url", "link"}),
+    "max_body_chars=200": ResponseShape(max_body_chars=200),
+}
+
+
+WORDS = fixtures.FILLER.split() + list(fixtures.COMPANIES)
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def payload(n, with_body):
+    rng = fixtures._rng("response", n)
+    articles = []
+    for i in range(n):
+        art = {"title": fixtures._title(rng), "body": _text(rng, rng.randint(20, 45)),
+               "url": f"https://www.thebell.co.kr/free/content/article.asp?key={i:06d}", "date": "2026-01-31 12:00:00"}
+        if with_body:
+            art["content"] = "\n".join(_text(rng, 40) for _ in range(25))
+            art["extraction"] = {"method": "readability", "elapsed_ms": 12.3}
+        articles.append(art)
+    return {"date": "2026-01-31", "count": n, "articles": articles, "cursor": "1234", "since": None,
+            "fetch": {"requests": 4, "retries": 0, "hedged": 0, "failed": 0}}
+
+
+def jsonify_bytes(data):
+    """Flask jsonify 기본 출력과 같은 바이트 (비디버그: ensure_ascii, sort_keys, 공백 없음)"""
+    return json.dumps(data, ensure_ascii=True, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _best(fn, repeat):
+    best, out = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best * 1000, 2), out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", default="100,500")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    for n in (int(s) for s in args.articles.split(",")):
+        for with_body in (False, True):
+            data = payload(n, with_body)
+            for shape_name, shape in SHAPES.items():
+                shaped = shape.apply(data)
+                jsonify_ms, legacy = _best(lambda: jsonify_bytes(shaped), args.repeat)
+                orjson_ms, body = _best(lambda: dumps(shaped, sort_keys=True), args.repeat)
+                assert json.loads(body) == json.loads(legacy)
+                gzip_ms, (gz, _) = _best(lambda: encode_body(dumps(shaped, sort_keys=True), "gzip"), args.repeat)
+                br_ms, (br, _) = _best(lambda: encode_body(dumps(shaped, sort_keys=True), "br"), args.repeat)
+                assert gzip.decompress(gz) == body
+                rows.append({"articles": n, "with_body": with_body, "shape": shape_name,
+                             "kept": len(shaped["articles"]),
+                             "jsonify_bytes": len(legacy), "orjson_bytes": len(body),
+                             "gzip_bytes": len(gz), "br_bytes": len(br),
+                             "jsonify_ms": jsonify_ms, "orjson_ms": orjson_ms, "gzip_ms": gzip_ms, "br_ms": br_ms,
+                             "reduction": round(len(legacy) / len(br), 1)})
+
+    if args.json:
+        print(json.dumps({"repeat": args.repeat, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"best of {args.repeat}; *_ms = serialize (+ compress)")
+    print(f"{'arts':>5} {'body':>5} {'shape':<19} {'kept':>5} {'jsonify_B':>10} {'orjson_B':>9} {'gzip_B':>8} {'br_B':>8} "
+          f"{'x':>6} {'jsonify_ms':>10} {'orjson_ms':>9} {'gzip_ms':>8} {'br_ms':>7}")
+    for r in rows:
+        print(f"{r['articles']:>5} {str(r['with_body']):>5} {r['shape']:<19} {r['kept']:>5} {r['jsonify_bytes']:>10} "
+              f"{r['orjson_bytes']:>9} {r['gzip_bytes']:>8} {r['br_bytes']:>8} {r['reduction']:>6} "
+              f"{r['jsonify_ms']:>10} {r['orjson_ms']:>9} {r['gzip_ms']:>8} {r['br_ms']:>7}")
+
+
+if __name__ == "__main__":
+    main()
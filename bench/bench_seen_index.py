@@ -0,0 +1,93 @@
+# bench/bench_seen_index.py
+# seen URL 색인(common/seen_index): 확장형 Bloom 필터 vs 파이썬 set — URL 수별 메모리, 오탐률, 추가/조회 속도, 저장/불러오기
+#
+# 실행: python bench/bench_seen_index.py [--sizes 100000,1000000] [--probes 200000] [--json]
+# - URL은 실제 기사 주소 모양 (출처별 경로 + 기사 번호). 조회는 절반은 넣은 URL, 절반은 넣지 않은 URL.
+# - observed_fp_rate: 넣지 않은 URL 중 "있을 수 있음"이 나온 비율 (이만큼만 SQLite로 확인하러 간다)
+# - set_bytes: set 자체 + URL 문자열 (sys.getsizeof 합) — 같은 URL을 메모리에 정확히 들고 있을 때의 비용
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+from common.seen_index import ScalableBloomFilter
+
+PATTERNS = (
+    "https://www.thebell.co.kr/free/content/ArticleView.asp?key=2026{:08d}&lcode=00",
+    "https://www.investchosun.com/site/data/html_dir/2026/01/31/2026{:08d}.html",
+    "https://signalm.sedaily.com/NewsView/{:010d}",
+)
+
+
+def urls(start, n):
+    return [PATTERNS[i % 3].format(i) for i in range(start, start + n)]
+
+
+def _ms(fn, *args):
+    started = time.perf_counter()
+    out = fn(*args)
+    return round((time.perf_counter() - started) * 1000, 1), out
+
+
+def run(n, probes):
+    seen = urls(0, n)
+    unseen = urls(n, probes // 2)
+    known = seen[:: max(1, n // (probes // 2))][: probes // 2]
+
+    bloom = ScalableBloomFilter()
+    add_ms, _ = _ms(bloom.add_many, seen)
+    query_ms, hits = _ms(bloom.contains_many, known + unseen)
+    assert hits[: len(known)].all(), "넣은 URL을 못 찾음 (거짓 음성)"
+    false_positives = int(hits[len(known):].sum())
+
+    set_add_ms, exact = _ms(set, seen)
+    set_query_ms, _ = _ms(lambda keys: [k in exact for k in keys], known + unseen)
+    set_bytes = sys.getsizeof(exact) + sum(sys.getsizeof(u) for u in seen)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "seen.npz")
+        save_ms, _ = _ms(bloom.save, path)
+        file_bytes = os.path.getsize(path)
+        load_ms, (loaded, _) = _ms(ScalableBloomFilter.load, path)
+    assert (loaded.contains_many(unseen) == hits[len(known):]).all(), "불러온 필터가 다름"
+
+    stats = bloom.stats()
+    return {
+        "urls": n, "layers": stats["layers"],
+        "bloom_bytes": stats["memory_bytes"], "set_bytes": set_bytes,
+        "bytes_per_url": round(stats["memory_bytes"] / n, 2),
+        "estimated_fp_rate": stats["estimated_fp_rate"],
+        "observed_fp_rate": round(false_positives / len(unseen), 5),
+        "add_ms": add_ms, "set_add_ms": set_add_ms,
+        "query_ms": query_ms, "set_query_ms": set_query_ms, "probes": len(known) + len(unseen),
+        "save_ms": save_ms, "load_ms": load_ms, "file_bytes": file_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--probes", type=int, default=200000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = [run(int(s), args.probes) for s in args.sizes.split(",")]
+    if args.json:
+        print(json.dumps({"probes": args.probes, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"{'urls':>9} {'layers':>6} {'bloom_MB':>9} {'set_MB':>8} {'B/url':>6} {'est_fp':>8} {'obs_fp':>8} "
+          f"{'add_ms':>8} {'query_ms':>9} {'set_q_ms':>9} {'save_ms':>8} {'load_ms':>8} {'file_MB':>8}")
+    for r in rows:
+        print(f"{r['urls']:>9} {r['layers']:>6} {r['bloom_bytes'] / 1e6:>9.2f} {r['set_bytes'] / 1e6:>8.1f} "
+              f"{r['bytes_per_url']:>6} {r['estimated_fp_rate']:>8} {r['observed_fp_rate']:>8} {r['add_ms']:>8} "
+              f"{r['query_ms']:>9} {r['set_query_ms']:>9} {r['save_ms']:>8} {r['load_ms']:>8} "
+              f"{r['file_bytes'] / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
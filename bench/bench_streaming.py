@@ -0,0 +1,134 @@
+# bench/bench_streaming.py
+# 목록 페이지/구글 검색: 본문을 다 받은 뒤 BeautifulSoup 파싱 vs 받는 동안 증분 파싱(common/stream_parse)
+#
+# 실행: python bench/bench_streaming.py [--pages 10] [--latency-ms 30] [--chunk-delay-ms 20] [--archive-mode record] [--json]
+# 첫 기사까지 시간(time-to-first-article)과 페이지당 전체 시간을 잰다.
+# 스텁은 본문을 8KB씩 --chunk-delay-ms 간격으로 보낸다 (느린 회선) — 0이면 한 번에 보냄.
+# 원본 보관은 켠 채(record, 임시 디렉터리) 잰다 — 조기 종료가 보관 때문에 무뎌지지 않는지까지 포함.
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "api"))
+import stub_server
+
+
+def _measure(run):
+    """run(on_item) 실행 → (첫 항목까지 ms, 전체 ms, 항목 수)"""
+    started = time.perf_counter()
+    first = []
+    count = [0]
+
+    def on_item():
+        if not first:
+            first.append((time.perf_counter() - started) * 1000)
+        count[0] += 1
+
+    run(on_item)
+    total = (time.perf_counter() - started) * 1000
+    return (first[0] if first else total), total, count[0]
+
+
+def listing_runners(source, page):
+    """출처별 (버퍼링 방식, 스트리밍 방식) — 둘 다 엔드포인트와 같은 파서를 쓴다"""
+    from common.http import fetch
+    if source == "thebell":
+        import index2
+        url = f"https://www.thebell.co.kr/free/content/article.asp?page={page}&svccode=00"
+        parse_full = lambda html: index2.parse_news_page(html, "")
+        parse_stream = lambda resp: index2.iter_news_stream(resp, "")
+        params = None
+    else:
+        import index4
+        url = "https://www.investchosun.com/svc/news/list.html"
+        params = {"catid": "2", "pn": str(page)}
+        parse_full = lambda html: index4.parse_news_page(html)
+        parse_stream = lambda resp: index4.iter_news_stream(resp)
+
+    def buffered(on_item):
+        for _ in parse_full(fetch(url, params=params).text) or []:
+            on_item()
+
+    def streaming(on_item):
+        for _ in parse_stream(fetch(url, params=params, stream=True)):
+            on_item()
+
+    return buffered, streaming
+
+
+def google_runners(query, keywords):
+    """구글 HTML 검색: 전체 페이지 BeautifulSoup 후 첫 일치 vs 스트리밍 첫 일치에서 중단"""
+    from bs4 import BeautifulSoup
+    from common import google_news
+    from common.http import fetch
+
+    def buffered(on_item):
+        url = google_news.HTML_SEARCH_URL + "?q=" + query
+        soup = BeautifulSoup(fetch(url).text, "lxml")
+        items = ((a.find(["h3", "h4"]) or a).get_text(strip=True) for a in soup.find_all("a", href=True))
+        if google_news._first_match(((t, "") for t in items), keywords)["title"]:
+            on_item()
+
+    def streaming(on_item):
+        items = google_news.iter_html_items(query, None, 10)
+        if google_news._first_match(items, keywords)["title"]:
+            on_item()
+
+    return buffered, streaming
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--latency-ms", type=int, default=30)
+    parser.add_argument("--chunk-delay-ms", type=int, default=20)
+    parser.add_argument("--archive-mode", default="record", choices=("record", "off"))
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    server, state, base_url = stub_server.start(latency_ms=args.latency_ms, chunk_delay_ms=args.chunk_delay_ms)
+    os.environ["UPSTREAM_STUB_URL"] = base_url
+    os.environ["RAW_ARCHIVE_MODE"] = args.archive_mode
+    os.environ["RAW_ARCHIVE_DIR"] = tempfile.mkdtemp(prefix="bench_streaming_archive_")
+    os.environ["RATE_LIMITS_JSON"] = json.dumps({h: {"start": 500, "max": 1000} for h in
+                                                 ("www.thebell.co.kr", "www.investchosun.com", "news.google.com")})
+
+    cases = [(f"{source} listing", lambda p, s=source: listing_runners(s, p)) for source in ("thebell", "investchosun")]
+    cases.append(("google html (first match)", lambda p: google_runners(f"기업{p}", ["투자"])))
+
+    rows = []
+    for label, make in cases:
+        for mode in ("buffered", "streaming"):
+            firsts, totals, items = [], [], 0
+            for page in range(1, args.pages + 1):
+                run = make(page)[0 if mode == "buffered" else 1]
+                first, total, count = _measure(run)
+                firsts.append(first)
+                totals.append(total)
+                items += count
+            rows.append({"case": label, "mode": mode, "items": items,
+                         "first_item_ms": round(statistics.median(firsts), 1),
+                         "total_ms": round(statistics.median(totals), 1)})
+    bytes_sent = sum(c["bytes"] for c in state.snapshot().values())
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps({"pages": args.pages, "latency_ms": args.latency_ms, "chunk_delay_ms": args.chunk_delay_ms,
+                          "archive_mode": args.archive_mode,
+                          "upstream_bytes": bytes_sent, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"{args.pages} pages per case, stub latency {args.latency_ms}ms, {args.chunk_delay_ms}ms per 8KB chunk "
+          f"(median per page, raw archive {args.archive_mode})")
+    print(f"{'case':<28} {'mode':<10} {'items':>6} {'first_item_ms':>14} {'total_ms':>9}")
+    for r in rows:
+        print(f"{r['case']:<28} {r['mode']:<10} {r['items']:>6} {r['first_item_ms']:>14} {r['total_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
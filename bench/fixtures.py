@@ -0,0 +1,248 @@
+# bench/fixtures.py
+# 벤치마크/부하 테스트용 가짜 업스트림 페이지 생성기 (항상 같은 결과가 나오도록 시드 고정)
+#
+# 실제 사이트의 HTML 구조(스크래퍼가 쓰는 선택자)만 흉내 낸다:
+#   - 더벨      : li > dl > dt / dd / span.date / a
+#   - 인베스트조선: ul.list_ul > li > dt > a, dd.summary > a, dd.date > span
+#   - 시그널     : div.contPadding > a > strong, span.time, span.mmsn_con
+#   - 스타트업리시피: tbody > tr > td × 5
+#   - 구글 뉴스  : RSS 검색 피드 / HTML 결과 페이지
+#   - 목록 피드  : 더벨/인베스트조선 RSS 2.0, 시그널 Atom — 목록 HTML과 같은 기사(제목/요약/링크/시각)를 담는다
+#                 인베스트조선/시그널 목록 페이지는 <link rel="alternate">로 카테고리 피드를 알리고,
+#                 더벨은 robots.txt → 사이트맵 색인 → 뉴스 사이트맵(제목/시각/링크, 요약 없음)만 있다 — 요약이 필요한
+#                 목록이라 자동 탐색이 사이트맵을 쓰지 않고 HTML로 가는지 확인용 (common/feeds)
+#   - 기사 본문  : 메뉴/광고 등 페이지 chrome + 본문 컨테이너
+import hashlib
+import random
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from html import escape
+
+from pytz import timezone
+
+KST = timezone('Asia/Seoul')
+SHARED_EVERY = 5      # 목록 항목 5개 중 1개는 카테고리(catid/NClass)가 달라도 같은 기사
+
+COMPANIES = [
+    "리벨리온", "퓨리오사AI", "토스", "토스뱅크", "당근", "컬리", "야놀자", "무신사", "뤼이드", "마켓컬리",
+    "직방", "오늘의집", "버킷플레이스", "센드버드", "채널코퍼레이션", "트릿지", "클래스101", "와디즈",
+    "업스테이지", "포티투마루", "스캐터랩", "뷰노", "루닛", "딥노이드", "라이너", "메스프레소", "콴다",
+    "에이블리", "지그재그", "크림", "밀리의서재", "리디", "왓챠", "쏘카", "마이리얼트립", "트리플",
+]
+DEAL_PHRASES = [
+    "시리즈A 투자 유치", "시리즈B 300억 투자 유치", "프리IPO 추진", "매각 본입찰 흥행", "우선협상대상자 선정",
+    "코스닥 상장예비심사 청구", "전환사채 발행", "블라인드펀드 결성", "경영권 지분 매각", "리파이낸싱 착수",
+    "신규 사업 진출", "분기 실적 발표", "대표 교체", "해외 법인 설립", "전략적 제휴 체결",
+]
+FILLER = ("투자 업계에 따르면 이번 거래는 기존 주주와 신규 투자자가 함께 참여했다. 회사는 확보한 자금을 "
+          "연구개발과 해외 시장 확대에 투입할 계획이다. 업계 관계자는 밸류에이션이 직전 라운드 대비 "
+          "두 배 이상 높아졌다고 설명했다. ")
+
+
+def _rng(*key):
+    seed = int(hashlib.md5(repr(key).encode()).hexdigest()[:8], 16)
+    return random.Random(seed)
+
+
+def _title(rng):
+    return f"{rng.choice(COMPANIES)}, {rng.choice(DEAL_PHRASES)}"
+
+
+def _summary(rng, sentences=2):
+    return " ".join(FILLER for _ in range(sentences))[: rng.randint(80, 200)]
+
+
+def _chrome(rng, links=150):
+    """실제 페이지처럼 기사와 상관없는 메뉴/링크/스크립트 덩어리"""
+    nav = "".join(f'<li><a href="/menu/{i}">메뉴 항목 {i}</a></li>' for i in range(links))
+    script = "<script>" + "var x=1;" * 200 + "</script>"
+    return f'<div id="header"><ul class="gnb">{nav}</ul></div>{script}'
+
+
+def now_kst():
+    return datetime.now(KST)
+
+
+# ===============================
+# 📰 목록 페이지
+# ===============================
+def _thebell_items(page, per_page=20, today_pages=3):
+    """목록 한 페이지의 기사 [(경로, 제목, 요약, 시각)] — 목록 HTML과 피드가 함께 쓴다"""
+    rng = _rng("thebell", page)
+    day = now_kst() if page <= today_pages else now_kst() - timedelta(days=1)
+    items = []
+    for i in range(per_page):
+        stamp = day.replace(hour=max(0, 23 - page), minute=(59 - i) % 60, second=0, microsecond=0)
+        items.append((f"article.asp?key={page:03d}{i:03d}", _title(rng), _summary(rng), stamp))
+    return items
+
+
+def thebell_listing(page, per_page=20, today_pages=3):
+    rng = _rng("thebell", page)
+    items = [
+        f'<li><dl><dt><a href="{href}">{escape(title)}</a></dt>'
+        f'<dd>{escape(summary)}</dd><span class="date">{stamp.strftime("%Y-%m-%d %H:%M:%S")}</span></dl></li>'
+        for href, title, summary, stamp in _thebell_items(page, per_page, today_pages)]
+    return f'<html><head><title>더벨</title></head><body>{_chrome(rng)}<ul class="list">{"".join(items)}</ul></body></html>'
+
+
+def _investchosun_items(page, catid="2", per_page=20, recent_pages=3):
+    rng = _rng("investchosun", catid, page)
+    day = now_kst() if page <= recent_pages else now_kst() - timedelta(days=3)
+    items = []
+    for i in range(per_page):
+        # 5개 중 1개는 여러 카테고리에 함께 실리는 기사 (같은 contid/제목)
+        shared = i % SHARED_EVERY == 0
+        contid = f"X{page:03d}{i:03d}" if shared else f"{catid}{page:03d}{i:03d}"
+        item_rng = _rng("investchosun", "shared", page, i) if shared else rng
+        stamp = day.replace(hour=max(0, 23 - page), minute=(59 - i) % 60, second=0, microsecond=0)
+        items.append((f"/svc/news/view.html?contid={contid}", _title(item_rng), _summary(item_rng), stamp))
+    return items
+
+
+def investchosun_listing(page, catid="2", per_page=20, recent_pages=3):
+    rng = _rng("investchosun", catid, page)
+    items = [
+        f'<li><dl><dt><a href="{href}">{escape(title)}</a></dt>'
+        f'<dd class="summary"><a href="{href}">{escape(summary)}</a></dd>'
+        f'<dd class="date"><span>{stamp.strftime("%Y.%m.%d")}</span><span>기자</span></dd></dl></li>'
+        for href, title, summary, stamp in _investchosun_items(page, catid, per_page, recent_pages)]
+    feed = f'<link rel="alternate" type="application/rss+xml" title="인베스트조선" href="/rss.xml?catid={catid}">'
+    return (f'<html><head><title>인베스트조선</title>{feed}</head><body>{_chrome(rng)}'
+            f'<ul class="list_ul">{"".join(items)}</ul></body></html>')
+
+
+def _thesignal_items(page, nclass="GX11", per_page=20):
+    rng = _rng("thesignal", nclass, page)
+    base = now_kst().replace(second=0, microsecond=0)
+    items = []
+    for i in range(per_page):
+        stamp = base - timedelta(minutes=45 * ((page - 1) * per_page + i))
+        shared = i % SHARED_EVERY == 0
+        article_id = f"X{page:03d}{i:03d}" if shared else f"{nclass}{page:03d}{i:03d}"
+        item_rng = _rng("thesignal", "shared", page, i) if shared else rng
+        items.append((f"/Article/{article_id}", _title(item_rng), _summary(item_rng), stamp))
+    return items
+
+
+def thesignal_listing(page, nclass="GX11", per_page=20):
+    rng = _rng("thesignal", nclass, page)
+    items = [
+        f'<div class="contPadding"><a href="{href}"><strong>{escape(title)}</strong></a>'
+        f'<span class="time">{stamp.strftime("%Y-%m-%d %H:%M")}</span>'
+        f'<span class="mmsn_con">{escape(summary)}</span></div>'
+        for href, title, summary, stamp in _thesignal_items(page, nclass, per_page)]
+    feed = f'<link rel="alternate" type="application/atom+xml" href="/Main/Content/atom.xml?NClass={nclass}">'
+    return f'<html><head><title>시그널</title>{feed}</head><body>{_chrome(rng)}{"".join(items)}</body></html>'
+
+
+def startuprecipe_invest(rows=20):
+    rng = _rng("startuprecipe")
+    today = now_kst()
+    trs = []
+    for i in range(rows):
+        day = today if i % 2 == 0 else today - timedelta(days=1)
+        stage = "인수합병" if i % 7 == 6 else rng.choice(["시드", "시리즈A", "시리즈B", "프리A"])
+        company = COMPANIES[i % len(COMPANIES)]
+        trs.append(f'<tr><td>{day.strftime("%Y-%m-%d")}</td><td><a href="/company/{i}">{company}(주)</a></td>'
+                   f'<td>IT</td><td>{rng.randint(5, 300)}억</td><td>{stage}</td></tr>')
+    return f'<html><body>{_chrome(rng, 50)}<table><tbody>{"".join(trs)}</tbody></table></body></html>'
+
+
+# ===============================
+# 📡 목록 피드 (RSS 2.0 / Atom) — 목록 페이지 1~pages의 기사를 같은 순서로
+# ===============================
+def _rss(title, base, items):
+    entries = "".join(
+        f"<item><title>{escape(t)}</title><link>{escape(base + href)}</link>"
+        f"<description>{escape(summary)}</description><pubDate>{format_datetime(stamp)}</pubDate></item>"
+        for href, t, summary, stamp in items)
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>{escape(title)}</title><link>{escape(base)}</link>{entries}</channel></rss>')
+
+
+def thebell_feed(pages=4):
+    items = [item for page in range(1, pages + 1) for item in _thebell_items(page)]
+    return _rss("더벨", "https://www.thebell.co.kr/free/content/", items)
+
+
+def investchosun_feed(catid="2", pages=4):
+    items = [item for page in range(1, pages + 1) for item in _investchosun_items(page, catid)]
+    return _rss("인베스트조선", "https://www.investchosun.com", items)
+
+
+def thesignal_feed(nclass="GX11", pages=3):
+    entries = "".join(
+        f'<entry><title>{escape(t)}</title><link rel="alternate" href="https://signalm.sedaily.com{href}"/>'
+        f'<id>https://signalm.sedaily.com{href}</id><published>{stamp.isoformat()}</published>'
+        f'<summary type="html">{escape(escape(summary))}</summary></entry>'
+        for page in range(1, pages + 1) for href, t, summary, stamp in _thesignal_items(page, nclass))
+    return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            f'<title>시그널 {escape(nclass)}</title>{entries}</feed>')
+
+
+def thebell_robots():
+    return "User-agent: *\nDisallow: /admin/\nSitemap: https://www.thebell.co.kr/sitemap.xml\n"
+
+
+def thebell_sitemap_index():
+    stamp = now_kst().isoformat()
+    maps = "".join(f"<sitemap><loc>https://www.thebell.co.kr/{name}</loc><lastmod>{stamp}</lastmod></sitemap>"
+                   for name in ("sitemap_pages.xml", "sitemap_news.xml"))
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{maps}</sitemapindex>')
+
+
+def thebell_news_sitemap(pages=4):
+    """구글 뉴스 사이트맵 형식 — 피드와 같은 기사, 요약은 없다"""
+    urls = "".join(
+        f"<url><loc>{escape('https://www.thebell.co.kr/free/content/' + href)}</loc><news:news>"
+        f"<news:publication><news:name>더벨</news:name><news:language>ko</news:language></news:publication>"
+        f"<news:publication_date>{stamp.isoformat()}</news:publication_date>"
+        f"<news:title>{escape(title)}</news:title></news:news></url>"
+        for page in range(1, pages + 1) for href, title, _, stamp in _thebell_items(page))
+    return ('<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            f'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">{urls}</urlset>')
+
+
+# ===============================
+# 🔎 구글 뉴스
+# ===============================
+def _google_results(query, count):
+    rng = _rng("google", query)
+    names = [n.strip('" ') for n in query.replace(" when:1d", "").split(" OR ")]
+    results = []
+    for i in range(count):
+        name = names[i % len(names)] if names else rng.choice(COMPANIES)
+        title = f"{name}, {rng.choice(DEAL_PHRASES)}" if i % 3 != 2 else f"{name} 관련 업계 동향 {i}"
+        results.append((title, f"https://news.google.com/rss/articles/{hashlib.md5((query + str(i)).encode()).hexdigest()}"))
+    return results
+
+
+def google_rss(query, count=30):
+    items = "".join(
+        f"<item><title>{escape(t)} - 테스트일보</title><link>{escape(l)}</link>"
+        f"<pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate><source url=\"https://example.com\">테스트일보</source></item>"
+        for t, l in _google_results(query, count))
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>"{escape(query)}" - Google 뉴스</title>{items}</channel></rss>')
+
+
+def google_html(query, count=30):
+    rng = _rng("google-html", query)
+    links = "".join(f'<article><a href="./articles/{l.rsplit("/", 1)[-1]}"><h3>{escape(t)}</h3></a></article>'
+                    for t, l in _google_results(query, count))
+    return f'<html><body>{_chrome(rng, 300)}<main>{links}</main></body></html>'
+
+
+# ===============================
+# 📄 기사 본문
+# ===============================
+def article_page(path, paragraphs=25, charset="utf-8"):
+    rng = _rng("article", path)
+    ads = "".join(f'<div class="ad">광고 {i}</div>' for i in range(rng.randint(0, 3)))
+    body = "".join(f"<p>{escape(FILLER * rng.randint(1, 3))}</p>" for _ in range(paragraphs))
+    return (f'<html><head><meta charset="{charset}"><title>{escape(_title(rng))}</title></head><body>'
+            f'{_chrome(rng)}{ads}<div id="container"><div class="side">관련 기사</div>'
+            f'<div id="article_body" class="article_txt">{body}</div></div>'
+            f'<div id="footer">Copyright</div></body></html>')
@@ -0,0 +1,311 @@
+# bench/loadtest.py
+# 부하 테스트: api/index*.py Flask 앱을 실제 HTTP 서버(별도 프로세스)로 띄우고, 업스트림은 로컬 스텁으로 돌린 채
+# 동시 요청 수를 단계별로 올려 가며 처리량 / 지연 백분위 / 오류율 / 서버 RSS를 잰다. 한 인스턴스가 어디서 무너지는지 보기용.
+#
+# 실행: python bench/loadtest.py [--concurrency 1,4,16] [--duration 10] [--mix thebell=3,thesignal=2,search=1]
+#                                [--latency-ms 80] [--error-rate 0] [--slo-p95-ms 5000] [--out report.json]
+#                                [--baseline old.json]
+#
+# - 경로 → 앱 매핑은 vercel.json routes를 그대로 쓴다 (Flask 앱만, index7 ASGI 제외). 서버는 werkzeug 스레드 서버 1개.
+# - 요청 묶음(--mix)은 이름=가중치 또는 /경로?쿼리=가중치. 단계마다 클라이언트 N개가 --duration 초 동안 쉬지 않고 보낸다 (closed loop).
+# - RSS는 서버 프로세스의 /proc/<pid>/status VmRSS를 주기적으로 읽는다 (리눅스).
+# - 결과는 JSON (--out 파일 / --json 표준출력). --baseline으로 이전 보고서를 주면 단계별 req/s, p95 차이를 함께 보여준다.
+# - 오류율이 --max-error-rate를 넘거나 p95가 --slo-p95-ms를 넘는 첫 단계를 "saturated"로 표시한다.
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..")
+sys.path.insert(0, HERE)
+import stub_server
+
+HOSTS = ["www.thebell.co.kr", "www.investchosun.com", "signalm.sedaily.com", "startuprecipe.co.kr",
+         "news.google.com", "news1.example.com"]
+MIX_PATHS = {
+    "thebell": "/api/thebell",
+    "investchosun": "/api/investchosun",
+    "thesignal": "/api/thesignal",
+    "startuprecipe": "/api/startuprecipe",
+    "parse_article": "/api/parse_article?url=https://news1.example.com/news/{n}",
+    "search": "/api/search?q=투자&limit=50",
+}
+DEFAULT_MIX = "thebell=3,investchosun=2,thesignal=2,parse_article=2,search=1"
+RSS_INTERVAL_S = 0.2
+
+
+# ===============================
+# 🖥️ 서버 (자식 프로세스)
+# ===============================
+def _flask_routes():
+    """vercel.json routes → [(정규식, Flask 앱)]"""
+    from flask import Flask
+
+    with open(os.path.join(ROOT, "vercel.json"), encoding="utf-8") as f:
+        routes = json.load(f)["routes"]
+    sys.path.insert(0, os.path.join(ROOT, "api"))
+    table = []
+    for route in routes:
+        module = __import__(os.path.splitext(os.path.basename(route["dest"]))[0])
+        if isinstance(getattr(module, "app", None), Flask):
+            table.append((re.compile(route["src"] + "$"), module.app))
+    return table
+
+
+def serve(port):
+    """경로별로 Flask 앱에 나눠 주는 WSGI 서버 하나 — 준비되면 'READY <port>'를 출력"""
+    from werkzeug.serving import make_server
+
+    table = _flask_routes()
+
+    def dispatch(environ, start_response):
+        for pattern, app in table:
+            if pattern.match(environ.get("PATH_INFO", "")):
+                return app(environ, start_response)
+        start_response("404 NOT FOUND", [("Content-Type", "text/plain")])
+        return [b"Not Found"]
+
+    server = make_server("127.0.0.1", port, dispatch, threaded=True)
+    print(f"READY {server.server_port}", flush=True)
+    server.serve_forever()
+
+
+def start_server(stub_url, db_dir):
+    env = dict(os.environ, UPSTREAM_STUB_URL=stub_url, ARTICLE_DB_PATH=os.path.join(db_dir, "articles.db"),
+               RAW_ARCHIVE_MODE="off", RATE_LIMITS_JSON=json.dumps({h: {"start": 500, "max": 1000} for h in HOSTS}))
+    env.pop("PROFILE_TOKEN", None)
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve"], env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("READY"):
+        proc.kill()
+        raise RuntimeError(f"서버 시작 실패: {line!r}")
+    # 이후 출력(크롤러 로그)은 버린다 — 파이프가 차서 서버가 멈추지 않도록
+    threading.Thread(target=lambda: [None for _ in proc.stdout], daemon=True).start()
+    return proc, f"http://127.0.0.1:{line.split()[1]}"
+
+
+# ===============================
+# 📏 측정
+# ===============================
+def rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler:
+    def __init__(self, pid):
+        self.pid = pid
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            value = rss_kb(self.pid)
+            if value is not None:
+                self.samples.append(value)
+            if self._stop.wait(RSS_INTERVAL_S):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self):
+        if not self.samples:
+            return {"start_mb": None, "peak_mb": None, "end_mb": None}
+        mb = lambda kb: round(kb / 1024, 1)
+        return {"start_mb": mb(self.samples[0]), "peak_mb": mb(max(self.samples)), "end_mb": mb(self.samples[-1])}
+
+
+def percentile(sorted_values, p):
+    """nearest-rank 백분위 (ms)"""
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values), math.ceil(p / 100 * len(sorted_values))) - 1)
+    return round(sorted_values[k], 1)
+
+
+def latency_summary(latencies):
+    values = sorted(latencies)
+    return {"p50_ms": percentile(values, 50), "p90_ms": percentile(values, 90), "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99), "max_ms": round(values[-1], 1) if values else None}
+
+
+def parse_mix(text):
+    """'thebell=3,/api/search?q=x=1' → [(이름, 경로 템플릿, 가중치)]"""
+    mix = []
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.rpartition("=")
+        if not name:
+            name, weight = weight, "1"
+        path = name if name.startswith("/") else MIX_PATHS.get(name)
+        if path is None:
+            raise SystemExit(f"알 수 없는 요청 이름: {name} (사용 가능: {', '.join(MIX_PATHS)} 또는 /경로)")
+        mix.append((name, path, float(weight)))
+    return mix
+
+
+# ===============================
+# 🚀 부하 단계
+# ===============================
+def run_step(base_url, mix, concurrency, duration, timeout, seed):
+    names = [m[0] for m in mix]
+    paths = {m[0]: m[1] for m in mix}
+    weights = [m[2] for m in mix]
+    deadline = time.monotonic() + duration
+    lock = threading.Lock()
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+
+    def client(i):
+        rng = random.Random(seed * 1000 + i)
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            url = base_url + paths[name].format(n=rng.randrange(10000))
+            started = time.perf_counter()
+            try:
+                resp = session.get(url, timeout=timeout)
+                resp.content
+                status = str(resp.status_code)
+            except requests.RequestException as e:
+                status = type(e).__name__
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies[name].append(elapsed_ms)
+                statuses[name][status] += 1
+        session.close()
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    def stats(lat, st):
+        total = sum(st.values())
+        errors = sum(c for s, c in st.items() if not s.isdigit() or int(s) >= 400)
+        return {"requests": total, "req_per_s": round(total / elapsed, 2),
+                "error_rate": round(errors / total, 4) if total else 0.0, "status": dict(st), **latency_summary(lat)}
+
+    all_latencies = [v for lat in latencies.values() for v in lat]
+    all_statuses = sum(statuses.values(), Counter())
+    return {"concurrency": concurrency, "elapsed_s": round(elapsed, 2), **stats(all_latencies, all_statuses),
+            "routes": {name: stats(latencies[name], statuses[name]) for name in names if statuses[name]}}
+
+
+def compare(rows, baseline):
+    """이전 보고서와 같은 동시성 단계끼리 req/s, p95 변화율"""
+    old = {r["concurrency"]: r for r in baseline.get("steps", [])}
+    for row in rows:
+        before = old.get(row["concurrency"])
+        if not before:
+            continue
+        row["vs_baseline"] = {
+            "req_per_s_pct": round((row["req_per_s"] / before["req_per_s"] - 1) * 100, 1) if before["req_per_s"] else None,
+            "p95_ms_pct": round((row["p95_ms"] / before["p95_ms"] - 1) * 100, 1) if before.get("p95_ms") else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--concurrency", default="1,4,16", help="단계별 동시 클라이언트 수 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=10, help="단계당 초")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--latency-ms", type=int, default=80, help="스텁 업스트림 응답 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="스텁 업스트림 503 비율")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--slo-p95-ms", type=float, default=5000)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="JSON 보고서 파일")
+    parser.add_argument("--baseline", help="비교할 이전 JSON 보고서")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.port)
+
+    mix = parse_mix(args.mix)
+    stub, _, stub_url = stub_server.start(latency_ms=args.latency_ms, error_rate=args.error_rate)
+    db_dir = tempfile.mkdtemp(prefix="loadtest-")
+    proc, base_url = start_server(stub_url, db_dir)
+    rows = []
+    if not args.json:
+        print(f"server {base_url} (pid {proc.pid}), stub latency {args.latency_ms}ms, {args.duration}s per step, "
+              f"cpus {os.cpu_count()}")
+    try:
+        # 워밍업: 임포트/연결/저장소를 한 번씩 채워 둔다 (search가 빈 DB를 보지 않도록)
+        for name, path, _ in mix:
+            requests.get(base_url + path.format(n=0), timeout=args.timeout)
+        for step, concurrency in enumerate(int(c) for c in args.concurrency.split(",")):
+            with RssSampler(proc.pid) as rss:
+                row = run_step(base_url, mix, concurrency, args.duration, args.timeout, args.seed + step)
+            row["rss"] = rss.summary()
+            row["saturated"] = row["error_rate"] > args.max_error_rate or (row["p95_ms"] or 0) > args.slo_p95_ms
+            rows.append(row)
+            if not args.json:
+                print(f"  c={concurrency:<4} {row['req_per_s']:>8} req/s  p50 {row['p50_ms']}ms  p95 {row['p95_ms']}ms  "
+                      f"err {row['error_rate']:.2%}  rss {row['rss']['peak_mb']}MB" + ("  ⚠️ saturated" if row["saturated"] else ""))
+    finally:
+        proc.terminate()
+        proc.wait()
+        stub.shutdown()
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    ok = [r["concurrency"] for r in rows if not r["saturated"]]
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {"mix": [{"name": n, "path": p, "weight": w} for n, p, w in mix], "duration_s": args.duration,
+                   "stub_latency_ms": args.latency_ms, "stub_error_rate": args.error_rate,
+                   "slo_p95_ms": args.slo_p95_ms, "max_error_rate": args.max_error_rate, "seed": args.seed},
+        "env": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "max_ok_concurrency": max(ok) if ok else None,
+        "steps": rows,
+    }
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(rows, json.load(f))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    print(f"max concurrency within SLO: {report['max_ok_concurrency']}")
+    for row in rows:
+        if "vs_baseline" in row:
+            d = row["vs_baseline"]
+            print(f"  c={row['concurrency']:<4} vs baseline: req/s {d['req_per_s_pct']}%  p95 {d['p95_ms_pct']}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# bench/stub_server.py
+# 로컬 가짜 업스트림 서버 — 스크래퍼를 실제 사이트 대신 여기로 돌려 벤치마크/부하 테스트를 한다.
+#
+# 실행: python bench/stub_server.py --port 8765 [--latency-ms 80] [--capacity 5]
+# 스크래퍼 쪽: UPSTREAM_STUB_URL=http://127.0.0.1:8765 (common/http.py가 https://<host>/<path> → <stub>/<host>/<path> 로 바꿈)
+#
+# --capacity N  : 호스트별로 초당 N건을 넘는 요청은 429 + Retry-After로 거절 (0 = 무제한)
+# --latency-ms  : 기본 응답 지연, 최근 1초 요청 수가 capacity에 가까울수록 지연이 늘어난다
+# --error-rate  : 이 비율의 요청은 503으로 실패 (재시도/서킷 브레이커 확인용)
+# --slow-rate   : 이 비율의 요청은 지연이 10배 (헤지 요청 확인용)
+# --chunk-delay-ms : 본문을 8KB씩 나눠 보내며 조각 사이에 쉬는 시간 (느린 회선 흉내, 스트리밍 파싱 확인용)
+# 목록 피드: .../rss.xml(더벨, 인베스트조선 ?catid=), signalm.sedaily.com/.../atom.xml?NClass= (FEED_URLS_JSON으로 연결)
+#           자동 탐색용: 인베스트조선/시그널 목록의 <link rel="alternate">, 더벨 robots.txt → sitemap.xml → sitemap_news.xml(요약 없음 → 목록엔 안 씀)
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    from . import fixtures
+except ImportError:
+    import fixtures
+
+CHUNK_BYTES = 8192
+
+
+class UpstreamState:
+    """호스트별 최근 요청 시각 — 용량 초과 판단과 통계에 쓴다."""
+
+    def __init__(self, capacity, latency_ms, error_rate=0.0, slow_rate=0.0, chunk_delay_ms=0):
+        self.capacity = capacity
+        self.latency_ms = latency_ms
+        self.chunk_delay_ms = chunk_delay_ms
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.rng = random.Random(0)
+        self.lock = threading.Lock()
+        self.recent = defaultdict(deque)
+        self.counts = defaultdict(lambda: {"ok": 0, "throttled": 0, "errors": 0, "bytes": 0})
+
+    def admit(self, host):
+        """(상태 코드, 지연 초) — 200이 아니면 본문 없이 그 코드로 응답"""
+        now = time.monotonic()
+        with self.lock:
+            window = self.recent[host]
+            while window and now - window[0] > 1.0:
+                window.popleft()
+            if self.capacity and len(window) >= self.capacity:
+                self.counts[host]["throttled"] += 1
+                return 429, 0.0
+            if self.rng.random() < self.error_rate:
+                self.counts[host]["errors"] += 1
+                return 503, 0.0
+            slow = 10 if self.rng.random() < self.slow_rate else 1
+            window.append(now)
+            load = len(window) / self.capacity if self.capacity else 0.0
+        return 200, slow * self.latency_ms / 1000 * (1 + 3 * load * load)
+
+    def record(self, host, nbytes):
+        with self.lock:
+            self.counts[host]["ok"] += 1
+            self.counts[host]["bytes"] += nbytes
+
+    def snapshot(self):
+        with self.lock:
+            return {host: dict(c) for host, c in self.counts.items()}
+
+
+def render(host, path, query):
+    """(상태 코드, content-type, 본문 bytes)"""
+    q = {k: v[0] for k, v in parse_qs(query).items()}
+    if host.endswith("thebell.co.kr") and path.endswith("/article.asp") and "page" in q:
+        return 200, "text/html; charset=utf-8", fixtures.thebell_listing(int(q["page"])).encode()
+    if host.endswith("investchosun.com") and path.endswith("/list.html"):
+        return 200, "text/html; charset=utf-8", fixtures.investchosun_listing(int(q.get("pn", 1)), q.get("catid", "2")).encode()
+    if host == "signalm.sedaily.com" and path.endswith("/SubMain"):
+        return 200, "text/html; charset=utf-8", fixtures.thesignal_listing(int(q.get("Page", 1)), q.get("NClass", "GX11")).encode()
+    if host.endswith("thebell.co.kr") and path.endswith("/rss.xml"):
+        return 200, "application/rss+xml; charset=utf-8", fixtures.thebell_feed().encode()
+    if host.endswith("thebell.co.kr") and path == "/robots.txt":
+        return 200, "text/plain; charset=utf-8", fixtures.thebell_robots().encode()
+    if host.endswith("thebell.co.kr") and path == "/sitemap.xml":
+        return 200, "application/xml; charset=utf-8", fixtures.thebell_sitemap_index().encode()
+    if host.endswith("thebell.co.kr") and path == "/sitemap_news.xml":
+        return 200, "application/xml; charset=utf-8", fixtures.thebell_news_sitemap().encode()
+    if host.endswith("investchosun.com") and path.endswith("/rss.xml"):
+        return 200, "application/rss+xml; charset=utf-8", fixtures.investchosun_feed(q.get("catid", "2")).encode()
+    if host == "signalm.sedaily.com" and path.endswith("/atom.xml"):
+        return 200, "application/atom+xml; charset=utf-8", fixtures.thesignal_feed(q.get("NClass", "GX11")).encode()
+    if host == "startuprecipe.co.kr" and path == "/invest":
+        return 200, "text/html; charset=utf-8", fixtures.startuprecipe_invest().encode()
+    if host == "news.google.com" and path == "/rss/search":
+        return 200, "application/rss+xml; charset=utf-8", fixtures.google_rss(q.get("q", "")).encode()
+    if host == "news.google.com" and path == "/search":
+        return 200, "text/html; charset=utf-8", fixtures.google_html(q.get("q", "")).encode()
+    if "/euckr/" in path:
+        # 한국 언론사 흔한 형태: Content-Type에 charset 없이 <meta charset="euc-kr">만 있음
+        return 200, "text/html", fixtures.article_page(host + path, charset="euc-kr").encode("cp949", "xmlcharrefreplace")
+    return 200, "text/html; charset=utf-8", fixtures.article_page(host + path).encode()
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/__stats":
+                return self._send(200, "application/json", json.dumps(state.snapshot()).encode())
+            host, _, rest = parts.path.lstrip("/").partition("/")
+            status, delay = state.admit(host)
+            if status == 429:
+                return self._send(429, "text/plain", b"Too Many Requests", {"Retry-After": "1"})
+            if status != 200:
+                return self._send(status, "text/plain", b"Service Unavailable")
+            time.sleep(delay)
+            status, ctype, body = render(host, "/" + rest, parts.query)
+            state.record(host, len(body))
+            self._send(status, ctype, body)
+
+        def _send(self, status, ctype, body, extra=None):
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (extra or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            if not state.chunk_delay_ms:
+                self.wfile.write(body)
+                return
+            for i in range(0, len(body), CHUNK_BYTES):
+                if i:
+                    time.sleep(state.chunk_delay_ms / 1000)
+                self.wfile.write(body[i:i + CHUNK_BYTES])
+                self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start(port=0, capacity=0, latency_ms=50, error_rate=0.0, slow_rate=0.0, chunk_delay_ms=0):
+    """백그라운드 스레드로 스텁 서버 시작 → (server, state, base_url)"""
+    state = UpstreamState(capacity, latency_ms, error_rate, slow_rate, chunk_delay_ms)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--capacity", type=int, default=0)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--chunk-delay-ms", type=int, default=0)
+    args = parser.parse_args()
+    server, _, base_url = start(args.port, args.capacity, args.latency_ms, args.error_rate, args.slow_rate,
+                                args.chunk_delay_ms)
+    print(f"stub upstream: {base_url}  (UPSTREAM_STUB_URL={base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()